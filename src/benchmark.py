@@ -0,0 +1,274 @@
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from model import Grid
+from solver import Solver
+
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.1
+
+
+@dataclass(frozen=True)
+class PuzzleBenchmark:
+    name: str
+    solved: bool
+    median_seconds: float
+    p95_seconds: float
+    peak_memory_bytes: int
+    rule_applications: dict[str, int]
+
+
+@dataclass(frozen=True)
+class Regression:
+    name: str
+    baseline_seconds: float
+    median_seconds: float
+
+    @property
+    def slowdown(self) -> float:
+        return self.median_seconds / self.baseline_seconds - 1
+
+
+def run():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the Sudoku solver against a directory of puzzles."
+    )
+    parser.add_argument(
+        "puzzles",
+        nargs="?",
+        default="puzzles",
+        help="The directory of puzzles to solve. Defaults to 'puzzles'.",
+    )
+    parser.add_argument(
+        "-n",
+        "--repeat",
+        type=int,
+        default=DEFAULT_REPEAT,
+        help=f"The number of times to solve each puzzle. Defaults to {DEFAULT_REPEAT}.",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        metavar="PATH",
+        help="Save the results as a JSON baseline for later runs to compare against.",
+    )
+    parser.add_argument(
+        "--baseline",
+        metavar="PATH",
+        help="Compare the results against a JSON baseline and report regressions.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="The fraction by which a median time may exceed the baseline before it is "
+        f"reported as a regression. Defaults to {DEFAULT_THRESHOLD}.",
+    )
+
+    args = parser.parse_args()
+
+    results = benchmark_directory(Path(args.puzzles), args.repeat)
+    print(format_results(results))
+
+    if args.save_baseline:
+        save_baseline(results, Path(args.save_baseline))
+
+    if args.baseline:
+        baseline = load_baseline(Path(args.baseline))
+        regressions = find_regressions(results, baseline, args.threshold)
+        for regression in regressions:
+            print(
+                f"Regression in {regression.name}: {regression.median_seconds * 1000:.2f}ms "
+                f"against a baseline of {regression.baseline_seconds * 1000:.2f}ms "
+                f"({regression.slowdown:+.0%}).",
+                file=sys.stderr,
+            )
+
+        if regressions:
+            sys.exit(1)
+
+
+def benchmark_puzzle(name: str, rows: list[str], repeat: int) -> PuzzleBenchmark:
+    """Solve a puzzle several times, measuring the time and memory taken.
+    Timings are taken without memory tracing, which would slow the solver down,
+    so peak memory and rule applications are measured in one extra solve.
+
+    Args:
+        name (str): The name to report the puzzle under.
+        rows (list[str]): The puzzle in rows notation.
+        repeat (int): The number of timed solves.
+
+    Returns:
+        PuzzleBenchmark: The measurements for the puzzle.
+    """
+    if repeat < 1:
+        raise ValueError("Repeat must be at least 1.")
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        solver = Solver(Grid.from_rows_notation(rows))
+        solver.solve()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        solver = Solver(Grid.from_rows_notation(rows))
+        solver.solve()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return PuzzleBenchmark(
+        name=name,
+        solved=solver.is_solved(),
+        median_seconds=statistics.median(timings),
+        p95_seconds=_percentile(timings, 95),
+        peak_memory_bytes=peak_memory,
+        rule_applications=dict(solver.rule_applications),
+    )
+
+
+def benchmark_directory(directory: Path, repeat: int) -> list[PuzzleBenchmark]:
+    """Benchmark every puzzle file in a directory, in name order.
+
+    Args:
+        directory (Path): The directory holding puzzles in rows notation, one per .txt file.
+        repeat (int): The number of timed solves of each puzzle.
+
+    Returns:
+        list[PuzzleBenchmark]: The measurements for each puzzle.
+    """
+    results = []
+    for path in sorted(directory.glob("*.txt")):
+        with open(path, "r") as f:
+            rows = f.readlines()
+
+        results.append(benchmark_puzzle(path.stem, rows, repeat))
+
+    return results
+
+
+def format_results(results: list[PuzzleBenchmark]) -> str:
+    """Format benchmark results as a table, with a total row of rule applications.
+
+    Args:
+        results (list[PuzzleBenchmark]): The measurements to format.
+
+    Returns:
+        str: The table of results.
+    """
+    lines = [
+        f"{'Puzzle':<20} {'Solved':>6} {'Median':>10} {'P95':>10} {'Peak':>10}  Rules",
+    ]
+    totals: Counter[str] = Counter()
+    for result in results:
+        rules = ", ".join(
+            f"{name}={count}" for name, count in result.rule_applications.items()
+        )
+        lines.append(
+            f"{result.name:<20} {'yes' if result.solved else 'no':>6} "
+            f"{result.median_seconds * 1000:>8.2f}ms {result.p95_seconds * 1000:>8.2f}ms "
+            f"{result.peak_memory_bytes / 1024:>7.0f}KiB  {rules}"
+        )
+        totals.update(result.rule_applications)
+
+    total_median = sum(result.median_seconds for result in results)
+    lines.append(
+        f"{'Total':<20} {sum(r.solved for r in results):>6} "
+        f"{total_median * 1000:>8.2f}ms"
+    )
+    lines.append(
+        "Rule applications: "
+        + ", ".join(f"{name}={count}" for name, count in totals.most_common())
+    )
+
+    return "\n".join(lines)
+
+
+def save_baseline(results: list[PuzzleBenchmark], path: Path):
+    """Save benchmark results as a JSON baseline.
+
+    Args:
+        results (list[PuzzleBenchmark]): The measurements to save.
+        path (Path): The file to write.
+    """
+    with open(path, "w") as f:
+        json.dump({"puzzles": [asdict(result) for result in results]}, f, indent=2)
+
+
+def load_baseline(path: Path) -> list[PuzzleBenchmark]:
+    """Load benchmark results from a JSON baseline.
+
+    Args:
+        path (Path): The file written by save_baseline.
+
+    Returns:
+        list[PuzzleBenchmark]: The saved measurements.
+    """
+    with open(path, "r") as f:
+        data = json.load(f)
+
+    return [PuzzleBenchmark(**result) for result in data["puzzles"]]
+
+
+def find_regressions(
+    results: list[PuzzleBenchmark],
+    baseline: list[PuzzleBenchmark],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[Regression]:
+    """Find puzzles whose median solve time exceeds the baseline by more than the threshold.
+    Puzzles missing from the baseline are ignored.
+
+    Args:
+        results (list[PuzzleBenchmark]): The current measurements.
+        baseline (list[PuzzleBenchmark]): The measurements to compare against.
+        threshold (float): The allowed fractional increase in median time.
+
+    Returns:
+        list[Regression]: The puzzles which have slowed down, in the order of results.
+    """
+    baseline_by_name = {result.name: result for result in baseline}
+    regressions = []
+
+    for result in results:
+        previous = baseline_by_name.get(result.name)
+        if previous is None:
+            continue
+
+        if result.median_seconds > previous.median_seconds * (1 + threshold):
+            regressions.append(
+                Regression(
+                    name=result.name,
+                    baseline_seconds=previous.median_seconds,
+                    median_seconds=result.median_seconds,
+                )
+            )
+
+    return regressions
+
+
+def _percentile(values: list[float], percent: int) -> float:
+    """Get a percentile of the values, interpolating between the nearest values.
+
+    Args:
+        values (list[float]): The values, in any order.
+        percent (int): The percentile between 1 and 99.
+
+    Returns:
+        float: The percentile.
+    """
+    if len(values) == 1:
+        return values[0]
+
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+if __name__ == "__main__":
+    run()
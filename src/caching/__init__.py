@@ -0,0 +1,11 @@
+from .canonical import Transform, canonical_form
+from .result_store import ResultStore, StoredResult
+from .solution_cache import SolutionCache
+
+__all__ = [
+    "ResultStore",
+    "SolutionCache",
+    "StoredResult",
+    "Transform",
+    "canonical_form",
+]
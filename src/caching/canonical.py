@@ -0,0 +1,247 @@
+from dataclasses import dataclass
+from itertools import permutations, product
+from typing import Iterator
+
+# The orders of the columns reachable by permuting the stacks and the columns within each stack.
+_STACK_ORDERS = tuple(permutations(range(3)))
+
+# A partial transformation: the orientation, the rows chosen so far, the columns
+# grouped into cells which can still be put in any order, and the digit labels.
+_Candidate = tuple[int, tuple[int, ...], tuple[tuple[int, ...], ...], list[int]]
+
+# The most partial transformations kept while searching before giving up.
+# Only grids with several empty rows or a lot of symmetry come near this limit.
+MAX_CANDIDATES = 4096
+
+
+@dataclass(frozen=True)
+class Transform:
+    """
+    A member of the Sudoku symmetry group, mapping a grid onto its canonical form.
+    Cell (row, column) of the canonical form holds digits[value] of the cell at
+    (rows[row], columns[column]) of the grid, after transposing the grid if transpose is True.
+    """
+
+    transpose: bool
+    rows: tuple[int, ...]
+    columns: tuple[int, ...]
+    digits: tuple[int, ...]
+
+    def apply(self, values: list[int]) -> list[int]:
+        """
+        Transform the values of a grid.
+
+        Args:
+            values (list[int]): The 81 values of the grid, indexed by y * 9 + x, with 0 for empty cells.
+
+        Returns:
+            list[int]: The 81 transformed values.
+        """
+        oriented = _transposed(values) if self.transpose else values
+        return [
+            self.digits[oriented[row * 9 + column]]
+            for row in self.rows
+            for column in self.columns
+        ]
+
+    def invert(self, values: list[int]) -> list[int]:
+        """
+        Undo the transformation of the values of a grid.
+
+        Args:
+            values (list[int]): The 81 transformed values, with 0 for empty cells.
+
+        Returns:
+            list[int]: The 81 values in the original orientation.
+        """
+        inverse_digits = [0] * 10
+        for digit, label in enumerate(self.digits):
+            inverse_digits[label] = digit
+
+        oriented = [0] * 81
+        for r, row in enumerate(self.rows):
+            for c, column in enumerate(self.columns):
+                oriented[row * 9 + column] = inverse_digits[values[r * 9 + c]]
+
+        return _transposed(oriented) if self.transpose else oriented
+
+
+def _transposed(values: list[int]) -> list[int]:
+    return [values[x * 9 + y] for y in range(9) for x in range(9)]
+
+
+def _relabelled(
+    cells: tuple[tuple[int, ...], ...], row: list[int], labels: list[int]
+) -> list[int]:
+    """
+    Find the smallest relabelled form of a row, given the cells of columns which
+    can still be put in any order. Within a cell the empty cells come first, then
+    the digits which already have labels in ascending order, then the new digits,
+    which take the next labels in order.
+
+    Args:
+        cells (tuple): The columns in order, grouped into cells of interchangeable columns.
+        row (list[int]): The 9 values of the row, with 0 for empty cells.
+        labels (list[int]): The label of each digit so far, or 0 if it has none.
+
+    Returns:
+        list[int]: The relabelled row, with new digits shown as 10 as their labels are not yet known.
+    """
+    relabelled: list[int] = []
+    for cell in cells:
+        if len(cell) == 1:
+            value = row[cell[0]]
+            relabelled.append(labels[value] or 10 if value else 0)
+        else:
+            relabelled.extend(
+                sorted(
+                    labels[value] or 10 if value else 0
+                    for value in map(row.__getitem__, cell)
+                )
+            )
+
+    # New digits are labelled in order of appearance, so the labels only depend on their count.
+    next_label = max(labels) + 1
+    for position, label in enumerate(relabelled):
+        if label == 10:
+            relabelled[position] = next_label
+            next_label += 1
+
+    return relabelled
+
+
+def _refinements(
+    cells: tuple[tuple[int, ...], ...], row: list[int], labels: list[int]
+) -> Iterator[tuple[tuple[tuple[int, ...], ...], list[int]]]:
+    """
+    Find every way of refining the cells and labels to give the smallest relabelled form of a row.
+    Columns are split from their cells unless they are still empty, and each order of the
+    new digits in a cell gives them different labels, so each is a separate refinement.
+
+    Args:
+        cells (tuple): The columns in order, grouped into cells of interchangeable columns.
+        row (list[int]): The 9 values of the row, with 0 for empty cells.
+        labels (list[int]): The label of each digit so far, or 0 if it has none.
+
+    Returns:
+        Iterator[tuple]: The refined cells and labels.
+    """
+    # Each part is a choice of ways to order some columns: either a single cell,
+    # or a tuple of single columns in every order the new digits can take.
+    parts: list[list[tuple[tuple[int, ...], ...]]] = []
+    for cell in cells:
+        if len(cell) == 1:
+            parts.append([(cell,)])
+            continue
+
+        empty = tuple(column for column in cell if not row[column])
+        labelled = sorted(
+            (labels[row[column]], column)
+            for column in cell
+            if row[column] and labels[row[column]]
+        )
+        new = [column for column in cell if row[column] and not labels[row[column]]]
+
+        if empty:
+            parts.append([(empty,)])
+        parts.extend([((column,),)] for _, column in labelled)
+        if new:
+            parts.append(
+                [tuple((column,) for column in order) for order in permutations(new)]
+            )
+
+    next_label = max(labels) + 1
+    for choice in product(*parts):
+        refined = tuple(cell for part in choice for cell in part)
+        refined_labels = labels[:]
+        label = next_label
+        for cell in refined:
+            value = row[cell[0]]
+            if value and not refined_labels[value]:
+                refined_labels[value] = label
+                label += 1
+
+        yield refined, refined_labels
+
+
+def canonical_form(values: list[int]) -> tuple[str, Transform] | None:
+    """
+    Find the lexicographically smallest grid equivalent to the given one under the
+    Sudoku symmetry group: transposition, permutations of the bands and stacks, of
+    the rows and columns within them, and relabelling of the digits.
+    Empty cells count as 0, so the canonical form starts with as many empty cells as possible.
+
+    The search builds the canonical form a row at a time, keeping only the partial
+    transformations which give the smallest rows so far. Columns which cannot yet be
+    told apart are kept together as cells rather than tried in every order.
+
+    Args:
+        values (list[int]): The 81 values of the grid, indexed by y * 9 + x, with 0 for empty cells.
+
+    Returns:
+        tuple[str, Transform] | None: The canonical form as 81 digits and a transformation
+          mapping the grid onto it, or None if the grid is too symmetric to search cheaply.
+    """
+    orientations = (values, _transposed(values))
+
+    # Each candidate is (orientation, rows, cells, digit labels),
+    # starting with every orientation and order of the stacks.
+    candidates: list[_Candidate] = [
+        (
+            orientation,
+            (),
+            tuple(tuple(range(s * 3, s * 3 + 3)) for s in stacks),
+            [0] * 10,
+        )
+        for orientation in range(2)
+        for stacks in _STACK_ORDERS
+    ]
+
+    for _ in range(9):
+        best_row: list[int] | None = None
+        next_candidates: list[_Candidate] = []
+        for orientation, rows, cells, labels in candidates:
+            grid = orientations[orientation]
+            if len(rows) % 3:
+                # Complete the band of the previous row.
+                band = rows[-1] // 3
+                choices = [r for r in range(band * 3, band * 3 + 3) if r not in rows]
+            else:
+                used = {r // 3 for r in rows}
+                choices = [r for r in range(9) if r // 3 not in used]
+
+            for row in choices:
+                values_row = grid[row * 9 : row * 9 + 9]
+                relabelled = _relabelled(cells, values_row, labels)
+                if best_row is None or relabelled < best_row:
+                    best_row = relabelled
+                    next_candidates = []
+                if relabelled == best_row:
+                    next_candidates.extend(
+                        (orientation, rows + (row,), *refinement)
+                        for refinement in _refinements(cells, values_row, labels)
+                    )
+
+        if len(next_candidates) > MAX_CANDIDATES:
+            return None
+
+        candidates = next_candidates
+
+    # Columns still sharing a cell are identical, so any order of them gives the same form.
+    # Give any digits missing from the grid the remaining labels in order.
+    orientation, rows, cells, labels = candidates[0]
+    next_label = max(labels) + 1
+    for digit in range(1, 10):
+        if not labels[digit]:
+            labels[digit] = next_label
+            next_label += 1
+
+    transform = Transform(
+        transpose=orientation == 1,
+        rows=rows,
+        columns=tuple(column for cell in cells for column in cell),
+        digits=tuple(labels),
+    )
+    canonical = transform.apply(values)
+
+    return "".join(map(str, canonical)), transform
@@ -0,0 +1,169 @@
+import json
+import sqlite3
+from dataclasses import dataclass
+
+# The number of results kept by default, each taking a few hundred bytes on disk.
+DEFAULT_MAX_ENTRIES = 1_000_000
+
+# Results are only counted for eviction once in this many writes, by any process,
+# so that most writes do not pay for counting. The store can briefly grow past
+# its maximum by this many results.
+EVICTION_INTERVAL = 256
+
+# How long to wait for another process to finish writing before giving up.
+BUSY_TIMEOUT_SECONDS = 30.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    puzzle TEXT NOT NULL,
+    fallback INTEGER NOT NULL,
+    grid TEXT NOT NULL,
+    status TEXT NOT NULL,
+    rules TEXT NOT NULL,
+    PRIMARY KEY (puzzle, fallback)
+)
+"""
+
+# Replacing a row gives it a new rowid, so the smallest rowids are the oldest results.
+_EVICT = """
+DELETE FROM results WHERE rowid <= (
+    SELECT rowid FROM results ORDER BY rowid DESC LIMIT 1 OFFSET ?
+)
+"""
+
+
+@dataclass(frozen=True)
+class StoredResult:
+    grid: str
+    status: str
+    rule_applications: dict[str, int]
+
+
+def _puzzle_key(puzzle: str) -> str:
+    """Normalise a puzzle in line notation, so that any character for an empty cell gives the same key."""
+    return "".join(c if "1" <= c <= "9" else "." for c in puzzle.strip())
+
+
+class ResultStore:
+    def __init__(self, path: str, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Open a persistent store of solver results in an SQLite database, creating it if needed.
+        The database uses write-ahead logging, so any number of processes can read
+        from it while one writes, and results survive restarting the solver.
+        Once full, the results stored longest ago are evicted first.
+        Reading never writes to the database, so reads from many processes do not contend.
+
+        The connection is opened when first used, and a store passed to another process
+        is reopened there from its path, so a store can be handed to worker processes.
+
+        Args:
+            path (str): The database file.
+            max_entries (int): The most results to keep.
+        """
+        if max_entries < 1:
+            raise ValueError("Maximum entries must be at least 1.")
+
+        self.path = path
+        self.max_entries = max_entries
+        self._connection: sqlite3.Connection | None = None
+
+    def __reduce__(self):
+        # Connections cannot be pickled, so another process opens its own.
+        return ResultStore, (self.path, self.max_entries)
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_SECONDS)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with connection:
+                connection.execute(_SCHEMA)
+            self._connection = connection
+
+        return self._connection
+
+    def close(self):
+        """Close the connection to the database, if it is open."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def __len__(self) -> int:
+        (count,) = self._connect().execute("SELECT COUNT(*) FROM results").fetchone()
+        return count
+
+    def get(self, puzzle: str, fallback: bool = False) -> StoredResult | None:
+        """
+        Look up the result of solving a puzzle.
+
+        Args:
+            puzzle (str): The puzzle in line notation.
+            fallback (bool): Whether the puzzle was solved with backtracking search as a fallback.
+
+        Returns:
+            StoredResult | None: The final grid in line notation, its status and
+              the rules applied, or None if the puzzle has not been stored.
+        """
+        row = (
+            self._connect()
+            .execute(
+                "SELECT grid, status, rules FROM results WHERE puzzle = ? AND fallback = ?",
+                (_puzzle_key(puzzle), fallback),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+
+        grid, status, rules = row
+        return StoredResult(grid, status, json.loads(rules))
+
+    def put(
+        self,
+        puzzle: str,
+        fallback: bool,
+        grid: str,
+        status: str,
+        rule_applications: dict[str, int],
+    ):
+        """
+        Store the result of solving a puzzle, replacing any result stored for it before.
+
+        Args:
+            puzzle (str): The puzzle in line notation.
+            fallback (bool): Whether the puzzle was solved with backtracking search as a fallback.
+            grid (str): The final state of the grid in line notation.
+            status (str): The status of the result, such as "solved".
+            rule_applications (dict[str, int]): The number of times each rule was applied.
+        """
+        connection = self._connect()
+        with connection:
+            cursor = connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                (
+                    _puzzle_key(puzzle),
+                    fallback,
+                    grid,
+                    status,
+                    json.dumps(rule_applications),
+                ),
+            )
+
+            # Each new row takes the next rowid, whichever process wrote the last one.
+            if (
+                cursor.lastrowid is not None
+                and cursor.lastrowid % EVICTION_INTERVAL == 0
+            ):
+                connection.execute(_EVICT, (self.max_entries,))
+
+    def evict(self):
+        """Evict the results stored longest ago until the store holds at most max_entries."""
+        connection = self._connect()
+        with connection:
+            connection.execute(_EVICT, (self.max_entries,))
@@ -0,0 +1,89 @@
+from collections import OrderedDict
+from collections.abc import Hashable
+
+from caching.canonical import Transform, canonical_form
+
+# The number of solutions kept by default, each taking a few hundred bytes.
+DEFAULT_MAXSIZE = 10_000
+
+
+class SolutionCache:
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        """
+        Construct a cache of solutions which recognises puzzles equivalent under the
+        Sudoku symmetry group, so that a relabelled, transposed or permuted copy of
+        a puzzle solved before is answered without solving it again.
+        Once full, the least recently used solution is discarded for each one added.
+
+        Args:
+            maxsize (int): The most solutions to keep.
+        """
+        if maxsize < 1:
+            raise ValueError("Maximum size must be at least 1.")
+
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._solutions: OrderedDict[tuple[str, Hashable], str] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._solutions)
+
+    def key(
+        self, values: list[int | None], variant: Hashable = None
+    ) -> tuple[tuple[str, Hashable], Transform] | None:
+        """
+        Find the key of a puzzle, and the transformation of the puzzle into its canonical form.
+
+        Args:
+            values (list[int | None]): The 81 values of the puzzle, indexed by y * 9 + x.
+            variant (Hashable): Separates solutions found in different ways, such as with or without fallback.
+
+        Returns:
+            tuple | None: The key and transformation, or None if the puzzle has no canonical form.
+        """
+        found = canonical_form([value or 0 for value in values])
+        if found is None:
+            return None
+
+        form, transform = found
+        return (form, variant), transform
+
+    def get(self, key: tuple[str, Hashable], transform: Transform) -> list[int] | None:
+        """
+        Look up the solution of a puzzle, marking it as recently used.
+
+        Args:
+            key (tuple): The key of the puzzle, from key().
+            transform (Transform): The transformation of the puzzle into its canonical form.
+
+        Returns:
+            list[int] | None: The 81 values of the solution in the orientation of the puzzle,
+              or None if it is not cached.
+        """
+        solution = self._solutions.get(key)
+        if solution is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._solutions.move_to_end(key)
+        return transform.invert([int(value) for value in solution])
+
+    def put(self, key: tuple[str, Hashable], transform: Transform, values: list[int]):
+        """
+        Store the solution of a puzzle, discarding the least recently used solution if full.
+
+        Args:
+            key (tuple): The key of the puzzle, from key().
+            transform (Transform): The transformation of the puzzle into its canonical form.
+            values (list[int]): The 81 values of the solution in the orientation of the puzzle.
+        """
+        self._solutions[key] = "".join(map(str, transform.apply(values)))
+        self._solutions.move_to_end(key)
+        if len(self._solutions) > self.maxsize:
+            self._solutions.popitem(last=False)
+
+    def clear(self):
+        """Discard every cached solution."""
+        self._solutions.clear()
@@ -1,5 +1,22 @@
+from .candidate_mask import (
+    ALL_CANDIDATES_MASK,
+    MASK_CANDIDATES,
+    candidate_bit,
+    candidates_from_mask,
+    mask_from_candidates,
+)
 from .cell import Cell
-from .grid import Grid
+from .grid import Grid, GridSnapshot
 from .point import Point
 
-__all__ = ["Cell", "Grid", "Point"]
+__all__ = [
+    "ALL_CANDIDATES_MASK",
+    "MASK_CANDIDATES",
+    "Cell",
+    "Grid",
+    "GridSnapshot",
+    "Point",
+    "candidate_bit",
+    "candidates_from_mask",
+    "mask_from_candidates",
+]
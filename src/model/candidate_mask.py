@@ -0,0 +1,53 @@
+from typing import Iterable
+
+# Candidates are stored as 9-bit integers where bit (n - 1) is set when n is a candidate.
+ALL_CANDIDATES_MASK = 0b111111111
+
+# The candidates represented by every possible 9-bit mask, in ascending order.
+MASK_CANDIDATES: tuple[tuple[int, ...], ...] = tuple(
+    tuple(candidate for candidate in range(1, 10) if mask & (1 << (candidate - 1)))
+    for mask in range(ALL_CANDIDATES_MASK + 1)
+)
+
+
+def candidate_bit(candidate: int) -> int:
+    """
+    Get the mask bit representing a single candidate.
+
+    Args:
+        candidate (int): The candidate value between 1 and 9.
+
+    Returns:
+        int: A mask with only the bit for the candidate set.
+    """
+    return 1 << (candidate - 1)
+
+
+def mask_from_candidates(candidates: Iterable[int]) -> int:
+    """
+    Convert a collection of candidate values to a mask.
+
+    Args:
+        candidates (Iterable[int]): The candidate values between 1 and 9.
+
+    Returns:
+        int: The mask with a bit set for each candidate.
+    """
+    mask = 0
+    for candidate in candidates:
+        mask |= 1 << (candidate - 1)
+
+    return mask
+
+
+def candidates_from_mask(mask: int) -> set[int]:
+    """
+    Convert a mask to a new set of candidate values.
+
+    Args:
+        mask (int): The 9-bit candidate mask.
+
+    Returns:
+        set[int]: The candidate values represented by the mask.
+    """
+    return set(MASK_CANDIDATES[mask])
@@ -1,13 +1,23 @@
+from typing import Callable
+
+from model.candidate_mask import (
+    ALL_CANDIDATES_MASK,
+    MASK_CANDIDATES,
+    mask_from_candidates,
+)
 from model.point import Point
 
 
 class Cell:
     """
     A class representing a cell in a Sudoku grid.
+    The cell is a view over the value and candidate mask stored at its index in shared lists,
+    so a grid can hold the state of all its cells in two flat lists.
 
     Attributes:
         value (int | None): The value of the cell.
         candidates (set): A set of possible candidates for the cell's value.
+        mask (int): The candidates for the cell's value as a 9-bit mask.
     """
 
     def __init__(
@@ -16,6 +26,10 @@ class Cell:
         block: Point,
         coord_in_block: Point,
         value: int | None = None,
+        index: int = 0,
+        values: list[int | None] | None = None,
+        masks: list[int] | None = None,
+        on_change: Callable[[int, int], None] | None = None,
     ):
         """
         Initializes a Cell instance.
@@ -25,12 +39,21 @@ class Cell:
             block (Point): The coordinates of the cell's 3x3 block.
             coord_in_block (Point): The coordinates of the cell within its 3x3 block.
             value (int | None): The initial value of the cell. Defaults to None.
+            index (int): The index of the cell's state in the values and masks lists. Defaults to 0.
+            values (list | None): The list holding cell values. Defaults to a list for this cell only.
+            masks (list | None): The list holding candidate masks. Defaults to a list for this cell only.
+            on_change (Callable | None): Called with the cell's index and previous candidate mask
+              whenever the cell's value or candidates change. Defaults to None.
         """
         self._coord = coord
         self._block = block
         self._coord_in_block = coord_in_block
-        self._value: int | None = None
-        self._candidates = set(range(1, 10))
+        self._index = index
+        self._values: list[int | None] = values if values is not None else [None]
+        self._masks: list[int] = masks if masks is not None else [0]
+        self._values[index] = None
+        self._masks[index] = ALL_CANDIDATES_MASK
+        self._on_change = on_change
         self.value = value
 
     @property
@@ -63,6 +86,16 @@ class Cell:
         """
         return self._coord_in_block
 
+    @property
+    def index(self) -> int:
+        """
+        Returns the index of the cell's state in the values and masks lists.
+
+        Returns:
+            int: The index of the cell, which is y * 9 + x for cells in a grid.
+        """
+        return self._index
+
     @property
     def value(self) -> int | None:
         """
@@ -71,7 +104,7 @@ class Cell:
         Returns:
             int | None: The value of the cell.
         """
-        return self._value
+        return self._values[self._index]
 
     @value.setter
     def value(self, value: int | None):
@@ -81,14 +114,17 @@ class Cell:
         Args:
             value (int): The new value for the cell.
         """
-        if self._value is not None:
+        if self._values[self._index] is not None:
             raise ValueError("Cannot set value of a cell that already has a value.")
         if value is not None and not (1 <= value <= 9):
             raise ValueError("Value must be between 1 and 9.")
 
-        self._value = value
+        self._values[self._index] = value
         if value is not None:
-            self._candidates.clear()
+            old_mask = self._masks[self._index]
+            self._masks[self._index] = 0
+            if self._on_change is not None:
+                self._on_change(self._index, old_mask)
 
     @property
     def candidates(self) -> set[int]:
@@ -99,7 +135,7 @@ class Cell:
         Returns:
             set: The set of candidates for the cell.
         """
-        return self._candidates.copy()
+        return set(MASK_CANDIDATES[self._masks[self._index]])
 
     @candidates.setter
     def candidates(self, candidates: set[int]):
@@ -109,11 +145,54 @@ class Cell:
         Args:
             candidates (set): The new set of candidates for the cell.
         """
-        if self._value is not None:
+        if self._values[self._index] is not None:
             raise ValueError(
                 "Cannot set candidates for a cell that already has a value."
             )
         if not all(1 <= candidate <= 9 for candidate in candidates):
             raise ValueError("All candidates must be between 1 and 9.")
 
-        self._candidates = set(candidates)
+        self._update_mask(mask_from_candidates(candidates))
+
+    @property
+    def mask(self) -> int:
+        """
+        Returns the candidates for the cell as a 9-bit mask.
+        Bit (n - 1) of the mask is set when n is a candidate.
+
+        Returns:
+            int: The candidate mask for the cell.
+        """
+        return self._masks[self._index]
+
+    @mask.setter
+    def mask(self, mask: int):
+        """
+        Sets the candidates for the cell from a 9-bit mask.
+
+        Args:
+            mask (int): The new candidate mask for the cell.
+        """
+        if self._values[self._index] is not None:
+            raise ValueError(
+                "Cannot set candidates for a cell that already has a value."
+            )
+        if not (0 <= mask <= ALL_CANDIDATES_MASK):
+            raise ValueError("All candidates must be between 1 and 9.")
+
+        self._update_mask(mask)
+
+    def _update_mask(self, mask: int):
+        """
+        Store a new candidate mask, reporting it if the candidates changed.
+
+        Args:
+            mask (int): The new candidate mask for the cell.
+        """
+        old_mask = self._masks[self._index]
+        if mask == old_mask:
+            return
+
+        self._masks[self._index] = mask
+        if self._on_change is not None:
+            self._on_change(self._index, old_mask)
@@ -1,13 +1,38 @@
 import re
-from typing import Iterator
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Hashable, Iterator
 
+from model.candidate_mask import ALL_CANDIDATES_MASK, candidate_bit
 from model.point import Point
+from model.units import (
+    CELL_UNIT_BITS,
+    CELL_UNITS,
+    COLUMN_SEGMENTS,
+    INTERSECTION_UNITS,
+    INTERSECTIONS,
+    PEERS,
+    ROW_SEGMENTS,
+    UNITS,
+)
 
 from .cell import Cell
 
 numeric_regex = re.compile(r"^[1-9]$")
 
 
+@dataclass(frozen=True)
+class GridSnapshot:
+    """
+    The values and candidate masks of every cell of a grid at one moment, indexed by y * 9 + x.
+    A snapshot holds 162 small integers, which Python shares between tuples,
+    so even thousands of nested snapshots take little memory.
+    """
+
+    values: tuple[int | None, ...]
+    masks: tuple[int, ...]
+
+
 class Grid:
     def __init__(self, values: list[list[int | None]]):
         """
@@ -18,12 +43,18 @@ class Grid:
         """
         self._create_grid(values)
         self._initialize_candidates()
+        # The trail starts from the initial state of the grid.
+        self._trail.clear()
 
     def _create_grid(self, values: list[list[int | None]]):
         """
         Create a 2D list of Cell objects from the given values.
         Each value in the list is used to create a Cell object.
         If the value is None, the cell will be initialized with no value.
+        Cells, their values and their candidate masks are stored in flat lists of 81 items,
+        indexed by y * 9 + x, so any cell can be looked up by position.
+        The cells of every unit, peer group and intersection are collected from the
+        lookup tables in model.units, once each, so they never have to be searched for.
 
         Args:
             values (list): A 2D list of integers or None representing the grid.
@@ -31,20 +62,303 @@ class Grid:
         if len(values) != 9 or any(len(row) != 9 for row in values):
             raise ValueError("Grid must be 9x9.")
 
-        grid: set[Cell] = set()
+        self._values: list[int | None] = [None] * 81
+        self._masks: list[int] = [ALL_CANDIDATES_MASK] * 81
+
+        # Change stamps record when each cell, unit and candidate value last changed.
+        self._stamp = 0
+        self._cell_stamps = [0] * 81
+        self._unit_stamps = [0] * 27
+        self._candidate_stamps = [0] * 9
+        self._rule_stamps: dict[Hashable, int] = {}
+
+        # The positions of each candidate in each unit, kept in step with the masks.
+        # Every cell starts with every candidate, before the cells are given their values.
+        self._positions = [ALL_CANDIDATES_MASK] * (len(UNITS) * 9)
+
+        # The trail holds the index, value and candidate mask of a cell before each change.
+        self._trail: list[tuple[int, int | None, int]] = []
+
+        # Cells left without candidates and positions emptied since contradictions were last checked.
+        # Positions also empty when their candidate is placed, so both are checked lazily.
+        self._emptied_cells: set[int] = set()
+        self._emptied_positions: set[int] = set()
+
+        grid: list[Cell] = []
         for irow, row in enumerate(values):
             for icol, value in enumerate(row):
-                grid.add(
+                grid.append(
                     Cell(
                         coord=Point(icol, irow),
                         block=Point(icol // 3, irow // 3),
                         coord_in_block=Point(icol % 3, irow % 3),
                         value=value,
+                        index=irow * 9 + icol,
+                        values=self._values,
+                        masks=self._masks,
+                        on_change=self._record_change,
                     )
                 )
 
         self._grid = grid
 
+        self._units = tuple(self._cells_at(unit) for unit in UNITS)
+
+    def _record_change(self, index: int, old_mask: int, old_value: int | None = None):
+        """
+        Add the previous state of a cell to the trail, and stamp the cell as modified.
+        Called by cells whenever their value or candidates change.
+        Cells can only change while they have no value, so old_value defaults to None.
+
+        Args:
+            index (int): The index of the changed cell.
+            old_mask (int): The candidate mask of the cell before the change.
+            old_value (int | None): The value of the cell before the change.
+        """
+        self._trail.append((index, old_value, old_mask))
+        self._stamp_change(index, old_mask)
+
+    def _stamp_change(self, index: int, old_mask: int):
+        """
+        Stamp the cell, its units and its changed candidates as modified,
+        and move the cell in or out of the positions of its changed candidates.
+
+        Args:
+            index (int): The index of the changed cell.
+            old_mask (int): The candidate mask of the cell before the change.
+        """
+        self._stamp += 1
+        stamp = self._stamp
+
+        self._cell_stamps[index] = stamp
+        for unit in CELL_UNITS[index]:
+            self._unit_stamps[unit] = stamp
+
+        mask = self._masks[index]
+        if not mask:
+            self._emptied_cells.add(index)
+
+        positions = self._positions
+        unit_bits = CELL_UNIT_BITS[index]
+        changed = old_mask ^ mask
+        while changed:
+            bit = changed & -changed
+            candidate = bit.bit_length() - 1
+            self._candidate_stamps[candidate] = stamp
+            for unit, position_bit in unit_bits:
+                position = unit * 9 + candidate
+                positions[position] ^= position_bit
+                if not positions[position]:
+                    self._emptied_positions.add(position)
+            changed ^= bit
+
+    @property
+    def contradicted(self) -> bool:
+        """
+        Check whether the grid has reached a contradiction: an empty cell with no candidates,
+        or a candidate with no positions left in a unit where it has not been placed.
+        Contradictions are noted as candidates are removed, so only the cells and positions
+        emptied since the last check are examined, and checking after every change is cheap.
+
+        Returns:
+            bool: True if the grid cannot be solved from its current candidates.
+        """
+        values = self._values
+        masks = self._masks
+        positions = self._positions
+
+        self._emptied_cells = {
+            index
+            for index in self._emptied_cells
+            if values[index] is None and not masks[index]
+        }
+        self._emptied_positions = {
+            position
+            for position in self._emptied_positions
+            if not positions[position]
+            and position % 9 + 1 not in map(values.__getitem__, UNITS[position // 9])
+        }
+
+        return bool(self._emptied_cells or self._emptied_positions)
+
+    def start_pass(self, rule: Hashable) -> int:
+        """
+        Record that a rule is starting a pass over the grid.
+        Rules use the returned stamp to skip cells and units which have not changed
+        since their previous pass, because those cannot give any new results.
+
+        Args:
+            rule (Hashable): A key identifying the rule, unique for each variant of a rule.
+
+        Returns:
+            int: The change stamp when the rule's previous pass started, or -1 if it never ran.
+        """
+        previous = self._rule_stamps.get(rule, -1)
+        self._rule_stamps[rule] = self._stamp
+        return previous
+
+    def changed_since(self, stamp: int) -> bool:
+        """
+        Check whether any cell in the grid has changed since the given stamp.
+
+        Args:
+            stamp (int): A stamp returned by start_pass.
+
+        Returns:
+            bool: True if any value or candidate has changed since the stamp.
+        """
+        return self._stamp > stamp
+
+    def cell_changed_since(self, cell: Cell, stamp: int) -> bool:
+        """
+        Check whether a cell has changed since the given stamp.
+
+        Args:
+            cell (Cell): The cell to check.
+            stamp (int): A stamp returned by start_pass.
+
+        Returns:
+            bool: True if the cell's value or candidates have changed since the stamp.
+        """
+        return self._cell_stamps[cell.index] > stamp
+
+    def candidate_changed_since(self, candidate: int, stamp: int) -> bool:
+        """
+        Check whether a candidate value has been added to or removed from any cell since the given stamp.
+
+        Args:
+            candidate (int): The candidate value between 1 and 9.
+            stamp (int): A stamp returned by start_pass.
+
+        Returns:
+            bool: True if the candidate has changed in any cell since the stamp.
+        """
+        return self._candidate_stamps[candidate - 1] > stamp
+
+    def snapshot(self) -> GridSnapshot:
+        """
+        Save the values and candidates of every cell, in time and space proportional to the 81 cells.
+        Searches can snapshot the grid before trying a value and restore it afterwards,
+        rather than copying the grid and its cells.
+
+        Returns:
+            GridSnapshot: The state of the grid, for restore.
+        """
+        return GridSnapshot(tuple(self._values), tuple(self._masks))
+
+    def restore(self, snapshot: GridSnapshot):
+        """
+        Return every cell to its value and candidates when the snapshot was taken.
+        The cells which differ from the snapshot are recorded as changed,
+        so rules tracking changes with start_pass examine them again.
+
+        Args:
+            snapshot (GridSnapshot): A snapshot taken from this grid.
+        """
+        values = self._values
+        masks = self._masks
+        if snapshot.masks == tuple(masks) and snapshot.values == tuple(values):
+            return
+
+        for index, (value, mask) in enumerate(zip(snapshot.values, snapshot.masks)):
+            if mask != masks[index] or value != values[index]:
+                old_mask = masks[index]
+                old_value = values[index]
+                values[index] = value
+                masks[index] = mask
+                self._record_change(index, old_mask, old_value)
+
+    def mark(self) -> int:
+        """
+        Mark the current position in the trail of changes to the grid.
+        Every value set and candidate removed is added to the trail, whether through
+        the cells, set_cell_value or restore, so the grid can be rolled back to the mark.
+
+        Returns:
+            int: The mark, for rollback and changes_since.
+        """
+        return len(self._trail)
+
+    def rollback(self, mark: int):
+        """
+        Undo every change made since the mark, in time proportional to the number of changes.
+        The cells changed are recorded as changed, so rules tracking changes
+        with start_pass examine them again.
+
+        Args:
+            mark (int): A mark returned by mark, which must not have been rolled back past.
+        """
+        if not 0 <= mark <= len(self._trail):
+            raise ValueError("Mark is not in the trail.")
+
+        values = self._values
+        masks = self._masks
+        trail = self._trail
+        while len(trail) > mark:
+            index, value, mask = trail.pop()
+            old_mask = masks[index]
+            values[index] = value
+            masks[index] = mask
+            self._stamp_change(index, old_mask)
+
+    def changes_since(self, mark: int) -> dict[int, tuple[int | None, int]]:
+        """
+        Get the current state of every cell changed since the mark, as a compact diff of the grid.
+
+        Args:
+            mark (int): A mark returned by mark.
+
+        Returns:
+            dict[int, tuple[int | None, int]]: The value and candidate mask of each changed cell,
+              keyed by its index y * 9 + x.
+        """
+        if not 0 <= mark <= len(self._trail):
+            raise ValueError("Mark is not in the trail.")
+
+        return {
+            index: (self._values[index], self._masks[index])
+            for index, _, _ in self._trail[mark:]
+        }
+
+    def _cells_at(self, indices: tuple[int, ...]) -> frozenset[Cell]:
+        """
+        Collect the cells at the given indices into a frozen set.
+
+        Args:
+            indices (tuple[int, ...]): Indices of cells in the grid.
+
+        Returns:
+            frozenset[Cell]: The cells at the indices.
+        """
+        return frozenset(self._grid[i] for i in indices)
+
+    @cached_property
+    def _peers(self) -> tuple[frozenset[Cell], ...]:
+        return tuple(self._cells_at(peers) for peers in PEERS)
+
+    @cached_property
+    def _row_segments(self) -> tuple[tuple[frozenset[Cell], ...], ...]:
+        return tuple(
+            tuple(self._cells_at(segment) for segment in segments)
+            for segments in ROW_SEGMENTS
+        )
+
+    @cached_property
+    def _column_segments(self) -> tuple[tuple[frozenset[Cell], ...], ...]:
+        return tuple(
+            tuple(self._cells_at(segment) for segment in segments)
+            for segments in COLUMN_SEGMENTS
+        )
+
+    @cached_property
+    def _intersections(
+        self,
+    ) -> tuple[tuple[frozenset[Cell], frozenset[Cell], frozenset[Cell]], ...]:
+        return tuple(
+            (self._cells_at(segment), self._cells_at(block), self._cells_at(line))
+            for segment, block, line in INTERSECTIONS
+        )
+
     def _initialize_candidates(self):
         """
         Initialize candidates for each cell in the grid.
@@ -52,14 +366,55 @@ class Grid:
         Remove candidate values based on the neighbouring cells with definite values.
         Cells that already have a value are skipped.
         """
-        for cell in self:
-            if cell.value is not None:
+        values = self._values
+        for index, cell in enumerate(self._grid):
+            if values[index] is not None:
                 continue
 
-            cell.candidates = set(range(1, 10))
-            neighbours = self.get_neighbours(cell)
-            n_values = {n.value for n in neighbours if n.value is not None}
-            cell.candidates -= n_values
+            mask = ALL_CANDIDATES_MASK
+            for peer in PEERS[index]:
+                value = values[peer]
+                if value is not None:
+                    mask &= ~candidate_bit(value)
+            cell.mask = mask
+
+    @property
+    def values(self) -> list[int | None]:
+        """
+        Get the values of all cells in the grid, indexed by y * 9 + x.
+        The list is shared with the cells, so it must only be read.
+        Use Cell.value to set the value of a cell.
+
+        Returns:
+            list[int | None]: The 81 values of the grid, with None for empty cells.
+        """
+        return self._values
+
+    @property
+    def masks(self) -> list[int]:
+        """
+        Get the candidate masks of all cells in the grid, indexed by y * 9 + x.
+        The list is shared with the cells, so it must only be read.
+        Use Cell.mask to update the candidates of a cell.
+
+        Returns:
+            list[int]: The 81 candidate masks of the grid.
+        """
+        return self._masks
+
+    @property
+    def positions(self) -> list[int]:
+        """
+        Get the positions of each candidate in each unit, indexed by unit * 9 + candidate - 1,
+        where the units are in the order of model.units.UNITS.
+        Bit n of a position mask is set when the candidate can go in the nth cell of the unit.
+        The masks are kept up to date as candidates change, so they never have to be counted.
+        The list is shared with the grid, so it must only be read.
+
+        Returns:
+            list[int]: The 243 position masks of the grid.
+        """
+        return self._positions
 
     def __iter__(self):
         """
@@ -80,7 +435,10 @@ class Grid:
         Returns:
             Cell: The Cell object at the specified coord, or None if the coord does not exist in the grid.
         """
-        return next((cell for cell in self._grid if cell.coord == coord), None)
+        if not (0 <= coord.x < 9 and 0 <= coord.y < 9):
+            return None
+
+        return self._grid[coord.y * 9 + coord.x]
 
     @classmethod
     def from_rows_notation(self, rows: list[str]) -> "Grid":
@@ -101,7 +459,56 @@ class Grid:
 
         return Grid(values)
 
-    def get_neighbours(self, cell: Cell) -> set[Cell]:
+    @classmethod
+    def from_line_notation(self, line: str) -> "Grid":
+        """
+        Create a grid from a single string of 81 characters, listing the cells row by row.
+        This is the one-puzzle-per-line format used by most published puzzle collections.
+        Characters are interpreted in the same way as from_rows_notation.
+
+        Args:
+            line (str): A string of 81 characters representing the grid.
+        """
+        line = line.strip()
+        if len(line) != 81:
+            raise ValueError("Grid must be 9x9.")
+
+        values = [
+            [int(x) if numeric_regex.match(x) else None for x in line[i : i + 9]]
+            for i in range(0, 81, 9)
+        ]
+
+        return Grid(values)
+
+    @classmethod
+    def from_snapshot(self, snapshot: GridSnapshot) -> "Grid":
+        """
+        Create a grid with the values and candidates of a snapshot, which may have come from
+        another grid or another process. The snapshot is the start of the new grid's trail.
+
+        Args:
+            snapshot (GridSnapshot): The values and candidate masks of every cell.
+        """
+        values = list(snapshot.values)
+        grid = Grid([values[y * 9 : y * 9 + 9] for y in range(9)])
+        grid.restore(snapshot)
+        grid._trail.clear()
+
+        return grid
+
+    def to_line_notation(self) -> str:
+        """
+        Get the values of the grid as a single string of 81 characters, listing the cells row by row.
+        Empty cells are represented by a full stop.
+
+        Returns:
+            str: The grid in line notation.
+        """
+        return "".join(
+            str(value) if value is not None else "." for value in self._values
+        )
+
+    def get_neighbours(self, cell: Cell) -> frozenset[Cell]:
         """
         Get the 20 neighbouring cells of a specified cell in the grid.
         Neighbours include cells in the same row, column, and 3x3 block.
@@ -110,38 +517,95 @@ class Grid:
             cell (Cell): The cell to find neighbours of.
 
         Returns:
-            set[Cell]: A set of 20 Cell objects that are neighbours to the specified cell.
+            frozenset[Cell]: A set of 20 Cell objects that are neighbours to the specified cell.
 
         Raises:
             ValueError: If the cell does not exist in the grid.
         """
-        if cell not in self._grid:
+        if not self._contains(cell):
             raise ValueError("Cell does not exist in the grid.")
 
+        return self._peers[cell.index]
+
+    def _contains(self, cell: Cell | None) -> bool:
+        """
+        Check whether a cell belongs to this grid.
+
+        Args:
+            cell (Cell | None): The cell to check.
+
+        Returns:
+            bool: True if the cell is the one stored at its index in the grid.
+        """
         return (
-            self.get_block_cells(cell.block)
-            .union(self.get_column_cells(cell.coord.x))
-            .union(self.get_row_cells(cell.coord.y))
-            .difference({cell})  # Exclude the cell itself
+            cell is not None and 0 <= cell.index < 81 and self._grid[cell.index] is cell
         )
 
-    def region_iter(self) -> Iterator[set[Cell]]:
+    def region_iter(self, since: int | None = None) -> Iterator[frozenset[Cell]]:
         """
         Get an iterator over all possible regions in the grid.
         A region is one of a 3x3 block, a columns, or a row in the grid.
 
+        Args:
+            since (int | None): Optional.
+              If provided, only regions which have changed since this stamp will be returned.
+              Each region is checked as it is reached, so changes made during iteration are seen.
+
         Returns:
-            Iterator[set[Cell]]: An iterator over sets containing every region of 9 cells in the grid.
+            Iterator[frozenset[Cell]]: An iterator over sets containing every region of 9 cells in the grid.
         """
-        for i in range(9):
-            yield self.get_row_cells(i)
-            yield self.get_column_cells(i)
+        if since is None:
+            yield from self._units
+            return
 
-        for i in range(3):
-            for j in range(3):
-                yield self.get_block_cells(Point(i, j))
+        for unit, region in enumerate(self._units):
+            if self._unit_stamps[unit] > since:
+                yield region
 
-    def get_block_cells(self, block: Point) -> set[Cell]:
+    def unit_iter(self, since: int | None = None) -> Iterator[int]:
+        """
+        Get an iterator over the indices of the units in the grid, for rules which
+        work on the cell indices in model.units.UNITS and the masks of the grid rather than cells.
+
+        Args:
+            since (int | None): Optional.
+              If provided, only units which have changed since this stamp will be returned.
+              Each unit is checked as it is reached, so changes made during iteration are seen.
+
+        Returns:
+            Iterator[int]: An iterator over the indices of the 27 rows, columns and blocks.
+        """
+        for unit in range(len(UNITS)):
+            if since is None or self._unit_stamps[unit] > since:
+                yield unit
+
+    def intersection_iter(
+        self, since: int | None = None
+    ) -> Iterator[tuple[frozenset[Cell], frozenset[Cell], frozenset[Cell]]]:
+        """
+        Get an iterator over the 54 intersections of a 3x3 block with a row or column.
+
+        Args:
+            since (int | None): Optional.
+              If provided, only intersections where the block or the row or column has changed
+              since this stamp will be returned.
+
+        Returns:
+            Iterator[tuple]: An iterator over tuples of the 3 intersecting cells,
+              the other 6 cells of the block and the other 6 cells of the row or column.
+        """
+        if since is None:
+            yield from self._intersections
+            return
+
+        unit_stamps = self._unit_stamps
+        for intersection, (block_unit, line_unit) in zip(
+            self._intersections, INTERSECTION_UNITS
+        ):
+            if unit_stamps[block_unit] > since or unit_stamps[line_unit] > since:
+                yield intersection
+
+    def get_block_cells(self, block: Point) -> frozenset[Cell]:
         """
         Get the 9 cells in the 3x3 block with given coordinates.
 
@@ -149,11 +613,16 @@ class Grid:
             block (Point): The coordinates of the 3x3 block within the grid.
 
         Returns:
-            set[Cell]: A set of 9 Cell objects in the same 3x3 block, or zero items if the block doesn't exist.
+            frozenset[Cell]: A set of 9 Cell objects in the same 3x3 block, or zero items if the block doesn't exist.
         """
-        return {cell for cell in self if cell.block == block}
+        if not (0 <= block.x < 3 and 0 <= block.y < 3):
+            return frozenset()
 
-    def get_column_cells(self, index: int, block_index: int | None = None) -> set[Cell]:
+        return self._units[18 + block.x * 3 + block.y]
+
+    def get_column_cells(
+        self, index: int, block_index: int | None = None
+    ) -> frozenset[Cell]:
         """
         Get cells in the same column.
 
@@ -163,17 +632,21 @@ class Grid:
               If provided, only Cells in the block with the given row index will be returned.
 
         Returns:
-            set[Cell]: A set of Cell objects in the same column.
+            frozenset[Cell]: A set of Cell objects in the same column.
               If the column index does not exist, or the block_coord does not exist, an empty set is returned.
         """
-        block = Point(index // 3, block_index) if block_index is not None else None
-
-        def predicate(cell: Cell) -> bool:
-            return cell.coord.x == index and (block is None or cell.block == block)
-
-        return {cell for cell in self if predicate(cell)}
-
-    def get_row_cells(self, index: int, block_index: int | None = None) -> set[Cell]:
+        if not 0 <= index < 9:
+            return frozenset()
+        if block_index is None:
+            return self._units[index * 2 + 1]
+        if not 0 <= block_index < 3:
+            return frozenset()
+
+        return self._column_segments[index][block_index]
+
+    def get_row_cells(
+        self, index: int, block_index: int | None = None
+    ) -> frozenset[Cell]:
         """
         Get cells in the same row.
 
@@ -183,12 +656,14 @@ class Grid:
               If provided, only Cells in the block with the given column index will be returned.
 
         Returns:
-            set[Cell]: A set of Cell objects in the same row.
+            frozenset[Cell]: A set of Cell objects in the same row.
               If the row index does not exist, or the block_coord does not exist, an empty set is returned.
         """
-        block = Point(block_index, index // 3) if block_index is not None else None
-
-        def predicate(cell: Cell) -> bool:
-            return cell.coord.y == index and (block is None or cell.block == block)
-
-        return {cell for cell in self if predicate(cell)}
+        if not 0 <= index < 9:
+            return frozenset()
+        if block_index is None:
+            return self._units[index * 2]
+        if not 0 <= block_index < 3:
+            return frozenset()
+
+        return self._row_segments[index][block_index]
@@ -0,0 +1,93 @@
+"""
+Static lookup tables describing the structure of a 9x9 Sudoku grid.
+Cells are referred to by index, which is y * 9 + x for the cell at Point(x, y).
+"""
+
+# The cell indices of each row, column and 3x3 block.
+# Blocks are indexed by block_y * 3 + block_x.
+ROWS: tuple[tuple[int, ...], ...] = tuple(
+    tuple(y * 9 + x for x in range(9)) for y in range(9)
+)
+COLUMNS: tuple[tuple[int, ...], ...] = tuple(
+    tuple(y * 9 + x for y in range(9)) for x in range(9)
+)
+BLOCKS: tuple[tuple[int, ...], ...] = tuple(
+    tuple((block_y * 3 + y) * 9 + block_x * 3 + x for y in range(3) for x in range(3))
+    for block_y in range(3)
+    for block_x in range(3)
+)
+
+# The three cells where a row or column crosses a block.
+# Indexed by [row or column][block index along the row or column].
+ROW_SEGMENTS: tuple[tuple[tuple[int, ...], ...], ...] = tuple(
+    tuple(row[b * 3 : b * 3 + 3] for b in range(3)) for row in ROWS
+)
+COLUMN_SEGMENTS: tuple[tuple[tuple[int, ...], ...], ...] = tuple(
+    tuple(column[b * 3 : b * 3 + 3] for b in range(3)) for column in COLUMNS
+)
+
+# All 27 units in the order rows and columns alternate, followed by the blocks.
+UNITS: tuple[tuple[int, ...], ...] = tuple(
+    unit for i in range(9) for unit in (ROWS[i], COLUMNS[i])
+) + tuple(BLOCKS[block_y * 3 + block_x] for block_x in range(3) for block_y in range(3))
+
+# The indices of the units each cell belongs to, as (row, column, block).
+CELL_UNITS: tuple[tuple[int, int, int], ...] = tuple(
+    (
+        (index // 9) * 2,
+        (index % 9) * 2 + 1,
+        18 + (index % 9 // 3) * 3 + index // 27,
+    )
+    for index in range(81)
+)
+
+# For each cell, the index of each of its units with the bit of its position in the unit.
+# Bit n of a position mask is set for the nth cell of the unit, in the order of UNITS.
+CELL_UNIT_BITS: tuple[tuple[tuple[int, int], ...], ...] = tuple(
+    tuple((unit, 1 << UNITS[unit].index(index)) for unit in CELL_UNITS[index])
+    for index in range(81)
+)
+
+# The 20 cells sharing a row, column or block with each cell.
+PEERS: tuple[tuple[int, ...], ...] = tuple(
+    tuple(
+        sorted(
+            {
+                peer
+                for unit in CELL_UNITS[index]
+                for peer in UNITS[unit]
+                if peer != index
+            }
+        )
+    )
+    for index in range(81)
+)
+
+# The 54 intersections of a block with a row or column.
+# Each is (intersection, rest of block, rest of row or column).
+INTERSECTIONS: tuple[tuple[tuple[int, ...], tuple[int, ...], tuple[int, ...]], ...] = (
+    tuple(
+        (
+            segment,
+            tuple(i for i in BLOCKS[block] if i not in segment),
+            tuple(i for i in line if i not in segment),
+        )
+        for cr in range(9)
+        for b in range(3)
+        for segment, block, line in (
+            (COLUMN_SEGMENTS[cr][b], b * 3 + cr // 3, COLUMNS[cr]),
+            (ROW_SEGMENTS[cr][b], (cr // 3) * 3 + b, ROWS[cr]),
+        )
+    )
+)
+
+# The indices of the block unit and the row or column unit of each intersection.
+INTERSECTION_UNITS: tuple[tuple[int, int], ...] = tuple(
+    (18 + block_x * 3 + block_y, line_unit)
+    for cr in range(9)
+    for b in range(3)
+    for block_x, block_y, line_unit in (
+        (cr // 3, b, cr * 2 + 1),
+        (b, cr // 3, cr * 2),
+    )
+)
@@ -0,0 +1,78 @@
+from typing import Sequence
+
+# The weight kept by earlier attempts each time the rules are ordered,
+# so that the order follows the puzzles solved most recently.
+DEFAULT_DECAY = 0.99
+
+# The time a rule is assumed to take per candidate eliminated for each place it has
+# in the given order, before it has been attempted. Attempts soon outweigh this.
+PRIOR_SECONDS_PER_PLACE = 0.0001
+
+
+class AdaptiveOrdering:
+    def __init__(self, decay: float = DEFAULT_DECAY):
+        """
+        Construct an ordering which learns which rules make progress most cheaply on the puzzles being solved.
+        Given to one Solver after another, it is notified of every rule attempted and orders
+        the rules by the time spent on each per candidate it eliminated, so the rules which
+        remove the most candidates for their cost are tried first.
+        Rules which have not been attempted keep their place in the order they are given.
+
+        Args:
+            decay (float): The weight kept by earlier attempts each time the rules are ordered,
+              between 0 and 1. Lower values follow changes in the puzzles more quickly.
+        """
+        if not 0 < decay <= 1:
+            raise ValueError("Decay must be greater than 0 and at most 1.")
+
+        self.decay = decay
+        self._seconds: dict[str, float] = {}
+        self._eliminated: dict[str, float] = {}
+
+    def rule_attempted(
+        self, name: str, applied: bool, seconds: float, eliminated: int
+    ) -> None:
+        """Add one attempt to the totals of a rule.
+
+        Args:
+            name (str): The name of the rule.
+            applied (bool): Whether the rule changed the grid.
+            seconds (float): The wall-clock time taken by the attempt.
+            eliminated (int): The number of candidates removed from the grid by the attempt.
+        """
+        self._seconds[name] = self._seconds.get(name, 0.0) + seconds
+        self._eliminated[name] = self._eliminated.get(name, 0.0) + eliminated
+
+    def cost(self, name: str, place: int = 0) -> float:
+        """
+        Estimate the time spent on a rule for each candidate it eliminates.
+
+        Args:
+            name (str): The name of the rule.
+            place (int): The place of the rule in the given order, counting from 0.
+
+        Returns:
+            float: The estimated seconds per candidate eliminated.
+        """
+        prior = PRIOR_SECONDS_PER_PLACE * (place + 1)
+        return (self._seconds.get(name, 0.0) + prior) / (
+            self._eliminated.get(name, 0.0) + 1
+        )
+
+    def order(self, names: Sequence[str]) -> list[str]:
+        """
+        Order rules from the lowest estimated cost per candidate eliminated to the highest,
+        then reduce the weight of the attempts seen so far.
+
+        Args:
+            names (Sequence[str]): The names of the rules, simplest first.
+
+        Returns:
+            list[str]: The names of the rules in the order to try them.
+        """
+        costs = {name: self.cost(name, place) for place, name in enumerate(names)}
+        for totals in (self._seconds, self._eliminated):
+            for name in totals:
+                totals[name] *= self.decay
+
+        return sorted(names, key=costs.__getitem__)
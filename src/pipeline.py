@@ -0,0 +1,223 @@
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, Mapping, Sequence, TextIO
+
+from model import Grid
+from ordering import AdaptiveOrdering
+from profiling import RuleObserver
+from solver import DEFAULT_PRESET, Budget, Solver
+
+SOLVED = "solved"
+UNSOLVED = "unsolved"
+INVALID = "invalid"
+EXHAUSTED = "exhausted"
+
+
+def final_status(solver: Solver) -> str:
+    """Describe the state of a grid after solving.
+
+    Args:
+        solver (Solver): The solver which has finished solving.
+
+    Returns:
+        str: "solved", "invalid" if the grid reached a contradiction or a complete
+          search found no solution, "exhausted" if the budget ran out, or "unsolved".
+    """
+    if solver.is_solved():
+        return SOLVED
+    if solver.is_contradicted() or solver.no_solution:
+        return INVALID
+
+    return EXHAUSTED if solver.budget_exhausted else UNSOLVED
+
+
+@dataclass
+class PuzzleRecord:
+    index: int
+    puzzle: str
+    grid: Grid | None = None
+    status: str | None = None
+
+    def to_line(self) -> str:
+        """Describe the record as the final state of the grid in line notation, followed by its status.
+
+        Returns:
+            str: The result line, using the puzzle as given when it could not be parsed.
+        """
+        state = self.grid.to_line_notation() if self.grid else self.puzzle.strip()
+        return f"{state} {self.status or UNSOLVED}"
+
+
+# A stage consumes a stream of records and lazily yields a stream of records.
+# Stages should pass on records which already have a status without changing them,
+# so that an earlier stage, such as a cache, can finish a record early.
+Stage = Callable[[Iterator[PuzzleRecord]], Iterator[PuzzleRecord]]
+
+
+def skip_blank_and_comments(
+    records: Iterator[PuzzleRecord],
+) -> Iterator[PuzzleRecord]:
+    """
+    Drop the records whose puzzles are blank lines or lines starting with #,
+    as the batch runner does, so that they are not reported as invalid puzzles.
+
+    Args:
+        records (Iterator[PuzzleRecord]): The records to filter.
+
+    Returns:
+        Iterator[PuzzleRecord]: The records holding puzzles, keeping their input indices.
+    """
+    for record in records:
+        if record.status is None and (
+            not record.puzzle.strip() or record.puzzle.startswith("#")
+        ):
+            continue
+
+        yield record
+
+
+def parse(records: Iterator[PuzzleRecord]) -> Iterator[PuzzleRecord]:
+    """
+    Build the grid of each record from its puzzle.
+    Puzzles with several lines are read in rows notation, and others in line notation.
+    Puzzles which cannot be parsed are marked invalid.
+
+    Args:
+        records (Iterator[PuzzleRecord]): The records to parse.
+
+    Returns:
+        Iterator[PuzzleRecord]: The records with their grids.
+    """
+    for record in records:
+        if record.status is None and record.grid is None:
+            try:
+                rows = record.puzzle.split()
+                record.grid = (
+                    Grid.from_rows_notation(rows)
+                    if len(rows) > 1
+                    else Grid.from_line_notation(record.puzzle)
+                )
+            except ValueError:
+                record.status = INVALID
+
+        yield record
+
+
+def validate(records: Iterator[PuzzleRecord]) -> Iterator[PuzzleRecord]:
+    """
+    Mark the records whose grids have conflicting values as invalid.
+
+    Args:
+        records (Iterator[PuzzleRecord]): The parsed records to validate.
+
+    Returns:
+        Iterator[PuzzleRecord]: The records, with any invalid ones marked.
+    """
+    for record in records:
+        if record.status is None and record.grid is not None:
+            if not Solver(record.grid).is_valid():
+                record.status = INVALID
+
+        yield record
+
+
+def solve(
+    fallback: bool = False,
+    observer: RuleObserver | None = None,
+    rules: str | Sequence[str] = DEFAULT_PRESET,
+    enabled: Mapping[str, bool] | None = None,
+    ordering: AdaptiveOrdering | None = None,
+    budget: Budget | None = None,
+) -> Stage:
+    """
+    Create a stage which solves the grid of each record, marking it solved or unsolved,
+    invalid if solving reached a contradiction or the fallback search found no solution,
+    or exhausted if the budget ran out.
+
+    Args:
+        fallback (bool): Whether to finish grids the rules cannot solve by backtracking search.
+        observer (RuleObserver | None): Notified of every rule attempted, such as a RuleProfiler.
+        rules (str | Sequence[str]): The name of a preset in solver.PRESETS, or the names of the rules in order.
+        enabled (Mapping[str, bool] | None): Rules to leave out when False, or to add when True.
+        ordering (AdaptiveOrdering | None): Learns the cheapest order of the rules from every
+          grid solved, if given.
+        budget (Budget | None): Limits on the time and rule applications of each solve, if given.
+
+    Returns:
+        Stage: The solving stage.
+    """
+
+    def solve_stage(records: Iterator[PuzzleRecord]) -> Iterator[PuzzleRecord]:
+        for record in records:
+            if record.status is None and record.grid is not None:
+                solver = Solver(
+                    record.grid,
+                    fallback,
+                    observer,
+                    rules=rules,
+                    enabled=enabled,
+                    ordering=ordering,
+                    budget=budget,
+                )
+                solver.solve()
+                record.status = final_status(solver)
+
+            yield record
+
+    return solve_stage
+
+
+def emit(output: TextIO) -> Stage:
+    """
+    Create a stage which writes the result line of each record as it passes.
+
+    Args:
+        output (TextIO): Where to write the result lines.
+
+    Returns:
+        Stage: The writing stage.
+    """
+
+    def emit_stage(records: Iterator[PuzzleRecord]) -> Iterator[PuzzleRecord]:
+        for record in records:
+            output.write(record.to_line() + "\n")
+            yield record
+
+    return emit_stage
+
+
+def default_stages(fallback: bool = False) -> list[Stage]:
+    """
+    Get the stages which skip blank and comment lines, then parse, validate and solve
+    each puzzle, in order.
+
+    Args:
+        fallback (bool): Whether to finish grids the rules cannot solve by backtracking search.
+
+    Returns:
+        list[Stage]: The stages, to which others can be added or inserted.
+    """
+    return [skip_blank_and_comments, parse, validate, solve(fallback)]
+
+
+def run_pipeline(
+    puzzles: Iterable[str], stages: Sequence[Stage] | None = None
+) -> Iterator[PuzzleRecord]:
+    """
+    Pass a stream of puzzles through a chain of stages, yielding a record for each puzzle.
+    Every stage is a generator, so each puzzle is read only when its record is requested
+    and memory use does not grow with the number of puzzles.
+
+    Args:
+        puzzles (Iterable[str]): The puzzles, in line notation or rows notation. Read lazily.
+        stages (Sequence[Stage] | None): The stages to apply in order. Defaults to default_stages().
+
+    Returns:
+        Iterator[PuzzleRecord]: The record of each puzzle after the last stage, in input order.
+    """
+    records: Iterator[PuzzleRecord] = (
+        PuzzleRecord(index=index, puzzle=puzzle) for index, puzzle in enumerate(puzzles)
+    )
+    for stage in default_stages() if stages is None else stages:
+        records = stage(records)
+
+    return records
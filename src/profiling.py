@@ -0,0 +1,84 @@
+import json
+from dataclasses import asdict, dataclass
+from typing import Protocol, TextIO
+
+
+class RuleObserver(Protocol):
+    """Receives a notification after each rule the Solver attempts."""
+
+    def rule_attempted(
+        self, name: str, applied: bool, seconds: float, eliminated: int
+    ) -> None:
+        """Record one attempt to apply a rule.
+
+        Args:
+            name (str): The name of the rule.
+            applied (bool): Whether the rule changed the grid.
+            seconds (float): The wall-clock time taken by the attempt.
+            eliminated (int): The number of candidates removed from the grid by the attempt.
+        """
+        ...
+
+
+@dataclass
+class RuleStats:
+    calls: int = 0
+    hits: int = 0
+    seconds: float = 0.0
+    eliminated: int = 0
+
+
+class RuleProfiler:
+    def __init__(self):
+        """Construct a RuleProfiler which totals the attempts of each rule by name."""
+        self.rules: dict[str, RuleStats] = {}
+
+    def rule_attempted(
+        self, name: str, applied: bool, seconds: float, eliminated: int
+    ) -> None:
+        """Add one attempt to the totals of a rule.
+
+        Args:
+            name (str): The name of the rule.
+            applied (bool): Whether the rule changed the grid.
+            seconds (float): The wall-clock time taken by the attempt.
+            eliminated (int): The number of candidates removed from the grid by the attempt.
+        """
+        stats = self.rules.get(name)
+        if stats is None:
+            stats = self.rules[name] = RuleStats()
+
+        stats.calls += 1
+        stats.hits += applied
+        stats.seconds += seconds
+        stats.eliminated += eliminated
+
+    def merge(self, other: "RuleProfiler"):
+        """Add the totals of another profiler to this one.
+
+        Args:
+            other (RuleProfiler): The profiler to add.
+        """
+        for name, stats in other.rules.items():
+            totals = self.rules.setdefault(name, RuleStats())
+            totals.calls += stats.calls
+            totals.hits += stats.hits
+            totals.seconds += stats.seconds
+            totals.eliminated += stats.eliminated
+
+    def to_dict(self) -> dict[str, dict[str, int | float]]:
+        """Get the totals of each rule, in the order the rules were first attempted.
+
+        Returns:
+            dict: The calls, hits, seconds and eliminated counts keyed by rule name.
+        """
+        return {name: asdict(stats) for name, stats in self.rules.items()}
+
+    def write_json(self, output: TextIO):
+        """Write the totals of each rule as a JSON report.
+
+        Args:
+            output (TextIO): Where to write the report.
+        """
+        json.dump({"rules": self.to_dict()}, output, indent=2)
+        output.write("\n")
@@ -0,0 +1,30 @@
+from model import Grid
+from rules.set_cell_value import set_cell_value
+from search import find_solution
+
+
+def apply_backtracking_rule(grid: Grid, deadline: float | None = None) -> bool:
+    """
+    Solve all remaining cells by backtracking search.
+    Unlike the other rules, this does not follow a technique a human would use,
+    so it is only used as a fallback when the other rules cannot make progress.
+
+    Args:
+        grid (Grid): The Sudoku grid to apply the solver to.
+        deadline (float | None): The time.perf_counter value at which to give up searching.
+          Unlimited when None.
+
+    Returns:
+        bool: True if the solver could be applied, False otherwise.
+    """
+    solution = find_solution(grid, deadline)
+    if solution is None:
+        return False
+
+    applied = False
+    for cell in grid:
+        if cell.value is None:
+            set_cell_value(grid, cell, solution[cell.index])
+            applied = True
+
+    return applied
@@ -1,88 +1,231 @@
-from itertools import combinations
-from model import Grid, Point
+from collections.abc import Hashable
+from typing import Callable, Iterator
 
+from model import Grid, Point, MASK_CANDIDATES, candidate_bit
 
-def _has_candidate_at(grid: Grid, column: int, row: int, candidate: int) -> bool:
-    cell = grid[Point(column, row)]
-    return (cell is not None) and (candidate in cell.candidates)
+# Each bitboard is a list of 9 lines (rows or columns) for a single candidate.
+# Bit n of a line is set when the candidate can go in the nth cell of the line.
+Bitboard = list[int]
 
+# A search over a bitboard for a fish size, yielding each elimination found
+# as a mask of lines and a mask of positions to remove the candidate from.
+FishSearch = Callable[[Bitboard, int], Iterator[tuple[int, int]]]
 
-def apply_fish_rule(grid: Grid, size: int) -> bool:
+ALL_LINES = 0b111111111
+
+# The positions of each box along a line, and the lines crossing each box.
+# These are the same for rows and columns, as a box spans 3 of each.
+BOX_MASKS = (0b000000111, 0b000111000, 0b111000000)
+
+
+def _bitboards(grid: Grid, transpose: bool) -> list[Bitboard]:
     """
-    Apply the fish rule (X-Wing, Swordfish, Jellyfish) to the Sudoku grid.
+    Build a bitboard for each candidate from the cell masks of the grid.
+
+    Args:
+        grid (Grid): The Sudoku grid to read the candidates from.
+        transpose (bool): Whether the lines of each bitboard are columns rather than rows.
+
+    Returns:
+        list[Bitboard]: The bitboards of candidates 1 to 9, in order.
+    """
+    boards = [[0] * 9 for _ in range(9)]
+    for index, mask in enumerate(grid.masks):
+        if not mask:
+            continue
+
+        line, position = divmod(index, 9)
+        if transpose:
+            line, position = position, line
+
+        bit = 1 << position
+        for candidate in MASK_CANDIDATES[mask]:
+            boards[candidate - 1][line] |= bit
+
+    return boards
+
+
+def _base_iter(
+    board: Bitboard, size: int, viable: Callable[[int], bool]
+) -> Iterator[tuple[int, int]]:
+    """
+    Find every set of base lines which could form a fish, with the positions they cover.
+    The sets are searched depth first in the same order as itertools.combinations,
+    abandoning any partial set whose covered positions are no longer viable.
+    Lines are read from the bitboard as they are reached, so the caller may
+    remove candidates from lines outside each set before resuming the search.
+
+    Args:
+        board (Bitboard): The bitboard of a single candidate.
+        size (int): The number of base lines in the fish.
+        viable (Callable[[int], bool]): Whether a mask of covered positions could still form a fish.
+
+    Returns:
+        Iterator[tuple[int, int]]: The base lines and their covered positions, as bitmasks.
+    """
+    lines = [line for line in range(9) if board[line]]
+
+    def search(start: int, depth: int, base: int, cover: int):
+        for position in range(start, len(lines) - size + depth + 1):
+            line = lines[position]
+            line_cover = cover | board[line]
+            if not viable(line_cover):
+                continue
+
+            if depth + 1 == size:
+                yield base | (1 << line), line_cover
+            else:
+                yield from search(
+                    position + 1, depth + 1, base | (1 << line), line_cover
+                )
+
+    yield from search(0, 0, 0, 0)
+
+
+def _fish_iter(board: Bitboard, size: int) -> Iterator[tuple[int, int]]:
+    """
+    Find every set of base lines whose candidates are confined to as many cover lines.
+    The candidate can be removed from the cover lines outside the base lines.
+
+    Args:
+        board (Bitboard): The bitboard of a single candidate.
+        size (int): The number of base lines in the fish.
+
+    Returns:
+        Iterator[tuple[int, int]]: The lines and positions to remove the candidate from, as bitmasks.
+    """
+    for base, cover in _base_iter(board, size, lambda cover: cover.bit_count() <= size):
+        if cover.bit_count() == size:
+            yield ALL_LINES & ~base, cover
+
+
+def _finned_fish_iter(board: Bitboard, size: int) -> Iterator[tuple[int, int]]:
+    """
+    Find every finned fish, including sashimi fish, of the given size.
+    A finned fish is a set of base lines whose candidates are confined to as many
+    cover lines, apart from fins which all lie in one box. If no fin holds the
+    candidate then it forms a basic fish, so in either case the candidate can be
+    removed from the cover lines outside the base lines within the box of the fins.
+    In a sashimi fish, a base line has no candidate where it crosses a cover line in that box.
+
+    Args:
+        board (Bitboard): The bitboard of a single candidate.
+        size (int): The number of base lines in the fish.
+
+    Returns:
+        Iterator[tuple[int, int]]: The lines and positions to remove the candidate from, as bitmasks.
+    """
+
+    # Every covered position outside the box of the fins must be a cover line.
+    def viable(cover: int) -> bool:
+        return any((cover & ~box).bit_count() <= size for box in BOX_MASKS)
+
+    for base, cover in _base_iter(board, size, viable):
+        if cover.bit_count() <= size:
+            continue
+
+        for box in BOX_MASKS:
+            outside = cover & ~box
+            inside = cover & box
+            needed = size - outside.bit_count()
+            if needed <= 0 or needed >= inside.bit_count():
+                continue
+
+            # Try every choice of cover lines in the box, leaving the rest as fins.
+            targets = inside
+            while targets:
+                if targets.bit_count() == needed:
+                    fins = inside & ~targets
+                    fin_boxes = {
+                        line // 3
+                        for line in range(9)
+                        if base >> line & 1 and board[line] & fins
+                    }
+                    if len(fin_boxes) == 1:
+                        yield BOX_MASKS[fin_boxes.pop()] & ~base, targets
+
+                targets = (targets - 1) & inside
+
+
+def _apply_fish_search(
+    grid: Grid, size: int, key: Hashable, fish_search: FishSearch
+) -> bool:
+    """
+    Remove candidates found by a fish search in both rows and columns.
 
     Args:
         grid (Grid): The Sudoku grid to apply the solver to.
-        size (int): The size of the fish pattern (2 for X-Wing, 3 for Swordfish, 4 for Jellyfish).
+        size (int): The number of base lines in the fish.
+        key (Hashable): The key to track the passes of the rule with.
+        fish_search (FishSearch): The search for eliminations on a single bitboard.
 
     Returns:
-        bool: True if the solver could be applied, False otherwise.
+        bool: True if any candidates were removed, False otherwise.
     """
     if size < 2 or size > 4:
         raise ValueError("Size must be between 2 and 4.")
 
     applied = False
+    since = grid.start_pass(key)
 
-    # Check rows for fish patterns
-    for candidate in range(1, 10):
-        rows_with_candidate = [
-            r
-            for r in range(9)
-            if sum(True for c in range(9) if _has_candidate_at(grid, c, r, candidate))
-            > 0
-        ]
-        if len(rows_with_candidate) < size:
-            continue
+    # Fish for a candidate only depend on where that candidate can go.
+    candidates = [c for c in range(1, 10) if grid.candidate_changed_since(c, since)]
+    if not candidates:
+        return False
 
-        for row_comb in combinations(rows_with_candidate, size):
-            cols = {
-                c
-                for r in row_comb
-                for c in range(9)
-                if _has_candidate_at(grid, c, r, candidate)
-            }
-
-            if len(cols) == size:
-                # Found a fish pattern
-                for c in cols:
-                    for r in range(9):
-                        if r not in row_comb and _has_candidate_at(
-                            grid, c, r, candidate
-                        ):
-                            cell = grid[Point(c, r)]
-                            if cell is not None:
-                                cell.candidates -= {candidate}
-                                applied = True
-
-    # Check columns for fish patterns
-    for candidate in range(1, 10):
-        cols_with_candidate = [
-            c
-            for c in range(9)
-            if sum(True for r in range(9) if _has_candidate_at(grid, c, r, candidate))
-            > 0
-        ]
-        if len(cols_with_candidate) < size:
-            continue
+    # Check rows for fish patterns, then columns.
+    # The column bitboards are built after the row fish have removed their candidates.
+    for transpose in (False, True):
+        boards = _bitboards(grid, transpose)
+        for candidate in candidates:
+            board = boards[candidate - 1]
+            bit = candidate_bit(candidate)
+
+            for lines, positions in fish_search(board, size):
+                for line in MASK_CANDIDATES[lines]:
+                    eliminated = board[line - 1] & positions
+                    if not eliminated:
+                        continue
 
-        for col_comb in combinations(cols_with_candidate, size):
-            rows = {
-                r
-                for c in col_comb
-                for r in range(9)
-                if _has_candidate_at(grid, c, r, candidate)
-            }
-
-            if len(rows) == size:
-                # Found a fish pattern
-                for r in rows:
-                    for c in range(9):
-                        if c not in col_comb and _has_candidate_at(
-                            grid, c, r, candidate
-                        ):
-                            cell = grid[Point(c, r)]
-                            if cell is not None:
-                                cell.candidates -= {candidate}
-                                applied = True
+                    # Keep the bitboard in step with the grid for the rest of the search.
+                    board[line - 1] &= ~positions
+                    for position in MASK_CANDIDATES[eliminated]:
+                        point = (
+                            Point(line - 1, position - 1)
+                            if transpose
+                            else Point(position - 1, line - 1)
+                        )
+                        cell = grid[point]
+                        if cell is not None:
+                            cell.mask &= ~bit
+                            applied = True
 
     return applied
+
+
+def apply_fish_rule(grid: Grid, size: int) -> bool:
+    """
+    Apply the fish rule (X-Wing, Swordfish, Jellyfish) to the Sudoku grid.
+
+    Args:
+        grid (Grid): The Sudoku grid to apply the solver to.
+        size (int): The size of the fish pattern (2 for X-Wing, 3 for Swordfish, 4 for Jellyfish).
+
+    Returns:
+        bool: True if the solver could be applied, False otherwise.
+    """
+    return _apply_fish_search(grid, size, ("fish", size), _fish_iter)
+
+
+def apply_finned_fish_rule(grid: Grid, size: int) -> bool:
+    """
+    Apply the finned fish rule (including sashimi fish) to the Sudoku grid.
+
+    Args:
+        grid (Grid): The Sudoku grid to apply the solver to.
+        size (int): The size of the fish pattern (2 for X-Wing, 3 for Swordfish, 4 for Jellyfish).
+
+    Returns:
+        bool: True if the solver could be applied, False otherwise.
+    """
+    return _apply_fish_search(grid, size, ("finned_fish", size), _finned_fish_iter)
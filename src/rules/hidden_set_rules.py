@@ -1,53 +1,94 @@
-from collections import Counter
-from model import Grid
-from itertools import combinations
+from typing import Iterator
 
+from model import Grid, Point
+from model.units import UNITS
 
-ALL_CANDIDATES = set(range(1, 10))
 
-
-def _apply_hidden_set_rule(grid: Grid, size: int) -> bool:
+def _hidden_set_iter(
+    positions: list[int], candidates: list[int], size: int
+) -> Iterator[tuple[int, int]]:
     """
-    Reduce candidates across all cells where a hidden set can be found.
+    Find every hidden set among some candidates of a unit.
+    A hidden set is a set of candidates which can only go in exactly as many cells.
+    Sets are built in ascending order of candidate, abandoning a partial set
+    as soon as the union of its positions holds more than size cells.
 
     Args:
-        grid (Grid): The Sudoku grid to apply the solver to.
-        size (int): The size of the hidden set (2 for pairs, 3 for triples, etc).
+        positions (list[int]): The positions of candidates 1 to 9 in the unit.
+        candidates (list[int]): The candidates to build sets from, less one,
+          each in at least one and at most size cells of the unit.
+        size (int): The size of the hidden set.
 
     Returns:
-        bool: True if the solver could be applied, False otherwise.
+        Iterator[tuple[int, int]]: The mask of the candidates in each hidden set,
+          and the positions of its cells in the unit.
     """
-    applied = False
 
-    for region in grid.region_iter():
-        # Create list of candidates in the region
-        counts = Counter(candidate for cell in region for candidate in cell.candidates)
+    def search(start: int, depth: int, candidate_set: int, cover: int):
+        for i in range(start, len(candidates) - size + depth + 1):
+            candidate = candidates[i]
+            candidate_cover = cover | positions[candidate]
+            if candidate_cover.bit_count() > size:
+                continue
 
-        valid_candidates = {
-            candidate for candidate, count in counts.items() if count <= size
-        }
+            if depth + 1 == size:
+                if candidate_cover.bit_count() == size:
+                    yield candidate_set | (1 << candidate), candidate_cover
+            else:
+                yield from search(
+                    i + 1, depth + 1, candidate_set | (1 << candidate), candidate_cover
+                )
 
-        # Work through all possible combinations of valid candidates
-        for combination in combinations(valid_candidates, size):
-            # Convert the tuple to a set
-            set_candidates = set(combination)
+    yield from search(0, 0, 0, 0)
 
-            # Get a list of all the cells with any candidate
-            affected_cells = [
-                cell for cell in region if set_candidates.intersection(cell.candidates)
-            ]
 
-            # Move on if the number of affected cells doesn't match the set size
-            if len(affected_cells) != size:
-                continue
+def _apply_hidden_set_rule(grid: Grid, size: int) -> bool:
+    """
+    Reduce candidates across all cells where a hidden set can be found.
+    The positions of each candidate in each unit are kept by the grid,
+    so each set is decided by the union of the positions of its candidates.
 
-            # Found a valid hidden set!
-            complementary_candidates = ALL_CANDIDATES - set_candidates
-            for cell in affected_cells:
-                if len(cell.candidates) > size:
-                    applied = True
+    Args:
+        grid (Grid): The Sudoku grid to apply the solver to.
+        size (int): The size of the hidden set (1 for singles, 2 for pairs, etc).
 
-                cell.candidates -= complementary_candidates
+    Returns:
+        bool: True if the solver could be applied, False otherwise.
+    """
+    applied = False
+    masks = grid.masks
+    positions = grid.positions
+
+    # Only units that changed since the last pass can contain new hidden sets.
+    for unit in grid.unit_iter(since=grid.start_pass(("hidden_set", size))):
+        unit_positions = positions[unit * 9 : unit * 9 + 9]
+        # Candidates placed in the unit have no positions left, and cannot be in a set.
+        unplaced = [
+            (candidate, candidate_positions.bit_count())
+            for candidate, candidate_positions in enumerate(unit_positions)
+            if candidate_positions
+        ]
+        # A hidden set needs other candidates to remove from its cells.
+        if len(unplaced) <= size:
+            continue
+
+        candidates = [candidate for candidate, count in unplaced if count <= size]
+        if len(candidates) < size:
+            continue
+
+        hidden_sets = list(_hidden_set_iter(unit_positions, candidates, size))
+
+        # The cells of each hidden set can hold no other candidates.
+        for candidate_set, cover in hidden_sets:
+            while cover:
+                bit = cover & -cover
+                cover ^= bit
+                index = UNITS[unit][bit.bit_length() - 1]
+                if masks[index] & ~candidate_set:
+                    cell = grid[Point(index % 9, index // 9)]
+                    if cell is not None:
+                        cell.mask = masks[index] & candidate_set
+                        applied = True
 
     return applied
 
@@ -89,3 +130,16 @@ def apply_hidden_triples_rule(grid: Grid) -> bool:
         bool: True if the solver could be applied, False otherwise.
     """
     return _apply_hidden_set_rule(grid, size=3)
+
+
+def apply_hidden_quads_rule(grid: Grid) -> bool:
+    """
+    Reduce candidates across all cells where the hidden quads rule applies.
+
+    Args:
+        grid (Grid): The Sudoku grid to apply the solver to.
+
+    Returns:
+        bool: True if the solver could be applied, False otherwise.
+    """
+    return _apply_hidden_set_rule(grid, size=4)
@@ -1,18 +1,7 @@
-from model import Grid, Point
+from functools import reduce
+from operator import or_
 
-
-def _intersection_iter(grid: Grid):
-    for cr in range(9):
-        for b in range(3):
-            intersection = grid.get_column_cells(cr, b)
-            block = grid.get_block_cells(Point(cr // 3, b)).difference(intersection)
-            column = grid.get_column_cells(cr).difference(intersection)
-            yield intersection, block, column
-
-            intersection = grid.get_row_cells(cr, b)
-            block = grid.get_block_cells(Point(b, cr // 3)).difference(intersection)
-            row = grid.get_row_cells(cr).difference(intersection)
-            yield intersection, block, row
+from model import Grid
 
 
 def apply_locked_candidates_rule(grid: Grid) -> bool:
@@ -26,31 +15,26 @@ def apply_locked_candidates_rule(grid: Grid) -> bool:
         bool: True if the solver could be applied, False otherwise.
     """
     applied = False
+    since = grid.start_pass("locked_candidates")
 
-    for intersection, block, colrow in _intersection_iter(grid):
-        intersection_candidates = {
-            candidate for cell in intersection for candidate in cell.candidates
-        }
-        block_candidates = {
-            candidate for cell in block for candidate in cell.candidates
-        }
-        valid_candidates = intersection_candidates.difference(block_candidates)
+    for intersection, block, colrow in grid.intersection_iter(since=since):
+        intersection_mask = reduce(or_, (cell.mask for cell in intersection), 0)
+        block_mask = reduce(or_, (cell.mask for cell in block), 0)
+        valid_mask = intersection_mask & ~block_mask
         for cell in colrow:
             if cell.value is not None:
                 continue
 
-            applied |= len(cell.candidates.intersection(valid_candidates)) > 0
-            cell.candidates = cell.candidates.difference(valid_candidates)
+            applied |= (cell.mask & valid_mask) != 0
+            cell.mask &= ~valid_mask
 
-        colrow_candidates = {
-            candidate for cell in colrow for candidate in cell.candidates
-        }
-        valid_candidates = intersection_candidates.difference(colrow_candidates)
+        colrow_mask = reduce(or_, (cell.mask for cell in colrow), 0)
+        valid_mask = intersection_mask & ~colrow_mask
         for cell in block:
             if cell.value is not None:
                 continue
 
-            applied |= len(cell.candidates.intersection(valid_candidates)) > 0
-            cell.candidates = cell.candidates.difference(valid_candidates)
+            applied |= (cell.mask & valid_mask) != 0
+            cell.mask &= ~valid_mask
 
     return applied
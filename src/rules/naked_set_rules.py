@@ -1,5 +1,56 @@
-from model import Grid
-from itertools import combinations
+from functools import reduce
+from operator import or_
+from typing import Iterator
+
+from model import Grid, Point
+from model.units import UNITS
+
+
+def _naked_set_iter(masks: list[int], size: int) -> Iterator[int]:
+    """
+    Find every naked set in the candidate masks of the unsolved cells of a unit.
+    A naked set is a set of digits which contains the candidates of exactly as many cells.
+    Sets of digits are built in ascending order, keeping only the cells whose candidates
+    could still fit, and abandoning a partial set once too few cells could fit.
+    Only cells with at most size candidates and the digits among them are considered,
+    so the search gets cheaper as the unit fills up.
+
+    Args:
+        masks (list[int]): The candidate masks of the unsolved cells of the unit.
+        size (int): The size of the naked set.
+
+    Returns:
+        Iterator[int]: The mask of the digits of each naked set.
+    """
+    small = [mask for mask in masks if mask.bit_count() <= size]
+    if len(small) < size:
+        return
+
+    digits = reduce(or_, small)
+
+    def search(remaining: int, chosen: int, excluded: int, cells: list[int]):
+        while remaining:
+            bit = remaining & -remaining
+            remaining ^= bit
+            digit_set = chosen | bit
+
+            # Cells with a digit passed over, or too many digits, can no longer fit.
+            fitting = [
+                mask
+                for mask in cells
+                if not mask & excluded and (mask | digit_set).bit_count() <= size
+            ]
+            if len(fitting) >= size:
+                if digit_set.bit_count() == size:
+                    # Every fitting cell is now a subset; more than size is a contradiction.
+                    if len(fitting) == size:
+                        yield digit_set
+                elif remaining:
+                    yield from search(remaining, digit_set, excluded, fitting)
+
+            excluded |= bit
+
+    yield from search(digits, 0, 0, small)
 
 
 def _apply_naked_set_rule(grid: Grid, size: int) -> bool:
@@ -14,29 +65,26 @@ def _apply_naked_set_rule(grid: Grid, size: int) -> bool:
         bool: True if the solver could be applied, False otherwise.
     """
     applied = False
-
-    for region in grid.region_iter():
-        # Find all naked sets in the region
-        incomplete_cells = [cell for cell in region if cell.value is None]
-        naked_sets = [
-            cells
-            for cells in combinations(incomplete_cells, size)
-            if len(set().union(*(cell.candidates for cell in cells))) == size
-        ]
-
-        # Remove candidates from other cells in the region
-        for naked_set in naked_sets:
-            candidates_to_remove = set().union(*(cell.candidates for cell in naked_set))
-            for cell in region:
-                if (
-                    cell in naked_set
-                    or cell.value is not None
-                    or cell.candidates.isdisjoint(candidates_to_remove)
-                ):
-                    continue
-
-                cell.candidates -= candidates_to_remove
-                applied = True
+    masks = grid.masks
+
+    # Only units that changed since the last pass can contain new naked sets.
+    for unit in grid.unit_iter(since=grid.start_pass(("naked_set", size))):
+        unsolved = [index for index in UNITS[unit] if masks[index]]
+        # A naked set needs other cells to remove its digits from.
+        if len(unsolved) <= size:
+            continue
+
+        naked_sets = list(_naked_set_iter([masks[index] for index in unsolved], size))
+
+        # Remove the digits of each set from the cells outside it.
+        for digit_set in naked_sets:
+            for index in unsolved:
+                mask = masks[index]
+                if mask & digit_set and mask & ~digit_set:
+                    cell = grid[Point(index % 9, index // 9)]
+                    if cell is not None:
+                        cell.mask = mask & ~digit_set
+                        applied = True
 
     return applied
 
@@ -65,3 +113,16 @@ def apply_naked_triples_rule(grid: Grid) -> bool:
         bool: True if the solver could be applied, False otherwise.
     """
     return _apply_naked_set_rule(grid, size=3)
+
+
+def apply_naked_quads_rule(grid: Grid) -> bool:
+    """
+    Reduce candidates across all cells where the naked quads rule applies.
+
+    Args:
+        grid (Grid): The Sudoku grid to apply the solver to.
+
+    Returns:
+        bool: True if the solver could be applied, False otherwise.
+    """
+    return _apply_naked_set_rule(grid, size=4)
@@ -1,20 +1,104 @@
-from model import Cell, Grid
+from collections import deque
 
+from model import MASK_CANDIDATES, Cell, Grid, Point, candidate_bit
+from model.units import CELL_UNITS, PEERS, UNITS
 
-def set_cell_value(grid: Grid, cell: Cell, value: int) -> None:
+
+def _check_unit(
+    grid: Grid, unit: int, candidate: int, queue: deque[tuple[int, int]]
+) -> bool:
+    """
+    Queue the hidden single of a candidate in a unit, if there is one.
+
+    Args:
+        grid (Grid): The Sudoku grid containing the unit.
+        unit (int): The index of the unit in model.units.UNITS.
+        candidate (int): The candidate value between 1 and 9.
+        queue (deque): The cells waiting to be placed, as (index, value).
+
+    Returns:
+        bool: False if the candidate has nowhere left to go in the unit, True otherwise.
+    """
+    positions = grid.positions[unit * 9 + candidate - 1]
+    if positions & (positions - 1):
+        return True
+
+    cells = UNITS[unit]
+    if positions:
+        queue.append((cells[positions.bit_length() - 1], candidate))
+        return True
+
+    # The candidate may have no positions because it is already placed in the unit.
+    values = grid.values
+    return any(values[index] == candidate for index in cells)
+
+
+def set_cell_value(grid: Grid, cell: Cell, value: int) -> bool:
     """
     Set the value of a cell in the grid and update its neighbours' candidates.
+    Any neighbour left with a single candidate, and any candidate left with a single
+    position in a unit the placement changed, is placed in turn from a queue,
+    so the naked and hidden singles that follow are solved in the same call.
+    Propagation stops as soon as a contradiction is found.
 
     Args:
         grid (Grid): The Sudoku grid containing the cell.
         cell (Cell): The cell to be updated with a value.
         value (int): The value to set for the cell.
+
+    Returns:
+        bool: False if a cell was left with no candidates, a candidate with nowhere
+          to go in a unit, or two singles needed the same cell, True otherwise.
     """
-    cell.value = value
+    if cell.value is not None:
+        raise ValueError("Cannot set value of a cell that already has a value.")
+
+    values = grid.values
+    masks = grid.masks
+    queue: deque[tuple[int, int]] = deque([(cell.index, value)])
+
+    while queue:
+        index, value = queue.popleft()
+        if values[index] is not None:
+            if values[index] != value:
+                return False
+            continue
+
+        placed = grid[Point(index % 9, index // 9)]
+        if placed is None:
+            continue
+
+        value_mask = candidate_bit(value)
+        old_mask = masks[index]
+        placed.value = value
+
+        changed_units: set[int] = set()
+        for peer in PEERS[index]:
+            mask = masks[peer]
+            if values[peer] is not None or not mask & value_mask:
+                continue
+
+            neighbour = grid[Point(peer % 9, peer // 9)]
+            if neighbour is None:
+                continue
+
+            mask &= ~value_mask
+            neighbour.mask = mask
+            if not mask:
+                return False
+            if not mask & (mask - 1):
+                queue.append((peer, mask.bit_length()))
+            changed_units.update(CELL_UNITS[peer])
 
-    incomplete_neighbours = (
-        neighbour for neighbour in grid.get_neighbours(cell) if neighbour.value is None
-    )
+        # The cell's other candidates have left its position in its own units,
+        # and the value has left the positions of its neighbours' units.
+        own_units = CELL_UNITS[index]
+        for candidate in MASK_CANDIDATES[old_mask & ~value_mask]:
+            for unit in own_units:
+                if not _check_unit(grid, unit, candidate, queue):
+                    return False
+        for unit in changed_units.difference(own_units):
+            if not _check_unit(grid, unit, value, queue):
+                return False
 
-    for neighbour in incomplete_neighbours:
-        neighbour.candidates = neighbour.candidates.difference({cell.value})
+    return True
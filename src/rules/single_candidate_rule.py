@@ -1,4 +1,4 @@
-from model import Grid
+from model import MASK_CANDIDATES, Grid
 from rules.set_cell_value import set_cell_value
 
 
@@ -13,13 +13,17 @@ def apply_single_candidate_rule(grid: Grid) -> bool:
         bool: True if the solver could be applied, False otherwise.
     """
     applied = False
+    since = grid.start_pass("single_candidate")
 
     for cell in grid:
-        if cell.value is not None:
+        if cell.value is not None or not grid.cell_changed_since(cell, since):
             continue
 
-        if len(cell.candidates) == 1:
-            set_cell_value(grid, cell, cell.candidates.pop())
+        if cell.mask.bit_count() == 1:
             applied = True
+            # The neighbours of the last value placed may not have been updated,
+            # so placing any more values could conflict with it.
+            if not set_cell_value(grid, cell, MASK_CANDIDATES[cell.mask][0]):
+                return applied
 
     return applied
@@ -12,28 +12,29 @@ def apply_xy_wing_rule(grid: Grid) -> bool:
         bool: True if the solver could be applied, False otherwise.
     """
     applied = False
+    if not grid.changed_since(grid.start_pass("xy_wing")):
+        return False
 
     # Find an XY-Wing pattern.
-    for pivot in [cell for cell in grid if len(cell.candidates) == 2]:
-        xy = pivot.candidates
+    for pivot in [cell for cell in grid if cell.mask.bit_count() == 2]:
+        xy = pivot.mask
 
         # Wings must have 2 candidates and share only one with the pivot.
         wings = [
             wing
             for wing in grid.get_neighbours(pivot)
-            if len(wing.candidates) == 2 and len(xy.difference(wing.candidates)) == 1
+            if wing.mask.bit_count() == 2 and (xy & ~wing.mask).bit_count() == 1
         ]
 
         for wing1, wing2 in combinations(wings, 2):
             # Reject the wings if they don't share a symmetric difference with the pivot.
-            if wing1.candidates.symmetric_difference(wing2.candidates) != xy:
+            if wing1.mask ^ wing2.mask != xy:
                 continue
 
             # Find a z-value common to both wings.
-            z_set = wing1.candidates.intersection(wing2.candidates)
-            if len(z_set) != 1:
+            z = wing1.mask & wing2.mask
+            if z.bit_count() != 1:
                 continue
-            z = z_set.pop()
 
             # Eliminate z from cells that see both wings of the XY-Wing.
             wing1_neighbours = grid.get_neighbours(wing1)
@@ -41,11 +42,9 @@ def apply_xy_wing_rule(grid: Grid) -> bool:
             common_neighbours = wing1_neighbours.intersection(wing2_neighbours)
 
             for cell in [
-                cell
-                for cell in common_neighbours
-                if z in cell.candidates and cell != pivot
+                cell for cell in common_neighbours if cell.mask & z and cell != pivot
             ]:
-                cell.candidates -= {z}
+                cell.mask &= ~z
                 applied = True
 
     return applied
@@ -61,24 +60,25 @@ def apply_xyz_wing_rule(grid: Grid) -> bool:
         bool: True if the solver could be applied, False otherwise.
     """
     applied = False
+    if not grid.changed_since(grid.start_pass("xyz_wing")):
+        return False
 
     # Find an XYZ-Wing pattern.
-    for pivot in [cell for cell in grid if len(cell.candidates) == 3]:
-        xyz = pivot.candidates
+    for pivot in [cell for cell in grid if cell.mask.bit_count() == 3]:
+        xyz = pivot.mask
 
         # Wings must have 2 candidates that are a subset of the pivot's candidates.
         wings = [
             wing
             for wing in grid.get_neighbours(pivot)
-            if len(wing.candidates) == 2 and wing.candidates.issubset(xyz)
+            if wing.mask.bit_count() == 2 and not wing.mask & ~xyz
         ]
 
         for wing1, wing2 in combinations(wings, 2):
             # Find the z-value common to both wings.
-            z_set = wing1.candidates.intersection(wing2.candidates)
-            if len(z_set) != 1:
+            z = wing1.mask & wing2.mask
+            if z.bit_count() != 1:
                 continue
-            z = z_set.pop()
 
             # Eliminate z from cells that see all three of the XYZ-Wing cells.
             pivot_neighbours = grid.get_neighbours(pivot)
@@ -88,8 +88,8 @@ def apply_xyz_wing_rule(grid: Grid) -> bool:
                 wing1_neighbours
             ).intersection(wing2_neighbours)
 
-            for cell in [cell for cell in common_neighbours if z in cell.candidates]:
-                cell.candidates -= {z}
+            for cell in [cell for cell in common_neighbours if cell.mask & z]:
+                cell.mask &= ~z
                 applied = True
 
     return applied
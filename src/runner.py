@@ -1,7 +1,55 @@
 import argparse
-from solver import Solver
-from utils import render_grid
-from model import Grid
+import importlib.util
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import partial
+from typing import Iterable, Iterator, TextIO
+
+from caching import ResultStore
+from caching.result_store import DEFAULT_MAX_ENTRIES
+from pipeline import EXHAUSTED, INVALID, SOLVED, UNSOLVED, final_status
+from profiling import RuleProfiler
+from solver import Budget, Solver
+from utils import MASKS, GridFile, is_grid_file, render_grid, write_lines
+from model import Grid, GridSnapshot
+from rules.set_cell_value import set_cell_value
+
+DEFAULT_CHUNK_SIZE = 256
+
+# A puzzle in line notation, or the values and candidates of a grid from a masks file.
+Puzzle = str | GridSnapshot
+
+RESULT_MESSAGES = {
+    SOLVED: "The puzzle was solved!",
+    UNSOLVED: (
+        "The puzzle could not be solved. Either it's unsolvable or it requires "
+        "more advanced techniques than are implemented in this solver."
+    ),
+    INVALID: (
+        "The puzzle is invalid. Either the input grid contains illegal starting "
+        "values or they leave the puzzle with no solution."
+    ),
+    EXHAUSTED: (
+        "The solver ran out of time or rule applications before it could finish. "
+        "The grid shows how far it got."
+    ),
+}
+
+
+@dataclass(frozen=True)
+class BatchSummary:
+    total: int
+    solved: int
+    seconds: float
+
+    @property
+    def puzzles_per_second(self) -> float:
+        return self.total / self.seconds if self.seconds > 0 else 0.0
 
 
 def run():
@@ -9,42 +57,663 @@ def run():
         description="A Sudoku solver which applies solving rules just as a human would."
     )
     parser.add_argument("input", help="The sudoku puzzle to solve.")
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Solve a file of puzzles with one 81 character puzzle per line, without rendering.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="In batch mode, the file to write results to. Defaults to standard output.",
+    )
+    parser.add_argument(
+        "--fallback",
+        action="store_true",
+        help="Finish puzzles the rules cannot solve by backtracking search.",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="In batch mode, the number of processes to solve with. Use 0 for one per CPU core.",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="In batch mode, the number of puzzles sent to a worker process at a time.",
+    )
+    parser.add_argument(
+        "--vectorized",
+        action="store_true",
+        help="In batch mode, apply the simplest rules to each chunk of puzzles at once with NumPy.",
+    )
+    parser.add_argument(
+        "--convert",
+        metavar="PATH",
+        help="In batch mode, write the puzzles to a binary grid file instead of solving them.",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        help="Write a JSON report of the calls, hits, time and eliminations of each rule.",
+    )
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        metavar="SECONDS",
+        help="The most time to spend on each puzzle, reporting it as exhausted if reached.",
+    )
+    parser.add_argument(
+        "--max-applications",
+        type=int,
+        metavar="COUNT",
+        help="The most rule applications to make on each puzzle, reporting it as exhausted if reached.",
+    )
+    parser.add_argument(
+        "--store",
+        metavar="PATH",
+        help="An SQLite database of results to reuse, and to add new results to.",
+    )
+    parser.add_argument(
+        "--store-size",
+        type=int,
+        default=DEFAULT_MAX_ENTRIES,
+        help="The most results to keep in the store, evicting the oldest first.",
+    )
 
     args = parser.parse_args()
 
-    with open(args.input, "r") as f:
-        input_lines = f.readlines()
-        grid = Grid.from_rows_notation(input_lines)
+    if args.vectorized and importlib.util.find_spec("numpy") is None:
+        parser.error(
+            "--vectorized requires NumPy, installed with the vectorized extra."
+        )
+    if args.convert and not args.batch:
+        parser.error("--convert requires --batch.")
+    if args.convert and is_grid_file(args.input):
+        with GridFile(args.input) as grids:
+            if grids.kind == MASKS:
+                parser.error(
+                    "--convert cannot convert a masks file without losing its candidates."
+                )
+
+    profiler = RuleProfiler() if args.profile else None
+    store = ResultStore(args.store, args.store_size) if args.store else None
+    budget = None
+    if args.time_limit is not None or args.max_applications is not None:
+        budget = Budget(seconds=args.time_limit, applications=args.max_applications)
+
+    if args.batch and args.convert:
+        try:
+            with _open_puzzles(args.input) as puzzles:
+                count = write_lines(args.convert, _convertible_lines(puzzles))
+        except ValueError as error:
+            parser.error(f"--convert failed: {error}")
+        print(f"Wrote {count} puzzles to {args.convert}.", file=sys.stderr)
+    elif args.batch:
+        workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+        run_batch(
+            args.input,
+            args.output,
+            workers,
+            args.chunk_size,
+            args.fallback,
+            profiler,
+            args.vectorized,
+            store,
+            budget,
+        )
+    else:
+        with open(args.input, "r") as f:
+            input_lines = f.readlines()
+            grid = Grid.from_rows_notation(input_lines)
+
+        render_grid(grid).show()
+        print(apply_solver(grid, args.fallback, profiler, store, budget))
+        render_grid(grid).show()
+
+    if store is not None:
+        store.close()
+
+    if profiler is not None:
+        with open(args.profile, "w") as f:
+            profiler.write_json(f)
+
 
-    render_grid(grid).show()
-    print(apply_solver(grid))
-    render_grid(grid).show()
+def run_batch(
+    input_path: str,
+    output_path: str | None = None,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    fallback: bool = False,
+    profiler: RuleProfiler | None = None,
+    vectorized: bool = False,
+    store: ResultStore | None = None,
+    budget: Budget | None = None,
+):
+    """Solve every puzzle in a file, writing one result line per puzzle and a summary.
+
+    Args:
+        input_path (str): The file of puzzles, either one per line in line notation
+          or a binary grid file.
+        output_path (str | None): The file to write results to, or None for standard output.
+        workers (int): The number of processes to solve with.
+        chunk_size (int): The number of puzzles sent to a worker process at a time.
+        fallback (bool): Whether to finish puzzles by backtracking search.
+        profiler (RuleProfiler | None): Totals the rule attempts of every puzzle, if given.
+        vectorized (bool): Whether to apply the simplest rules to each chunk at once with NumPy.
+        store (ResultStore | None): Results to reuse and add to, if given.
+        budget (Budget | None): Limits on the time and rule applications of each solve, if given.
+    """
+    with _open_puzzles(input_path) as puzzles:
+        if output_path is None:
+            summary = apply_batch_solver(
+                puzzles,
+                sys.stdout,
+                workers,
+                chunk_size,
+                fallback,
+                profiler,
+                vectorized,
+                store,
+                budget,
+            )
+        else:
+            with open(output_path, "w") as output_file:
+                summary = apply_batch_solver(
+                    puzzles,
+                    output_file,
+                    workers,
+                    chunk_size,
+                    fallback,
+                    profiler,
+                    vectorized,
+                    store,
+                    budget,
+                )
+
+    print(
+        f"Solved {summary.solved} of {summary.total} puzzles in {summary.seconds:.2f}s "
+        f"({summary.puzzles_per_second:.1f} puzzles per second).",
+        file=sys.stderr,
+    )
 
 
-def apply_solver(grid: Grid) -> str:
+@contextmanager
+def _open_puzzles(input_path: str) -> Iterator[Iterable[Puzzle]]:
+    """Open a file of puzzles for reading lazily.
+    Binary grid files are read through a memory map, and other files as text.
+    Puzzles are given in line notation, except for binary files of masks records,
+    which are given as snapshots so that the candidates of each grid are kept.
+
+    Args:
+        input_path (str): The file of puzzles.
+
+    Returns:
+        Iterator[Iterable[Puzzle]]: A context manager giving the puzzles.
+    """
+    if is_grid_file(input_path):
+        with GridFile(input_path) as grids:
+            yield grids.snapshots() if grids.kind == MASKS else grids.lines()
+    else:
+        with open(input_path, "r") as input_file:
+            yield input_file
+
+
+def apply_solver(
+    grid: Grid,
+    fallback: bool = False,
+    profiler: RuleProfiler | None = None,
+    store: ResultStore | None = None,
+    budget: Budget | None = None,
+) -> str:
     """Apply a Solver to the puzzle defined in the input.
 
     Args:
         grid (Grid): The Sudoku grid to be solved.
+        fallback (bool): Whether to finish the puzzle by backtracking search.
+        profiler (RuleProfiler | None): Records the rule attempts of the solve, if given.
+        store (ResultStore | None): Checked for a stored result before solving,
+          and given the result after solving, if given.
+        budget (Budget | None): Limits on the time and rule applications of each solve, if given.
 
     Returns:
         str: A description of the result of the solving process.
     """
-    solver = Solver(grid)
+    if store is not None:
+        stored = store.get(grid.to_line_notation(), fallback)
+        if stored is not None:
+            _restore_grid(grid, stored.grid)
+            return RESULT_MESSAGES[stored.status]
 
-    if not solver.is_valid():
-        return "The input grid contains illegal starting values."
+    return RESULT_MESSAGES[
+        _solve_status(grid, fallback, profiler, store, budget=budget)
+    ]
+
+
+def _restore_grid(grid: Grid, line: str):
+    """Set the values of the empty cells of a grid from a stored final state in line notation.
+
+    Args:
+        grid (Grid): The Sudoku grid to update.
+        line (str): The final state of the grid, with '.' for empty cells.
+    """
+    for cell in grid:
+        if cell.value is None and line[cell.index] != ".":
+            set_cell_value(grid, cell, int(line[cell.index]))
+
+
+def _solve_status(
+    grid: Grid,
+    fallback: bool = False,
+    profiler: RuleProfiler | None = None,
+    store: ResultStore | None = None,
+    puzzle: str | None = None,
+    budget: Budget | None = None,
+) -> str:
+    """Solve a grid, storing the result if there is a store.
+    Results cut short by the budget are not stored, as they depend on the budget and the machine.
 
-    solver.solve()
+    Args:
+        grid (Grid): The Sudoku grid to be solved.
+        fallback (bool): Whether to finish the puzzle by backtracking search.
+        profiler (RuleProfiler | None): Records the rule attempts of the solve, if given.
+        store (ResultStore | None): Given the result of the solve, if given.
+        puzzle (str | None): The puzzle to store the result under. Defaults to the grid before solving.
+        budget (Budget | None): Limits on the time and rule applications of each solve, if given.
 
-    if solver.is_solved():
-        return "The puzzle was solved!"
+    Returns:
+        str: One of "solved", "unsolved", "invalid" or "exhausted".
+    """
+    if store is not None and puzzle is None:
+        puzzle = grid.to_line_notation()
+
+    solver = Solver(grid, fallback, profiler, budget=budget)
+    if not solver.is_valid():
+        status = INVALID
     else:
-        return (
-            "The puzzle could not be solved. Either it's unsolvable or it requires "
-            "more advanced techniques than are implemented in this solver."
+        solver.solve()
+        status = final_status(solver)
+
+    if store is not None and puzzle is not None and status != EXHAUSTED:
+        store.put(
+            puzzle,
+            fallback,
+            grid.to_line_notation(),
+            status,
+            dict(solver.rule_applications),
         )
 
+    return status
+
+
+def solve_line(
+    line: Puzzle,
+    fallback: bool = False,
+    profiler: RuleProfiler | None = None,
+    store: ResultStore | None = None,
+    budget: Budget | None = None,
+) -> str:
+    """Solve a puzzle given in line notation.
+    A snapshot from a masks file is solved from its candidates, and its result is never
+    stored, as the store only tells puzzles apart by their values.
+
+    Args:
+        line (Puzzle): The puzzle as a string of 81 characters, or a snapshot of a grid.
+        fallback (bool): Whether to finish the puzzle by backtracking search.
+        profiler (RuleProfiler | None): Records the rule attempts of the solve, if given.
+        store (ResultStore | None): Checked for a stored result before solving,
+          and given the result after solving, if given.
+        budget (Budget | None): Limits on the time and rule applications of each solve, if given.
+
+    Returns:
+        str: The final state of the grid in line notation, followed by one of
+          "solved", "unsolved", "invalid" or "exhausted".
+    """
+    if isinstance(line, GridSnapshot):
+        return _solve_grid(Grid.from_snapshot(line), fallback, profiler, budget=budget)
+
+    if store is not None:
+        stored = store.get(line, fallback)
+        if stored is not None:
+            return f"{stored.grid} {stored.status}"
+
+    try:
+        grid = Grid.from_line_notation(line)
+    except ValueError:
+        return f"{line.strip()} {INVALID}"
+
+    return _solve_grid(grid, fallback, profiler, store, line, budget)
+
+
+def _solve_grid(
+    grid: Grid,
+    fallback: bool = False,
+    profiler: RuleProfiler | None = None,
+    store: ResultStore | None = None,
+    puzzle: str | None = None,
+    budget: Budget | None = None,
+) -> str:
+    """Solve a grid, describing the result in the same way as solve_line.
+
+    Args:
+        grid (Grid): The Sudoku grid to be solved.
+        fallback (bool): Whether to finish the puzzle by backtracking search.
+        profiler (RuleProfiler | None): Records the rule attempts of the solve, if given.
+        store (ResultStore | None): Given the result of the solve, if given.
+        puzzle (str | None): The puzzle to store the result under. Defaults to the grid before solving.
+        budget (Budget | None): Limits on the time and rule applications of each solve, if given.
+
+    Returns:
+        str: The final state of the grid in line notation, followed by its status.
+    """
+    status = _solve_status(grid, fallback, profiler, store, puzzle, budget)
+    return f"{grid.to_line_notation()} {status}"
+
+
+def _solve_vectorized(
+    lines: list[Puzzle],
+    fallback: bool = False,
+    profiler: RuleProfiler | None = None,
+    store: ResultStore | None = None,
+    budget: Budget | None = None,
+) -> list[str]:
+    """Solve a chunk of puzzles together, applying the simplest rules to all of them at once.
+    Puzzles which stall are handed to a Solver, starting from the candidates already removed.
+    Puzzles which cannot be parsed or reach a contradiction are solved from scratch with
+    solve_line, so that they are reported in the same way, as are snapshots from masks files.
+    Only the rules applied by the Solver are recorded by the profiler and the store.
+
+    Args:
+        lines (list[Puzzle]): The puzzles in line notation or as snapshots.
+        fallback (bool): Whether to finish puzzles by backtracking search.
+        profiler (RuleProfiler | None): Records the rule attempts of each Solver, if given.
+        store (ResultStore | None): Checked for stored results before solving,
+          and given the results of the puzzles solved, if given.
+        budget (Budget | None): Limits on the time and rule applications of each solve, if given.
+
+    Returns:
+        list[str]: The result for each puzzle, in the same order.
+    """
+    from vectorized import (
+        contradictions,
+        masks_from_lines,
+        propagate,
+        solved,
+        to_grid,
+        to_line_notation,
+    )
+
+    results: list[str] = []
+    parsed: list[tuple[int, str]] = []
+    for i, line in enumerate(lines):
+        if isinstance(line, GridSnapshot):
+            results.append(solve_line(line, fallback, profiler, store, budget))
+            continue
+
+        results.append(f"{line.strip()} {INVALID}")
+        stored = store.get(line, fallback) if store is not None else None
+        if stored is not None:
+            results[i] = f"{stored.grid} {stored.status}"
+        elif len(line.strip()) == 81:
+            parsed.append((i, line))
+
+    if not parsed:
+        return results
+
+    masks = masks_from_lines([line for _, line in parsed])
+    propagate(masks)
+
+    for (i, line), puzzle_masks, contradiction, complete in zip(
+        parsed, masks, contradictions(masks), solved(masks)
+    ):
+        if contradiction:
+            results[i] = _solve_grid(
+                Grid.from_line_notation(line),
+                fallback,
+                profiler,
+                store,
+                line,
+                budget,
+            )
+        elif complete:
+            solution = to_line_notation(puzzle_masks)
+            results[i] = f"{solution} {SOLVED}"
+            if store is not None:
+                store.put(line, fallback, solution, SOLVED, {})
+        else:
+            results[i] = _solve_grid(
+                to_grid(puzzle_masks), fallback, profiler, store, line, budget
+            )
+
+    return results
+
+
+def _solve_chunk(
+    lines: list[Puzzle],
+    fallback: bool = False,
+    profile: bool = False,
+    vectorized: bool = False,
+    store: ResultStore | None = None,
+    budget: Budget | None = None,
+) -> tuple[list[str], RuleProfiler | None]:
+    """Solve a chunk of puzzles in a worker process.
+    Puzzles cross the process boundary as line notation strings or snapshots,
+    and results as line notation strings.
+
+    Args:
+        lines (list[Puzzle]): The puzzles in line notation or as snapshots.
+        fallback (bool): Whether to finish puzzles by backtracking search.
+        profile (bool): Whether to record the rule attempts of the chunk.
+        vectorized (bool): Whether to apply the simplest rules to the chunk at once with NumPy.
+        store (ResultStore | None): Results to reuse and add to, if given.
+          The store is reopened in the worker process and closed after the chunk.
+        budget (Budget | None): Limits on the time and rule applications of each solve, if given.
+
+    Returns:
+        tuple: The result of solve_line for each puzzle, in the same order,
+          and the profiler of the chunk if profiling.
+    """
+    profiler = RuleProfiler() if profile else None
+    try:
+        if vectorized:
+            return _solve_vectorized(lines, fallback, profiler, store, budget), profiler
+
+        return [
+            solve_line(line, fallback, profiler, store, budget) for line in lines
+        ], profiler
+    finally:
+        if store is not None:
+            store.close()
+
+
+def _chunk_iter(lines: Iterable[Puzzle], chunk_size: int) -> Iterator[list[Puzzle]]:
+    """Group a stream of lines into lists of up to chunk_size lines.
+
+    Args:
+        lines (Iterable[Puzzle]): The puzzles to group.
+        chunk_size (int): The maximum number of lines in each chunk.
+
+    Returns:
+        Iterator[list[Puzzle]]: An iterator over the chunks, in order.
+    """
+    chunk: list[Puzzle] = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def _solve_lines(
+    lines: Iterable[Puzzle],
+    workers: int,
+    chunk_size: int,
+    fallback: bool,
+    profiler: RuleProfiler | None = None,
+    vectorized: bool = False,
+    store: ResultStore | None = None,
+    budget: Budget | None = None,
+) -> Iterator[str]:
+    """Solve a stream of puzzles, in parallel if more than one worker is requested.
+    Only a few chunks per worker are in flight at once, so input is read lazily
+    and memory use does not grow with the number of puzzles.
+
+    Args:
+        lines (Iterable[Puzzle]): The puzzles in line notation or as snapshots.
+        workers (int): The number of processes to solve with.
+        chunk_size (int): The number of puzzles sent to a worker process at a time.
+        fallback (bool): Whether to finish puzzles by backtracking search.
+        profiler (RuleProfiler | None): Totals the rule attempts of every puzzle, if given.
+          Worker processes profile each chunk separately and the totals are merged.
+        vectorized (bool): Whether to apply the simplest rules to each chunk at once with NumPy.
+        store (ResultStore | None): Results to reuse and add to, if given.
+          Worker processes each open their own connection to it.
+        budget (Budget | None): Limits on the time and rule applications of each solve, if given.
+
+    Returns:
+        Iterator[str]: The result of solve_line for each puzzle, in input order.
+    """
+    if workers <= 1:
+        if vectorized:
+            for chunk in _chunk_iter(lines, chunk_size):
+                yield from _solve_vectorized(chunk, fallback, profiler, store, budget)
+        else:
+            yield from map(
+                partial(
+                    solve_line,
+                    fallback=fallback,
+                    profiler=profiler,
+                    store=store,
+                    budget=budget,
+                ),
+                lines,
+            )
+        return
+
+    def chunk_results(future: Future[tuple[list[str], RuleProfiler | None]]):
+        results, chunk_profiler = future.result()
+        if profiler is not None and chunk_profiler is not None:
+            profiler.merge(chunk_profiler)
+
+        return results
+
+    profile = profiler is not None
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: deque[Future[tuple[list[str], RuleProfiler | None]]] = deque()
+        for chunk in _chunk_iter(lines, chunk_size):
+            pending.append(
+                executor.submit(
+                    _solve_chunk, chunk, fallback, profile, vectorized, store, budget
+                )
+            )
+            if len(pending) >= workers * 2:
+                yield from chunk_results(pending.popleft())
+
+        while pending:
+            yield from chunk_results(pending.popleft())
+
+
+def _puzzle_lines(lines: Iterable[Puzzle]) -> Iterator[Puzzle]:
+    """Skip the blank lines and lines starting with # in a stream of puzzles.
+
+    Args:
+        lines (Iterable[Puzzle]): The lines to filter. Snapshots are always kept.
+
+    Returns:
+        Iterator[Puzzle]: The puzzles, in order.
+    """
+    return (
+        line
+        for line in lines
+        if isinstance(line, GridSnapshot) or (line.strip() and not line.startswith("#"))
+    )
+
+
+def _convertible_lines(lines: Iterable[Puzzle]) -> Iterator[str]:
+    """
+    Skip the blank lines and lines starting with # in a stream of puzzles to convert,
+    checking that every other line holds a puzzle of 81 characters.
+
+    Args:
+        lines (Iterable[Puzzle]): The lines to filter. Masks files cannot be converted.
+
+    Returns:
+        Iterator[str]: The puzzles in line notation, in order.
+
+    Raises:
+        ValueError: If a line is not a puzzle, naming the line by its number.
+        TypeError: If given the snapshots of a masks file.
+    """
+    for number, line in enumerate(lines, 1):
+        if isinstance(line, GridSnapshot):
+            raise TypeError(
+                "A masks file cannot be converted without losing its candidates."
+            )
+        if not line.strip() or line.startswith("#"):
+            continue
+        if len(line.strip()) != 81:
+            raise ValueError(f"Line {number} is not a puzzle of 81 characters.")
+
+        yield line
+
+
+def apply_batch_solver(
+    lines: Iterable[Puzzle],
+    output: TextIO,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    fallback: bool = False,
+    profiler: RuleProfiler | None = None,
+    vectorized: bool = False,
+    store: ResultStore | None = None,
+    budget: Budget | None = None,
+) -> BatchSummary:
+    """Solve a stream of puzzles in line notation, writing a result line for each.
+    Blank lines and lines starting with # are skipped.
+
+    Args:
+        lines (Iterable[Puzzle]): The puzzles, one per line or as snapshots. Read lazily.
+        output (TextIO): Where to write each result line, as produced by solve_line.
+        workers (int): The number of processes to solve with. Defaults to 1, solving in this process.
+        chunk_size (int): The number of puzzles sent to a worker process at a time.
+        fallback (bool): Whether to finish puzzles by backtracking search.
+        profiler (RuleProfiler | None): Totals the rule attempts of every puzzle, if given.
+        vectorized (bool): Whether to apply the simplest rules to each chunk at once with NumPy.
+          Requires NumPy.
+        store (ResultStore | None): Results to reuse instead of solving again,
+          which are added to as puzzles are solved, if given.
+        budget (Budget | None): Limits on the time and rule applications of each solve, if given.
+
+    Returns:
+        BatchSummary: The number of puzzles read and solved, and the time taken.
+    """
+    if workers < 1:
+        raise ValueError("Workers must be at least 1.")
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1.")
+
+    total = 0
+    solved = 0
+    start = time.perf_counter()
+
+    puzzles = _puzzle_lines(lines)
+    for result in _solve_lines(
+        puzzles, workers, chunk_size, fallback, profiler, vectorized, store, budget
+    ):
+        output.write(result + "\n")
+
+        total += 1
+        if result.endswith(f" {SOLVED}"):
+            solved += 1
+
+    return BatchSummary(total=total, solved=solved, seconds=time.perf_counter() - start)
+
 
 if __name__ == "__main__":
     run()
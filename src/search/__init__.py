@@ -0,0 +1,3 @@
+from .backtracking import count_solutions, find_solution
+
+__all__ = ["count_solutions", "find_solution"]
@@ -0,0 +1,252 @@
+import time
+
+from model import ALL_CANDIDATES_MASK, Grid, candidate_bit
+from model.units import PEERS, UNITS
+
+# The number of search nodes between checks of the deadline, so that reading
+# the clock costs little compared to the search itself.
+DEADLINE_CHECK_NODES = 16
+
+
+class _SearchState:
+    """
+    The working state of a backtracking search over candidate masks.
+    Placing a digit removes it from the candidates of every unsolved peer,
+    and the removals are recorded so they can be undone when backtracking.
+    """
+
+    def __init__(
+        self, values: list[int | None], masks: list[int], deadline: float | None = None
+    ):
+        """
+        Start a search from the values and candidate masks of a grid.
+        Candidates which conflict with a value in a peer cell are ignored,
+        so the search is correct even if the masks have not been fully reduced.
+        Values which conflict with each other are flagged, as no solution can exist.
+
+        Args:
+            values (list): The 81 cell values of the grid.
+            masks (list): The 81 candidate masks of the grid.
+            deadline (float | None): The time.perf_counter value at which to give up searching,
+              setting timed_out. Unlimited when None.
+        """
+        self.digits = [value or 0 for value in values]
+        self.masks = [0] * 81
+        self.unsolved: list[int] = []
+        self.conflicting = False
+        self.deadline = deadline
+        self.nodes = 0
+        self.timed_out = False
+
+        for index in range(81):
+            if self.digits[index]:
+                if any(
+                    self.digits[peer] == self.digits[index] for peer in PEERS[index]
+                ):
+                    self.conflicting = True
+                continue
+
+            mask = masks[index]
+            for peer in PEERS[index]:
+                if self.digits[peer]:
+                    mask &= ~candidate_bit(self.digits[peer])
+
+            self.masks[index] = mask
+            self.unsolved.append(index)
+
+    def place(self, index: int, bit: int) -> list[int] | None:
+        """
+        Place a digit in a cell and remove it from the candidates of unsolved peers.
+
+        Args:
+            index (int): The index of the cell.
+            bit (int): The mask bit of the digit to place.
+
+        Returns:
+            list[int] | None: The peers the digit was removed from,
+              or None if a peer was left without candidates, in which case nothing is changed.
+        """
+        masks = self.masks
+        digits = self.digits
+        removed = []
+
+        for peer in PEERS[index]:
+            if digits[peer] == 0 and masks[peer] & bit:
+                masks[peer] ^= bit
+                removed.append(peer)
+                if masks[peer] == 0:
+                    for undo in removed:
+                        masks[undo] |= bit
+                    return None
+
+        digits[index] = bit.bit_length()
+        return removed
+
+    def remove(self, index: int, bit: int, removed: list[int]):
+        """
+        Undo a placement made by place.
+
+        Args:
+            index (int): The index of the cell.
+            bit (int): The mask bit of the digit which was placed.
+            removed (list[int]): The peers returned by place.
+        """
+        masks = self.masks
+        for peer in removed:
+            masks[peer] |= bit
+
+        self.digits[index] = 0
+
+    def _hidden_single(self) -> tuple[int, int] | None:
+        """
+        Find a digit which can only go in one cell of a unit.
+
+        Returns:
+            tuple[int, int] | None: The index of the cell and the mask bit of the digit,
+              (-1, 0) if a digit has nowhere left to go in a unit, or None if there are neither.
+        """
+        digits = self.digits
+        masks = self.masks
+
+        for unit in UNITS:
+            once = twice = placed = 0
+            for index in unit:
+                if digits[index]:
+                    placed |= 1 << (digits[index] - 1)
+                else:
+                    twice |= once & masks[index]
+                    once |= masks[index]
+
+            if once | placed != ALL_CANDIDATES_MASK:
+                return -1, 0
+
+            single = once & ~twice
+            if single:
+                bit = single & -single
+                for index in unit:
+                    if not digits[index] and masks[index] & bit:
+                        return index, bit
+
+        return None
+
+    def search(self, limit: int, solutions: list[list[int]]) -> int:
+        """
+        Search for solutions, always branching on the unsolved cell with fewest candidates.
+        Before branching on a cell with several candidates, a digit with only one place
+        left in a unit is placed instead, as that needs no branching at all.
+
+        Args:
+            limit (int): Stop once this many solutions have been found.
+            solutions (list): The first solution found is appended to this list.
+
+        Returns:
+            int: The number of solutions found, up to the limit,
+              or before the deadline passed if timed_out is set.
+        """
+        if self.deadline is not None:
+            self.nodes += 1
+            if (
+                self.nodes % DEADLINE_CHECK_NODES == 0
+                and time.perf_counter() >= self.deadline
+            ):
+                self.timed_out = True
+        if self.timed_out:
+            return 0
+
+        unsolved = self.unsolved
+        if not unsolved:
+            if not solutions:
+                solutions.append(self.digits.copy())
+            return 1
+
+        # Pick the cell with the minimum remaining values.
+        masks = self.masks
+        best = 0
+        best_count = 10
+        for position, index in enumerate(unsolved):
+            count = masks[index].bit_count()
+            if count < best_count:
+                best, best_count = position, count
+                if count <= 1:
+                    break
+
+        if best_count == 0:
+            return 0
+
+        index = unsolved[best]
+        mask = masks[index]
+        if best_count > 1:
+            hidden_single = self._hidden_single()
+            if hidden_single is not None:
+                index, mask = hidden_single
+                if index < 0:
+                    return 0
+                best = unsolved.index(index)
+
+        unsolved[best] = unsolved[-1]
+        unsolved.pop()
+
+        found = 0
+        while mask and found < limit and not self.timed_out:
+            bit = mask & -mask
+            mask ^= bit
+
+            removed = self.place(index, bit)
+            if removed is None:
+                continue
+
+            found += self.search(limit - found, solutions)
+            self.remove(index, bit, removed)
+
+        unsolved.append(index)
+        unsolved[best], unsolved[-1] = unsolved[-1], unsolved[best]
+
+        return found
+
+
+def find_solution(grid: Grid, deadline: float | None = None) -> list[int] | None:
+    """
+    Find a solution to the grid by backtracking search.
+    The search starts from the grid's current candidates, so any candidates already
+    eliminated by rules reduce the number of branches to explore.
+
+    Args:
+        grid (Grid): The Sudoku grid to solve. It is not modified.
+        deadline (float | None): The time.perf_counter value at which to give up searching.
+          Unlimited when None.
+
+    Returns:
+        list[int] | None: The 81 digits of a solution, indexed by y * 9 + x,
+          or None if the grid has no solution or the deadline passed first.
+    """
+    state = _SearchState(grid.values, grid.masks, deadline)
+    if state.conflicting:
+        return None
+
+    solutions: list[list[int]] = []
+    state.search(1, solutions)
+
+    return solutions[0] if solutions else None
+
+
+def count_solutions(grid: Grid, limit: int = 2) -> int:
+    """
+    Count the solutions to the grid by backtracking search, stopping at the limit.
+    With the default limit of 2, this tells whether a puzzle has no solution,
+    a unique solution, or more than one solution.
+
+    Args:
+        grid (Grid): The Sudoku grid to check. It is not modified.
+        limit (int): The number of solutions after which to stop searching. Defaults to 2.
+
+    Returns:
+        int: The number of solutions, or the limit if there are at least that many.
+    """
+    if limit < 1:
+        raise ValueError("Limit must be at least 1.")
+
+    state = _SearchState(grid.values, grid.masks)
+    if state.conflicting:
+        return 0
+
+    return state.search(limit, [])
@@ -1,52 +1,372 @@
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Callable, Mapping, Sequence
+
+from caching import SolutionCache
 from model.grid import Grid
 from rules import (
+    apply_backtracking_rule,
+    apply_finned_fish_rule,
     apply_fish_rule,
     apply_hidden_single_rule,
     apply_hidden_pairs_rule,
+    apply_hidden_quads_rule,
     apply_hidden_triples_rule,
     apply_locked_candidates_rule,
     apply_naked_pairs_rule,
+    apply_naked_quads_rule,
     apply_naked_triples_rule,
     apply_single_candidate_rule,
     apply_xy_wing_rule,
     apply_xyz_wing_rule,
 )
+from ordering import AdaptiveOrdering
+from profiling import RuleObserver
+from search import count_solutions
+
+# Every rule, in the order they are tried by default, simplest first.
+RULE_NAMES = (
+    "single_candidate",
+    "naked_pairs",
+    "naked_triples",
+    "naked_quads",
+    "hidden_single",
+    "hidden_pairs",
+    "hidden_triples",
+    "hidden_quads",
+    "locked_candidates",
+    "x_wing",
+    "swordfish",
+    "jellyfish",
+    "finned_x_wing",
+    "finned_swordfish",
+    "finned_jellyfish",
+    "xy_wing",
+    "xyz_wing",
+)
+
+# Named selections of rules, each in the order the rules are tried.
+PRESETS: dict[str, tuple[str, ...]] = {
+    "singles-only": ("single_candidate", "hidden_single"),
+    "standard": RULE_NAMES[: RULE_NAMES.index("locked_candidates") + 1],
+    "full": RULE_NAMES,
+}
+
+DEFAULT_PRESET = "full"
+
+
+@dataclass(frozen=True)
+class Budget:
+    """
+    Limits on the work done by one solve, each unlimited when None.
+    The limits are checked between rule attempts, so a solve can overrun its time
+    by at most one attempt, and a rule past its own time limit is no longer attempted.
+
+    Attributes:
+        seconds (float | None): The wall-clock time allowed for the solve.
+        applications (int | None): The most successful rule applications allowed.
+        rule_seconds (Mapping[str, float]): The total time allowed for each named rule.
+    """
+
+    seconds: float | None = None
+    applications: int | None = None
+    rule_seconds: Mapping[str, float] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if self.seconds is not None and self.seconds < 0:
+            raise ValueError("Seconds must not be negative.")
+        if self.applications is not None and self.applications < 0:
+            raise ValueError("Applications must not be negative.")
+        for name, seconds in self.rule_seconds.items():
+            if name not in RULE_NAMES:
+                raise ValueError(f"Unknown rule: {name}.")
+            if seconds < 0:
+                raise ValueError("Seconds must not be negative.")
+
+
+def select_rules(
+    rules: str | Sequence[str] = DEFAULT_PRESET,
+    enabled: Mapping[str, bool] | None = None,
+) -> list[str]:
+    """
+    Choose the rules to try, and the order to try them in.
+
+    Args:
+        rules (str | Sequence[str]): The name of a preset in PRESETS, or the names of the rules in order.
+        enabled (Mapping[str, bool] | None): Rules to leave out when False, or to add when True.
+          Rules added are tried after the others, in the order of RULE_NAMES.
+
+    Returns:
+        list[str]: The names of the rules, in the order to try them.
+    """
+    if isinstance(rules, str):
+        if rules not in PRESETS:
+            raise ValueError(f"Unknown preset: {rules}.")
+        rules = PRESETS[rules]
+
+    enabled = enabled or {}
+    for name in (*rules, *enabled):
+        if name not in RULE_NAMES:
+            raise ValueError(f"Unknown rule: {name}.")
+
+    selected = [name for name in rules if enabled.get(name, True)]
+    selected.extend(
+        name for name in RULE_NAMES if enabled.get(name, False) and name not in selected
+    )
+    return selected
 
 
 class Solver:
-    def __init__(self, grid: Grid):
+    def __init__(
+        self,
+        grid: Grid,
+        fallback: bool = False,
+        observer: RuleObserver | None = None,
+        cache: SolutionCache | None = None,
+        rules: str | Sequence[str] = DEFAULT_PRESET,
+        enabled: Mapping[str, bool] | None = None,
+        ordering: AdaptiveOrdering | None = None,
+        budget: Budget | None = None,
+    ):
         """Construct a Solver instance with the given Sudoku grid.
 
         Args:
             grid (Grid): The Sudoku grid to be solved.
+            fallback (bool): Whether to finish the grid by backtracking search
+              when the rules cannot make any more progress. Defaults to False.
+              If the search finds no solution, no_solution is set.
+            observer (RuleObserver | None): Notified of the time taken and candidates
+              eliminated by every rule attempted, such as a RuleProfiler.
+              Rules are not timed when this is None.
+            cache (SolutionCache | None): Solutions of equivalent puzzles solved before with
+              the same rules, checked before applying any rules and updated when the grid is solved.
+            rules (str | Sequence[str]): The name of a preset in PRESETS, such as "singles-only",
+              or the names of the rules to try in order. Defaults to every rule.
+            enabled (Mapping[str, bool] | None): Rules to leave out when False, or to add when True.
+            ordering (AdaptiveOrdering | None): Reorders the rules at the start of each solve,
+              learning from every rule attempted. The rules are tried in the order given when None.
+            budget (Budget | None): Limits on the time and rule applications of each solve.
+              When any limit is reached, solving stops and budget_exhausted is set. Unlimited when None.
         """
         self.grid = grid
+        self.fallback = fallback
+        self.observer = observer
+        self.cache = cache
+        self.rule_names = select_rules(rules, enabled)
+        self.ordering = ordering
+        self.budget = budget or Budget()
+        self.budget_exhausted = False
+        self.no_solution = False
+        self.rule_applications: Counter[str] = Counter()
+
+    def _rules(self) -> list[tuple[str, Callable[[], bool]]]:
+        """List the selected rules in the order they are tried.
+
+        Returns:
+            list: Pairs of a rule name and a function applying the rule to the grid.
+        """
+        grid = self.grid
+        rules: dict[str, Callable[[], bool]] = {
+            "single_candidate": lambda: apply_single_candidate_rule(grid),
+            "naked_pairs": lambda: apply_naked_pairs_rule(grid),
+            "naked_triples": lambda: apply_naked_triples_rule(grid),
+            "naked_quads": lambda: apply_naked_quads_rule(grid),
+            "hidden_single": lambda: apply_hidden_single_rule(grid),
+            "hidden_pairs": lambda: apply_hidden_pairs_rule(grid),
+            "hidden_triples": lambda: apply_hidden_triples_rule(grid),
+            "hidden_quads": lambda: apply_hidden_quads_rule(grid),
+            "locked_candidates": lambda: apply_locked_candidates_rule(grid),
+            "x_wing": lambda: apply_fish_rule(grid, size=2),
+            "swordfish": lambda: apply_fish_rule(grid, size=3),
+            "jellyfish": lambda: apply_fish_rule(grid, size=4),
+            "finned_x_wing": lambda: apply_finned_fish_rule(grid, size=2),
+            "finned_swordfish": lambda: apply_finned_fish_rule(grid, size=3),
+            "finned_jellyfish": lambda: apply_finned_fish_rule(grid, size=4),
+            "xy_wing": lambda: apply_xy_wing_rule(grid),
+            "xyz_wing": lambda: apply_xyz_wing_rule(grid),
+        }
+
+        names = self.rule_names
+        if self.ordering is not None:
+            names = self.ordering.order(names)
+
+        return [(name, rules[name]) for name in names]
+
+    def _observers(self) -> list[RuleObserver]:
+        """List everything notified of the rules attempted.
+
+        Returns:
+            list[RuleObserver]: The observer and the ordering, if given.
+        """
+        observers: list[RuleObserver] = []
+        if self.observer is not None:
+            observers.append(self.observer)
+        if self.ordering is not None:
+            observers.append(self.ordering)
+
+        return observers
+
+    def _observed(self, name: str, rule: Callable[[], bool]) -> Callable[[], bool]:
+        """Wrap a rule so that each attempt is reported to the observers.
+
+        Args:
+            name (str): The name of the rule.
+            rule (Callable[[], bool]): The function applying the rule to the grid.
+
+        Returns:
+            Callable[[], bool]: A function applying the rule and reporting the attempt.
+        """
+        observers = self._observers()
+        assert observers
+        masks = self.grid.masks
+
+        def observed_rule() -> bool:
+            candidates = sum(map(int.bit_count, masks))
+            start = time.perf_counter()
+            applied = rule()
+            seconds = time.perf_counter() - start
+            eliminated = candidates - sum(map(int.bit_count, masks))
+            for observer in observers:
+                observer.rule_attempted(name, applied, seconds, eliminated)
+            return applied
+
+        return observed_rule
+
+    def _capped(
+        self, name: str, rule: Callable[[], bool], spent: dict[str, float]
+    ) -> Callable[[], bool]:
+        """Wrap a rule so that it is no longer attempted once it has used its time in the budget.
+
+        Args:
+            name (str): The name of the rule.
+            rule (Callable[[], bool]): The function applying the rule to the grid.
+            spent (dict[str, float]): The time taken by each capped rule so far, updated by every attempt.
+
+        Returns:
+            Callable[[], bool]: A function applying the rule until its time is used.
+        """
+        seconds = self.budget.rule_seconds[name]
+
+        def capped_rule() -> bool:
+            if spent[name] >= seconds:
+                return False
+
+            start = time.perf_counter()
+            applied = rule()
+            spent[name] += time.perf_counter() - start
+            return applied
+
+        return capped_rule
 
     def solve(self):
-        """Solve the Sudoku puzzle using a cycle of rules until no more rules can be applied."""
-        while True:
+        """Solve the Sudoku puzzle using a cycle of rules until no more rules can be applied.
+        Only the selected rules are tried, in the order given or chosen by the ordering.
+        Each successful rule application is counted by name in rule_applications,
+        and every attempt is reported to the observer and the ordering if there are any.
+        If the cache holds the solution of an equivalent puzzle, no rules are applied.
+        Solving stops as soon as the grid reaches a contradiction, which is_contradicted reports,
+        or when any limit of the budget is reached, which sets budget_exhausted
+        and leaves the grid partly solved. The backtracking search also gives up at the time limit.
+        A backtracking search which finds no solution proves that the puzzle has none,
+        and sets no_solution.
+        """
+        self.budget_exhausted = False
+        self.no_solution = False
+        budget = self.budget
+        deadline = None
+        if budget.seconds is not None:
+            deadline = time.perf_counter() + budget.seconds
+
+        if self.is_contradicted():
+            return
+
+        cached = None
+        if self.cache is not None:
+            # Fewer rules can solve fewer puzzles, so solutions are only shared between solves
+            # with the same rules. The adaptive order does not change which puzzles are solved.
+            cached = self.cache.key(
+                self.grid.values, (self.fallback, tuple(self.rule_names))
+            )
+            solution = self.cache.get(*cached) if cached is not None else None
+            if solution is not None:
+                # Every empty cell is filled, so no candidates are left to update.
+                for cell in self.grid:
+                    if cell.value is None:
+                        cell.value = solution[cell.index]
+                return
+
+        rules = self._rules()
+        if self._observers():
+            # Only wrap the rules when observed, so unobserved solves pay nothing for timing.
+            rules = [(name, self._observed(name, rule)) for name, rule in rules]
+
+        spent = {name: 0.0 for name, _ in rules if name in budget.rule_seconds}
+        rules = [
+            (name, self._capped(name, rule, spent) if name in spent else rule)
+            for name, rule in rules
+        ]
+
+        # A solved grid is left as soon as it is filled, without trying every rule once more.
+        values = self.grid.values
+        applications = 0
+        while None in values:
+            if budget.applications is not None and applications >= budget.applications:
+                self.budget_exhausted = True
+                break
+
             # Apply rules, stopping after the first successful application.
             # This ensures we always apply the simplest rules first.
             # This can help with efficiency where complex rules take more CPU cycles to apply.
-            applied = (
-                apply_single_candidate_rule(self.grid)
-                or apply_naked_pairs_rule(self.grid)
-                or apply_naked_triples_rule(self.grid)
-                or apply_hidden_single_rule(self.grid)
-                or apply_hidden_pairs_rule(self.grid)
-                or apply_hidden_triples_rule(self.grid)
-                or apply_locked_candidates_rule(self.grid)
-                or apply_fish_rule(self.grid, size=2)
-                or apply_fish_rule(self.grid, size=3)
-                or apply_fish_rule(self.grid, size=4)
-                or apply_xy_wing_rule(self.grid)
-                or apply_xyz_wing_rule(self.grid)
-            )
+            # Each rule only re-examines the cells and regions changed since its last pass,
+            # so restarting the cycle does not repeat work on unchanged parts of the grid.
+            for name, rule in rules:
+                if deadline is not None and time.perf_counter() >= deadline:
+                    self.budget_exhausted = True
+                    break
 
-            # If no rules were applied, we cannot proceed further
-            if not applied:
+                if rule():
+                    self.rule_applications[name] += 1
+                    applications += 1
+                    break
+            else:
+                # If no rules were applied, we cannot proceed further.
+                # Rules which used all their time might still have made progress.
+                self.budget_exhausted = any(
+                    seconds >= budget.rule_seconds[name]
+                    for name, seconds in spent.items()
+                )
                 break
 
+            if self.budget_exhausted:
+                break
+
+            # An invalid puzzle is rejected as soon as it is found, rather than after every rule stalls.
+            if self.is_contradicted():
+                return
+
+        # Search from the reduced candidates for anything the rules could not solve,
+        # unless the budget has run out.
+        if deadline is not None and time.perf_counter() >= deadline:
+            self.budget_exhausted = True
+
+        if self.fallback and not self.budget_exhausted and not self.is_solved():
+            backtracking = partial(apply_backtracking_rule, self.grid, deadline)
+            if self._observers():
+                backtracking = self._observed("backtracking", backtracking)
+
+            if backtracking():
+                self.rule_applications["backtracking"] += 1
+            elif deadline is not None and time.perf_counter() >= deadline:
+                # The search gave up at the deadline, so a solution may still exist.
+                self.budget_exhausted = True
+            else:
+                self.no_solution = True
+
+        if self.cache is not None and cached is not None and self.is_solved():
+            self.cache.put(*cached, [value or 0 for value in self.grid.values])
+
     def is_solved(self) -> bool:
         """Check whether the Sudoku grid is completely solved.
 
@@ -55,6 +375,23 @@ class Solver:
         """
         return all(cell.value is not None for cell in self.grid)
 
+    def is_contradicted(self) -> bool:
+        """Check whether the grid has reached a contradiction, so the puzzle has no solution.
+
+        Returns:
+            bool: True if an empty cell has no candidates, or a value has nowhere to go in a unit.
+        """
+        return self.grid.contradicted
+
+    def has_unique_solution(self) -> bool:
+        """Check whether the grid has exactly one solution.
+        The search stops as soon as a second solution is found.
+
+        Returns:
+            bool: True if the grid has one solution, False if it has none or several.
+        """
+        return count_solutions(self.grid, limit=2) == 1
+
     def is_valid(self) -> bool:
         """Check if the current grid state is valid.
         Valid means that all cells with values do not conflict with their neighbours.
@@ -1,3 +1,20 @@
+from .grid_file import (
+    GIVENS,
+    MASKS,
+    GridFile,
+    is_grid_file,
+    write_grids,
+    write_lines,
+)
 from .grid_rendering import display_grid, render_grid
 
-__all__ = ["display_grid", "render_grid"]
+__all__ = [
+    "GIVENS",
+    "MASKS",
+    "GridFile",
+    "display_grid",
+    "is_grid_file",
+    "render_grid",
+    "write_grids",
+    "write_lines",
+]
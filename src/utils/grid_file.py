@@ -0,0 +1,284 @@
+import mmap
+import os
+import sys
+from array import array
+from contextlib import contextmanager
+from typing import BinaryIO, Iterable, Iterator
+
+from model import ALL_CANDIDATES_MASK, Grid, GridSnapshot, candidate_bit
+
+# Files start with a header of the magic bytes, a format version, the record kind
+# and two reserved bytes, followed by fixed size records for each grid.
+MAGIC = b"SDKG"
+VERSION = 1
+HEADER_SIZE = 8
+
+# Each givens record is 81 bytes holding the value of each cell, or 0 when empty.
+GIVENS = 0
+# Each masks record is 81 little-endian uint16 words holding the candidate mask
+# of each empty cell, or the bit of the value with SOLVED_FLAG set for a solved cell.
+MASKS = 1
+SOLVED_FLAG = 0x8000
+
+RECORD_SIZES = {GIVENS: 81, MASKS: 162}
+
+# Converts a givens record to line notation, with '.' for empty cells.
+_GIVENS_TO_LINE = bytes.maketrans(bytes(range(10)), b".123456789")
+
+
+def _header(kind: int) -> bytes:
+    return MAGIC + bytes([VERSION, kind, 0, 0])
+
+
+@contextmanager
+def _replace_on_success(path: str, kind: int) -> Iterator[BinaryIO]:
+    """
+    Open a temporary file beside a binary grid file for writing, starting with the header.
+    The file is only replaced once writing succeeds, so a failure never leaves a truncated file.
+
+    Args:
+        path (str): The file to replace.
+        kind (int): The kind of record to be written, GIVENS or MASKS.
+
+    Returns:
+        Iterator[BinaryIO]: A context manager giving the temporary file to write records to.
+    """
+    temp_path = f"{path}.tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(_header(kind))
+            yield f
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _masks_record(grid: Grid) -> bytes:
+    words = array(
+        "H",
+        (
+            SOLVED_FLAG | candidate_bit(value) if value else mask
+            for value, mask in zip(grid.values, grid.masks)
+        ),
+    )
+    if sys.byteorder == "big":
+        words.byteswap()
+
+    return words.tobytes()
+
+
+def write_grids(path: str, grids: Iterable[Grid], kind: int = GIVENS) -> int:
+    """
+    Write grids to a binary grid file, replacing the file if it exists.
+    The file is left unchanged if writing fails.
+    Givens records keep only the values of the grids, while masks records also
+    keep the candidates of each empty cell, for grids which are partly solved.
+
+    Args:
+        path (str): The file to write.
+        grids (Iterable[Grid]): The grids to write. Read lazily.
+        kind (int): The kind of record to write, GIVENS or MASKS.
+
+    Returns:
+        int: The number of grids written.
+    """
+    if kind not in RECORD_SIZES:
+        raise ValueError("Kind must be GIVENS or MASKS.")
+
+    count = 0
+    with _replace_on_success(path, kind) as f:
+        for grid in grids:
+            if kind == GIVENS:
+                f.write(bytes(value or 0 for value in grid.values))
+            else:
+                f.write(_masks_record(grid))
+            count += 1
+
+    return count
+
+
+def write_lines(path: str, lines: Iterable[str]) -> int:
+    """
+    Write puzzles in line notation to a binary grid file of givens records,
+    without building a Grid for each puzzle. The file is left unchanged if writing fails.
+
+    Args:
+        path (str): The file to write.
+        lines (Iterable[str]): The puzzles as strings of 81 characters. Read lazily.
+
+    Returns:
+        int: The number of puzzles written.
+    """
+    count = 0
+    with _replace_on_success(path, GIVENS) as f:
+        for line in lines:
+            line = line.strip()
+            if len(line) != 81:
+                raise ValueError("Grid must be 9x9.")
+
+            f.write(bytes(int(c) if "1" <= c <= "9" else 0 for c in line))
+            count += 1
+
+    return count
+
+
+def is_grid_file(path: str) -> bool:
+    """
+    Check whether a file is a binary grid file, rather than puzzles in text.
+
+    Args:
+        path (str): The file to check.
+
+    Returns:
+        bool: True if the file starts with the magic bytes of a binary grid file.
+    """
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+class GridFile:
+    def __init__(self, path: str):
+        """
+        Open a binary grid file for reading through a memory map.
+        Records are only read from disk when they are accessed,
+        so files much larger than memory can be read lazily or at random.
+
+        Args:
+            path (str): The file to read.
+        """
+        with open(path, "rb") as f:
+            header = f.read(HEADER_SIZE)
+            if len(header) < HEADER_SIZE or header[:4] != MAGIC:
+                raise ValueError("Not a binary grid file.")
+            if header[4] != VERSION:
+                raise ValueError(f"Unsupported binary grid file version {header[4]}.")
+            if header[5] not in RECORD_SIZES:
+                raise ValueError(f"Unsupported record kind {header[5]}.")
+
+            self.kind = header[5]
+            self._record_size = RECORD_SIZES[self.kind]
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        records, remainder = divmod(len(self._map) - HEADER_SIZE, self._record_size)
+        if remainder:
+            self._map.close()
+            raise ValueError("Binary grid file is truncated.")
+
+        self._length = records
+
+    def __enter__(self) -> "GridFile":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the memory map of the file."""
+        self._map.close()
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _record(self, index: int) -> bytes:
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("Grid index out of range.")
+
+        start = HEADER_SIZE + index * self._record_size
+        return self._map[start : start + self._record_size]
+
+    def _words(self, record: bytes) -> array[int]:
+        words = array("H", record)
+        if sys.byteorder == "big":
+            words.byteswap()
+
+        return words
+
+    def __getitem__(self, index: int) -> Grid:
+        """
+        Read the grid at an index, without reading any other records.
+
+        Args:
+            index (int): The position of the grid in the file. Negative indices count from the end.
+
+        Returns:
+            Grid: The grid, with the candidates of its empty cells restored from a masks record.
+        """
+        if self.kind == GIVENS:
+            values: list[int | None] = [value or None for value in self._record(index)]
+            return Grid([values[y * 9 : y * 9 + 9] for y in range(9)])
+
+        return Grid.from_snapshot(self.snapshot(index))
+
+    def __iter__(self) -> Iterator[Grid]:
+        for index in range(self._length):
+            yield self[index]
+
+    def snapshot(self, index: int) -> GridSnapshot:
+        """
+        Read the values and candidate masks of the grid at an index, without building a Grid.
+        Snapshots are small and can be sent to other processes, where Grid.from_snapshot rebuilds the grid.
+
+        Args:
+            index (int): The position of the grid in the file. Negative indices count from the end.
+
+        Returns:
+            GridSnapshot: The values and candidate masks of the grid, with masks of 0 for solved cells.
+        """
+        if self.kind == GIVENS:
+            return self[index].snapshot()
+
+        words = self._words(self._record(index))
+        return GridSnapshot(
+            tuple(
+                (word & ALL_CANDIDATES_MASK).bit_length()
+                if word & SOLVED_FLAG
+                else None
+                for word in words
+            ),
+            tuple(0 if word & SOLVED_FLAG else word for word in words),
+        )
+
+    def snapshots(self) -> Iterator[GridSnapshot]:
+        """
+        Read the values and candidate masks of every grid, lazily and in order.
+
+        Returns:
+            Iterator[GridSnapshot]: The snapshot of each grid.
+        """
+        for index in range(self._length):
+            yield self.snapshot(index)
+
+    def line(self, index: int) -> str:
+        """
+        Read the values of the grid at an index in line notation, without building a Grid.
+
+        Args:
+            index (int): The position of the grid in the file. Negative indices count from the end.
+
+        Returns:
+            str: A string of 81 characters listing the cells row by row, with '.' for empty cells.
+        """
+        record = self._record(index)
+        if self.kind == GIVENS:
+            return record.translate(_GIVENS_TO_LINE).decode()
+
+        return "".join(
+            str((word & ALL_CANDIDATES_MASK).bit_length())
+            if word & SOLVED_FLAG
+            else "."
+            for word in self._words(record)
+        )
+
+    def lines(self) -> Iterator[str]:
+        """
+        Read the values of every grid in line notation, lazily and in order.
+
+        Returns:
+            Iterator[str]: The line notation of each grid.
+        """
+        for index in range(self._length):
+            yield self.line(index)
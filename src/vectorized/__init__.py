@@ -0,0 +1,24 @@
+"""
+Solve the simpler steps of many puzzles at once with NumPy.
+NumPy is an optional dependency, installed with the vectorized extra.
+"""
+
+from .batch_engine import (
+    BatchMasks,
+    contradictions,
+    masks_from_lines,
+    propagate,
+    solved,
+    to_grid,
+    to_line_notation,
+)
+
+__all__ = [
+    "BatchMasks",
+    "contradictions",
+    "masks_from_lines",
+    "propagate",
+    "solved",
+    "to_grid",
+    "to_line_notation",
+]
@@ -0,0 +1,201 @@
+from typing import Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+
+from model import ALL_CANDIDATES_MASK, Grid, Point
+from model.units import BLOCKS, COLUMNS, INTERSECTIONS, PEERS, ROWS
+
+# Candidate masks of many puzzles, shaped (puzzles, 81) and indexed by y * 9 + x.
+# A solved cell has only the bit of its value set, and an empty mask is a contradiction.
+BatchMasks = NDArray[np.uint16]
+
+_POPCOUNT = np.array([mask.bit_count() for mask in range(512)], dtype=np.uint8)
+_PEERS = np.array(PEERS, dtype=np.intp)
+
+# Rows, columns and blocks each partition the grid, so each can be updated in one assignment.
+_UNIT_GROUPS = tuple(
+    np.array(units, dtype=np.intp) for units in (ROWS, COLUMNS, BLOCKS)
+)
+
+_SEGMENTS = np.array([segment for segment, _, _ in INTERSECTIONS], dtype=np.intp)
+_BLOCK_RESTS = np.array([block for _, block, _ in INTERSECTIONS], dtype=np.intp)
+_LINE_RESTS = np.array([line for _, _, line in INTERSECTIONS], dtype=np.intp)
+
+# For each cell, the 4 intersections whose rest of block or rest of line hold the cell.
+_IN_BLOCK_REST = np.array(
+    [[i for i, rest in enumerate(_BLOCK_RESTS) if cell in rest] for cell in range(81)],
+    dtype=np.intp,
+)
+_IN_LINE_REST = np.array(
+    [[i for i, rest in enumerate(_LINE_RESTS) if cell in rest] for cell in range(81)],
+    dtype=np.intp,
+)
+
+
+def masks_from_lines(lines: Sequence[str]) -> BatchMasks:
+    """
+    Build the candidate masks of many puzzles given in line notation.
+    Given values are stored as single candidates, and empty cells allow every candidate.
+
+    Args:
+        lines (Sequence[str]): The puzzles as strings of 81 characters.
+
+    Returns:
+        BatchMasks: The candidate masks of the puzzles, in the same order.
+    """
+    lines = [line.strip() for line in lines]
+    if any(len(line) != 81 for line in lines):
+        raise ValueError("Grid must be 9x9.")
+
+    # Any character other than a digit is an empty cell, so each one that is not ASCII
+    # is replaced by a single "?" to keep every puzzle at 81 bytes.
+    characters = np.frombuffer(
+        "".join(lines).encode("ascii", "replace"), dtype=np.uint8
+    )
+    digits = characters.reshape(len(lines), 81).astype(np.int16) - ord("0")
+    given = (digits >= 1) & (digits <= 9)
+
+    return np.where(
+        given, np.left_shift(1, np.clip(digits - 1, 0, 8)), ALL_CANDIDATES_MASK
+    ).astype(np.uint16)
+
+
+def _eliminate_singles(masks: BatchMasks):
+    """Remove the value of every solved cell from the candidates of its peers."""
+    singles = np.where(_POPCOUNT[masks] == 1, masks, 0).astype(np.uint16)
+    masks &= ~np.bitwise_or.reduce(singles[:, _PEERS], axis=2)
+
+
+def _apply_hidden_singles(masks: BatchMasks):
+    """Solve every cell which holds the only place for a candidate in one of its units."""
+    for units in _UNIT_GROUPS:
+        unit_masks = masks[:, units]
+        once = np.zeros(unit_masks.shape[:2], dtype=np.uint16)
+        twice = np.zeros_like(once)
+        for position in range(9):
+            twice |= once & unit_masks[:, :, position]
+            once |= unit_masks[:, :, position]
+
+        hidden = unit_masks & (once & ~twice)[:, :, np.newaxis]
+        masks[:, units] = np.where(hidden != 0, hidden, unit_masks)
+
+
+def _apply_locked_candidates(masks: BatchMasks):
+    """Remove candidates confined to where a block meets a row or column from the rest of the other."""
+    segments = np.bitwise_or.reduce(masks[:, _SEGMENTS], axis=2)
+    block_rests = np.bitwise_or.reduce(masks[:, _BLOCK_RESTS], axis=2)
+    line_rests = np.bitwise_or.reduce(masks[:, _LINE_RESTS], axis=2)
+
+    pointing = segments & ~block_rests
+    claiming = segments & ~line_rests
+    masks &= ~(
+        np.bitwise_or.reduce(pointing[:, _IN_LINE_REST], axis=2)
+        | np.bitwise_or.reduce(claiming[:, _IN_BLOCK_REST], axis=2)
+    )
+
+
+def propagate(masks: BatchMasks):
+    """
+    Apply naked singles, hidden singles and locked candidates to every puzzle in lockstep,
+    until none of them changes any puzzle. Puzzles stop being processed once they stall.
+
+    Args:
+        masks (BatchMasks): The candidate masks of the puzzles, which are updated in place.
+    """
+    active = np.arange(len(masks))
+    while len(active):
+        working = masks[active]
+        previous = working.copy()
+
+        _eliminate_singles(working)
+        _apply_hidden_singles(working)
+        _apply_locked_candidates(working)
+
+        masks[active] = working
+        changed = np.any(working != previous, axis=1)
+        active = active[changed & ~contradictions(working)]
+
+
+def contradictions(masks: BatchMasks) -> NDArray[np.bool_]:
+    """
+    Find the puzzles which can have no solution, because a cell has no candidates,
+    two solved cells share a unit and a value, or a unit has nowhere left for a value.
+
+    Args:
+        masks (BatchMasks): The candidate masks of the puzzles.
+
+    Returns:
+        NDArray[np.bool_]: Whether each puzzle has a contradiction.
+    """
+    found = np.any(masks == 0, axis=1)
+    solved = _POPCOUNT[masks] == 1
+    for units in _UNIT_GROUPS:
+        unit_masks = masks[:, units]
+        found |= np.bitwise_or.reduce(unit_masks, axis=2).min(axis=1) != (
+            ALL_CANDIDATES_MASK
+        )
+
+        # Solved cells with distinct values in a unit have as many bits as cells.
+        unit_singles = np.where(solved[:, units], unit_masks, 0)
+        found |= np.any(
+            _POPCOUNT[np.bitwise_or.reduce(unit_singles, axis=2)]
+            != solved[:, units].sum(axis=2),
+            axis=1,
+        )
+
+    return found
+
+
+def solved(masks: BatchMasks) -> NDArray[np.bool_]:
+    """
+    Find the puzzles whose cells all have a single candidate.
+
+    Args:
+        masks (BatchMasks): The candidate masks of the puzzles.
+
+    Returns:
+        NDArray[np.bool_]: Whether each puzzle is solved, if it has no contradiction.
+    """
+    return np.all(_POPCOUNT[masks] == 1, axis=1)
+
+
+def _values(masks: NDArray[np.uint16]) -> list[int | None]:
+    """Get the value of each cell of one puzzle, or None where it is unsolved."""
+    return [
+        mask.bit_length() if mask.bit_count() == 1 else None for mask in map(int, masks)
+    ]
+
+
+def to_line_notation(masks: NDArray[np.uint16]) -> str:
+    """
+    Convert the candidate masks of one puzzle to line notation, using '.' for unsolved cells.
+
+    Args:
+        masks (NDArray[np.uint16]): The 81 candidate masks of the puzzle.
+
+    Returns:
+        str: A string of 81 characters listing the cells row by row.
+    """
+    return "".join(str(value) if value else "." for value in _values(masks))
+
+
+def to_grid(masks: NDArray[np.uint16]) -> Grid:
+    """
+    Convert the candidate masks of one puzzle to a Grid for the Solver to continue from.
+    Cells with a single candidate are given that value.
+
+    Args:
+        masks (NDArray[np.uint16]): The 81 candidate masks of the puzzle.
+
+    Returns:
+        Grid: The grid, with the candidates of unsolved cells reduced to the masks.
+    """
+    values = _values(masks)
+    grid = Grid([values[y * 9 : y * 9 + 9] for y in range(9)])
+    for index, mask in enumerate(map(int, masks)):
+        cell = grid[Point(index % 9, index // 9)]
+        if cell is not None and cell.value is None:
+            cell.mask &= mask
+
+    return grid
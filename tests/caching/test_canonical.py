@@ -0,0 +1,80 @@
+import random
+
+from caching import Transform, canonical_form
+
+SOLVABLE_LINE = (
+    ".7.2.8.3148.3.7...9.3..4758.4687...389..3.56...792.81.754.12......7.31453.8.4.2.6"
+)
+HARD_LINE = (
+    "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4.."
+)
+
+
+def values(line: str) -> list[int]:
+    return [int(c) if c != "." else 0 for c in line]
+
+
+def random_transform(rng: random.Random) -> Transform:
+    bands = rng.sample(range(3), 3)
+    stacks = rng.sample(range(3), 3)
+    return Transform(
+        transpose=rng.random() < 0.5,
+        rows=tuple(b * 3 + r for b in bands for r in rng.sample(range(3), 3)),
+        columns=tuple(s * 3 + c for s in stacks for c in rng.sample(range(3), 3)),
+        digits=(0, *rng.sample(range(1, 10), 9)),
+    )
+
+
+def test_transform_invert_undoes_apply():
+    transform = random_transform(random.Random(1))
+    grid = values(HARD_LINE)
+
+    assert transform.invert(transform.apply(grid)) == grid
+
+
+def test_canonical_form_is_a_transform_of_the_grid():
+    grid = values(SOLVABLE_LINE)
+
+    found = canonical_form(grid)
+
+    assert found is not None
+    form, transform = found
+    assert form == "".join(map(str, transform.apply(grid)))
+    assert transform.invert([int(c) for c in form]) == grid
+
+
+def test_canonical_form_is_the_same_for_equivalent_grids():
+    rng = random.Random(2)
+    for line in (SOLVABLE_LINE, HARD_LINE):
+        grid = values(line)
+        found = canonical_form(grid)
+        assert found is not None
+
+        for _ in range(10):
+            equivalent = canonical_form(random_transform(rng).apply(grid))
+            assert equivalent is not None
+            assert equivalent[0] == found[0]
+
+
+def test_canonical_form_differs_for_different_grids():
+    solvable = canonical_form(values(SOLVABLE_LINE))
+    hard = canonical_form(values(HARD_LINE))
+
+    assert solvable is not None and hard is not None
+    assert solvable[0] != hard[0]
+
+
+def test_canonical_form_is_smallest_of_equivalent_grids():
+    rng = random.Random(3)
+    grid = values(HARD_LINE)
+
+    found = canonical_form(grid)
+
+    assert found is not None
+    for _ in range(50):
+        equivalent = "".join(map(str, random_transform(rng).apply(grid)))
+        assert found[0] <= equivalent
+
+
+def test_canonical_form_gives_up_on_empty_grid():
+    assert canonical_form([0] * 81) is None
@@ -0,0 +1,83 @@
+import pickle
+from unittest.mock import patch
+
+import pytest
+from caching import ResultStore, StoredResult
+
+PUZZLE = "." * 80 + "1"
+
+
+def test_store_rejects_max_entries_below_one(tmp_path):
+    with pytest.raises(ValueError, match="Maximum entries must be at least 1."):
+        ResultStore(str(tmp_path / "results.db"), max_entries=0)
+
+
+def test_get_returns_none_for_unknown_puzzle(tmp_path):
+    with ResultStore(str(tmp_path / "results.db")) as store:
+        assert store.get(PUZZLE) is None
+
+
+def test_put_then_get_returns_stored_result(tmp_path):
+    with ResultStore(str(tmp_path / "results.db")) as store:
+        store.put(PUZZLE, False, "1" * 81, "solved", {"hidden_single": 3})
+
+        assert store.get(PUZZLE) == StoredResult(
+            "1" * 81, "solved", {"hidden_single": 3}
+        )
+
+
+def test_get_treats_any_empty_cell_character_alike(tmp_path):
+    with ResultStore(str(tmp_path / "results.db")) as store:
+        store.put(PUZZLE, False, "1" * 81, "solved", {})
+
+        assert store.get("0" * 80 + "1\n") is not None
+
+
+def test_get_separates_results_with_and_without_fallback(tmp_path):
+    with ResultStore(str(tmp_path / "results.db")) as store:
+        store.put(PUZZLE, True, "1" * 81, "solved", {"backtracking": 1})
+
+        assert store.get(PUZZLE, fallback=False) is None
+        assert store.get(PUZZLE, fallback=True) is not None
+
+
+def test_results_persist_after_reopening(tmp_path):
+    path = str(tmp_path / "results.db")
+    with ResultStore(path) as store:
+        store.put(PUZZLE, False, "1" * 81, "unsolved", {})
+
+    with ResultStore(path) as store:
+        assert store.get(PUZZLE) == StoredResult("1" * 81, "unsolved", {})
+
+
+def test_pickled_store_opens_its_own_connection(tmp_path):
+    with ResultStore(str(tmp_path / "results.db"), max_entries=5) as store:
+        store.put(PUZZLE, False, "1" * 81, "solved", {})
+
+        with pickle.loads(pickle.dumps(store)) as copy:
+            assert copy.max_entries == 5
+            assert copy.get(PUZZLE) is not None
+
+
+def test_evict_keeps_most_recently_stored_results(tmp_path):
+    with ResultStore(str(tmp_path / "results.db"), max_entries=2) as store:
+        puzzles = [str(digit) + "." * 80 for digit in range(1, 5)]
+        for puzzle in puzzles:
+            store.put(puzzle, False, puzzle, "unsolved", {})
+        # Storing a result again makes it the most recent.
+        store.put(puzzles[0], False, puzzles[0], "unsolved", {})
+
+        store.evict()
+
+        assert len(store) == 2
+        assert store.get(puzzles[0]) is not None
+        assert store.get(puzzles[3]) is not None
+
+
+def test_put_evicts_periodically(tmp_path):
+    with patch("caching.result_store.EVICTION_INTERVAL", 2):
+        with ResultStore(str(tmp_path / "results.db"), max_entries=1) as store:
+            for digit in range(1, 5):
+                store.put(str(digit) + "." * 80, False, "1" * 81, "solved", {})
+
+            assert len(store) == 1
@@ -0,0 +1,111 @@
+import pytest
+from caching import SolutionCache, Transform
+from model import Grid
+from solver import Solver
+
+SOLVABLE_LINE = (
+    ".7.2.8.3148.3.7...9.3..4758.4687...389..3.56...792.81.754.12......7.31453.8.4.2.6"
+)
+SOLVABLE_SOLUTION = (
+    "675298431481357692923164758146875923892431567537926814754612389269783145318549276"
+)
+# puzzles/expert_01.txt, which needs more than singles.
+EXPERT_LINE = (
+    ".9825......3.9....26..7.84..3......8......2.6.7....53..8.3..6..........4624..8..."
+)
+HARD_LINE = (
+    "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4.."
+)
+
+
+def values(line: str) -> list[int]:
+    return [int(c) if c != "." else 0 for c in line]
+
+
+def transformed(line: str) -> str:
+    transform = Transform(
+        transpose=True,
+        rows=(5, 3, 4, 0, 2, 1, 8, 6, 7),
+        columns=(7, 8, 6, 1, 0, 2, 4, 5, 3),
+        digits=(0, 3, 1, 4, 9, 5, 2, 6, 8, 7),
+    )
+    return "".join(str(v) if v else "." for v in transform.apply(values(line)))
+
+
+def test_cache_rejects_maxsize_below_one():
+    with pytest.raises(ValueError, match="Maximum size must be at least 1."):
+        SolutionCache(maxsize=0)
+
+
+def test_get_returns_solution_of_equivalent_puzzle_in_its_orientation():
+    cache = SolutionCache()
+    key, transform = cache.key(values(SOLVABLE_LINE))
+    cache.put(key, transform, values(SOLVABLE_SOLUTION))
+
+    other_key, other_transform = cache.key(values(transformed(SOLVABLE_LINE)))
+
+    assert other_key == key
+    assert cache.get(other_key, other_transform) == values(
+        transformed(SOLVABLE_SOLUTION)
+    )
+    assert cache.hits == 1
+
+
+def test_get_separates_variants():
+    cache = SolutionCache()
+    key, transform = cache.key(values(SOLVABLE_LINE), variant=False)
+    cache.put(key, transform, values(SOLVABLE_SOLUTION))
+
+    other_key, other_transform = cache.key(values(SOLVABLE_LINE), variant=True)
+
+    assert cache.get(other_key, other_transform) is None
+    assert cache.misses == 1
+
+
+def test_put_discards_least_recently_used_solution():
+    cache = SolutionCache(maxsize=2)
+    lines = [SOLVABLE_LINE, HARD_LINE, "." * 80 + "1"]
+    keys = [cache.key(values(line)) for line in lines]
+    for key, transform in keys:
+        cache.put(key, transform, [1] * 81)
+        # Keep the first puzzle recently used, so the second is discarded.
+        cache.get(*keys[0])
+
+    assert len(cache) == 2
+    assert cache.get(*keys[0]) is not None
+    assert cache.get(*keys[1]) is None
+    assert cache.get(*keys[2]) is not None
+
+
+def test_solver_solves_equivalent_puzzle_from_cache():
+    cache = SolutionCache()
+    Solver(Grid.from_line_notation(SOLVABLE_LINE), cache=cache).solve()
+
+    grid = Grid.from_line_notation(transformed(SOLVABLE_LINE))
+    solver = Solver(grid, cache=cache)
+    solver.solve()
+
+    assert cache.hits == 1
+    assert solver.rule_applications == {}
+    assert grid.to_line_notation() == transformed(SOLVABLE_SOLUTION)
+
+
+def test_solver_only_uses_solutions_found_with_the_same_rules():
+    cache = SolutionCache()
+    Solver(Grid.from_line_notation(EXPERT_LINE), cache=cache).solve()
+
+    grid = Grid.from_line_notation(EXPERT_LINE)
+    solver = Solver(grid, cache=cache, rules="singles-only")
+    solver.solve()
+
+    assert len(cache) == 1
+    assert not solver.is_solved()
+    assert solver.rule_applications
+
+
+def test_solver_does_not_cache_unsolved_grid():
+    cache = SolutionCache()
+
+    Solver(Grid.from_line_notation(HARD_LINE), cache=cache).solve()
+
+    assert len(cache) == 0
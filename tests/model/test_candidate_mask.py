@@ -0,0 +1,35 @@
+from model.candidate_mask import (
+    ALL_CANDIDATES_MASK,
+    MASK_CANDIDATES,
+    candidate_bit,
+    candidates_from_mask,
+    mask_from_candidates,
+)
+
+
+def test_candidate_bit_sets_single_bit_for_candidate():
+    assert candidate_bit(1) == 0b000000001
+    assert candidate_bit(5) == 0b000010000
+    assert candidate_bit(9) == 0b100000000
+
+
+def test_mask_from_candidates_combines_bits():
+    assert mask_from_candidates({1, 3, 9}) == 0b100000101
+    assert mask_from_candidates(set()) == 0
+    assert mask_from_candidates(range(1, 10)) == ALL_CANDIDATES_MASK
+
+
+def test_candidates_from_mask_returns_new_set():
+    candidates = candidates_from_mask(0b100000101)
+
+    assert candidates == {1, 3, 9}
+
+    candidates.add(2)
+    assert candidates_from_mask(0b100000101) == {1, 3, 9}
+
+
+def test_mask_candidates_covers_every_mask_in_order():
+    assert len(MASK_CANDIDATES) == 512
+    assert MASK_CANDIDATES[0] == ()
+    assert MASK_CANDIDATES[ALL_CANDIDATES_MASK] == (1, 2, 3, 4, 5, 6, 7, 8, 9)
+    assert MASK_CANDIDATES[0b010010010] == (2, 5, 8)
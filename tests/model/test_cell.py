@@ -165,3 +165,79 @@ def test_cell_candidates_cannot_be_set_with_invalid_value_ten():
         cell.candidates = {1, 2, 3, 10}
 
     assert str(err.value) == "All candidates must be between 1 and 9."
+
+
+def test_new_cell_has_full_mask():
+    cell = Cell(coord, block, coord_in_block)
+
+    assert cell.mask == 0b111111111
+
+
+def test_cell_with_value_has_empty_mask():
+    cell = Cell(coord, block, coord_in_block, 7)
+
+    assert cell.mask == 0
+
+
+def test_cell_mask_can_be_set():
+    cell = Cell(coord, block, coord_in_block)
+    cell.mask = 0b000000110
+
+    assert cell.mask == 0b000000110
+    assert cell.candidates == {2, 3}
+
+
+def test_cell_mask_reflects_candidates():
+    cell = Cell(coord, block, coord_in_block)
+    cell.candidates = {1, 9}
+
+    assert cell.mask == 0b100000001
+
+
+def test_cell_mask_cannot_be_set_if_value_is_set():
+    cell = Cell(coord, block, coord_in_block, 5)
+
+    with pytest.raises(ValueError) as err:
+        cell.mask = 0b1
+
+    assert (
+        str(err.value) == "Cannot set candidates for a cell that already has a value."
+    )
+
+
+def test_cell_mask_cannot_be_set_with_invalid_mask():
+    cell = Cell(coord, block, coord_in_block)
+
+    with pytest.raises(ValueError) as err:
+        cell.mask = 0b1000000000
+
+    assert str(err.value) == "All candidates must be between 1 and 9."
+
+
+def test_cell_state_is_stored_in_shared_lists():
+    values: list[int | None] = [None] * 3
+    masks = [0] * 3
+    cell = Cell(coord, block, coord_in_block, index=1, values=values, masks=masks)
+
+    cell.candidates = {4, 6}
+    assert masks == [0, 0b000101000, 0]
+
+    cell.value = 4
+    assert values == [None, 4, None]
+    assert masks == [0, 0, 0]
+
+
+def test_cell_reports_changes_to_on_change():
+    changes = []
+    cell = Cell(
+        coord,
+        block,
+        coord_in_block,
+        on_change=lambda index, old_mask: changes.append((index, old_mask)),
+    )
+
+    cell.candidates = {1, 2}
+    cell.mask = 0b11  # Unchanged, so not reported
+    cell.value = 2
+
+    assert changes == [(0, 0b111111111), (0, 0b11)]
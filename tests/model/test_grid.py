@@ -1,6 +1,7 @@
 import pytest
 from model.grid import Grid
 from model.point import Point
+from model.units import UNITS
 
 
 def test_new_grid_with_none_values_has_empty_cells():
@@ -502,3 +503,356 @@ def test_get_row_cells_with_invalid_block_index():
 
     assert len(grid.get_row_cells(0, 3)) == 0  # Block index too high
     assert len(grid.get_row_cells(0, -1)) == 0  # Block index too low
+
+
+def test_masks_are_indexed_by_cell_position():
+    rows = [
+        ".7.2.8.31",
+        "48.3.7...",
+        "9.3..4758",
+        ".4687...3",
+        "89..3.56.",
+        "..792.81.",
+        "754.12...",
+        "...7.3145",
+        "3.8.4.2.6",
+    ]
+    grid = Grid.from_rows_notation(rows)
+
+    assert len(grid.masks) == 81
+    for cell in grid:
+        assert grid.masks[cell.coord.y * 9 + cell.coord.x] == cell.mask
+
+    assert grid.masks[0] == 0b000110000  # Candidates {5, 6}
+    assert grid.masks[1] == 0  # Solved cell
+
+
+def test_cell_mask_changes_are_visible_through_grid_masks():
+    grid = Grid([[None] * 9] * 9)
+
+    grid[Point(4, 2)].candidates = {1, 2}
+
+    assert grid.masks[2 * 9 + 4] == 0b000000011
+
+
+def test_iteration_is_in_row_major_order():
+    grid = Grid([[None] * 9] * 9)
+
+    coords = [cell.coord for cell in grid]
+
+    assert coords == [Point(x, y) for y in range(9) for x in range(9)]
+
+
+def test_indexing_returns_same_cell_as_iteration():
+    grid = Grid([[None] * 9] * 9)
+
+    for cell in grid:
+        assert grid[cell.coord] is cell
+        assert cell.index == cell.coord.y * 9 + cell.coord.x
+
+
+def test_get_neighbours_rejects_cell_from_another_grid():
+    grid = Grid([[None] * 9] * 9)
+    other_grid = Grid([[None] * 9] * 9)
+
+    with pytest.raises(ValueError):
+        _ = grid.get_neighbours(other_grid[Point(4, 4)])
+
+
+def test_unit_lookups_return_the_same_frozen_collection():
+    grid = Grid([[None] * 9] * 9)
+
+    assert isinstance(grid.get_row_cells(3), frozenset)
+    assert grid.get_row_cells(3) is grid.get_row_cells(3)
+    assert grid.get_column_cells(3, 1) is grid.get_column_cells(3, 1)
+    assert grid.get_block_cells(Point(1, 2)) is grid.get_block_cells(Point(1, 2))
+
+    cell = grid[Point(4, 4)]
+    assert grid.get_neighbours(cell) is grid.get_neighbours(cell)
+
+
+def test_intersection_iter_returns_all_intersections():
+    grid = Grid([[None] * 9] * 9)
+
+    intersections = list(grid.intersection_iter())
+
+    assert len(intersections) == 54
+    assert intersections[0] == (
+        grid.get_column_cells(0, 0),
+        grid.get_block_cells(Point(0, 0)) - grid.get_column_cells(0, 0),
+        grid.get_column_cells(0) - grid.get_column_cells(0, 0),
+    )
+    assert intersections[1] == (
+        grid.get_row_cells(0, 0),
+        grid.get_block_cells(Point(0, 0)) - grid.get_row_cells(0, 0),
+        grid.get_row_cells(0) - grid.get_row_cells(0, 0),
+    )
+
+
+def test_start_pass_returns_stamp_of_previous_pass():
+    grid = Grid([[None] * 9] * 9)
+
+    assert grid.start_pass("rule") == -1
+
+    stamp = grid.start_pass("rule")
+    assert stamp >= 0
+    assert grid.start_pass("rule") == stamp
+    assert grid.start_pass("other rule") == -1
+
+
+def test_changes_are_tracked_since_a_pass_started():
+    grid = Grid([[None] * 9] * 9)
+    grid.start_pass("rule")
+    since = grid.start_pass("rule")
+
+    assert not grid.changed_since(since)
+
+    cell = grid[Point(4, 4)]
+    cell.candidates -= {3}
+
+    assert grid.changed_since(since)
+    assert grid.cell_changed_since(cell, since)
+    assert not grid.cell_changed_since(grid[Point(0, 0)], since)
+    assert grid.candidate_changed_since(3, since)
+    assert not grid.candidate_changed_since(4, since)
+
+
+def test_region_iter_since_only_returns_changed_regions():
+    grid = Grid([[None] * 9] * 9)
+    since = grid.start_pass("rule")
+
+    assert len(list(grid.region_iter(since=since))) == 27
+
+    since = grid.start_pass("rule")
+    grid[Point(4, 1)].candidates -= {3}
+
+    assert list(grid.region_iter(since=since)) == [
+        grid.get_row_cells(1),
+        grid.get_column_cells(4),
+        grid.get_block_cells(Point(1, 0)),
+    ]
+
+
+def test_intersection_iter_since_only_returns_changed_intersections():
+    grid = Grid([[None] * 9] * 9)
+    grid.start_pass("rule")
+    since = grid.start_pass("rule")
+
+    assert list(grid.intersection_iter(since=since)) == []
+
+    grid[Point(0, 0)].candidates -= {3}
+
+    # Every intersection in block (0, 0), row 0 or column 0 is affected.
+    assert len(list(grid.intersection_iter(since=since))) == 10
+
+
+def test_from_line_notation_creates_grid_with_correct_values():
+    line = ".7.2.8.3148.3.7...9.3..4758.4687...389..3.56...792.81.754.12......7.31453.8.4.2.6"
+    grid = Grid.from_line_notation(line + "\n")
+
+    assert grid[Point(0, 0)].value is None
+    assert grid[Point(1, 0)].value == 7
+    assert grid[Point(0, 1)].value == 4
+    assert grid[Point(8, 8)].value == 6
+    assert grid[Point(0, 0)].candidates == {5, 6}
+
+
+def test_from_line_notation_with_invalid_length_raises_error():
+    with pytest.raises(ValueError) as err:
+        Grid.from_line_notation("1" * 80)
+    assert str(err.value) == "Grid must be 9x9."
+
+
+def test_to_line_notation_round_trips():
+    line = ".7.2.8.3148.3.7...9.3..4758.4687...389..3.56...792.81.754.12......7.31453.8.4.2.6"
+
+    assert Grid.from_line_notation(line).to_line_notation() == line
+
+
+def test_restore_returns_cells_to_snapshot():
+    grid = Grid.from_line_notation("1" + "." * 80)
+    snapshot = grid.snapshot()
+    cell = grid[Point(1, 0)]
+    assert cell is not None
+
+    cell.value = 2
+    grid[Point(2, 0)].mask = 0b100
+
+    grid.restore(snapshot)
+
+    assert grid.values == list(snapshot.values)
+    assert grid.masks == list(snapshot.masks)
+    assert cell.value is None
+    assert cell.candidates == set(range(2, 10))
+
+
+def test_from_snapshot_creates_grid_with_values_and_candidates():
+    grid = Grid.from_line_notation("1" + "." * 80)
+    grid[Point(1, 0)].mask = 0b110
+
+    restored = Grid.from_snapshot(grid.snapshot())
+
+    assert restored.values == grid.values
+    assert restored.masks == grid.masks
+    assert restored[Point(1, 0)].candidates == {2, 3}
+
+
+def test_restore_nested_snapshots_in_reverse_order():
+    grid = Grid.from_line_notation("." * 81)
+    outer = grid.snapshot()
+    grid[Point(0, 0)].value = 1
+    inner = grid.snapshot()
+    grid[Point(1, 1)].value = 2
+
+    grid.restore(inner)
+    assert grid.to_line_notation() == "1" + "." * 80
+
+    grid.restore(outer)
+    assert grid.to_line_notation() == "." * 81
+
+
+def test_restore_records_changed_cells_only():
+    grid = Grid.from_line_notation("." * 81)
+    snapshot = grid.snapshot()
+    grid[Point(4, 4)].mask = 0b11
+    grid.start_pass("rule")
+    since = grid.start_pass("rule")
+
+    grid.restore(snapshot)
+
+    assert grid.cell_changed_since(grid[Point(4, 4)], since)
+    assert not grid.cell_changed_since(grid[Point(0, 0)], since)
+    assert grid.candidate_changed_since(9, since)
+    assert not grid.candidate_changed_since(1, since)
+
+
+def test_rollback_undoes_changes_since_mark():
+    grid = Grid.from_line_notation("1" + "." * 80)
+    snapshot = grid.snapshot()
+    mark = grid.mark()
+
+    grid[Point(1, 0)].value = 2
+    grid[Point(2, 0)].candidates = {3, 4}
+    grid[Point(3, 0)].mask = 0b1000
+
+    grid.rollback(mark)
+
+    assert grid.snapshot() == snapshot
+    assert grid.mark() == mark
+
+
+def test_rollback_to_nested_marks():
+    grid = Grid.from_line_notation("." * 81)
+    outer = grid.mark()
+    grid[Point(0, 0)].value = 1
+    inner = grid.mark()
+    grid[Point(1, 1)].value = 2
+
+    grid.rollback(inner)
+    assert grid.to_line_notation() == "1" + "." * 80
+
+    grid.rollback(outer)
+    assert grid.to_line_notation() == "." * 81
+
+
+def test_rollback_undoes_restore():
+    grid = Grid.from_line_notation("." * 81)
+    snapshot = grid.snapshot()
+    grid[Point(0, 0)].value = 1
+    mark = grid.mark()
+
+    grid.restore(snapshot)
+    grid.rollback(mark)
+
+    assert grid.to_line_notation() == "1" + "." * 80
+
+
+def test_rollback_records_changed_cells():
+    grid = Grid.from_line_notation("." * 81)
+    mark = grid.mark()
+    grid[Point(4, 4)].mask = 0b11
+    grid.start_pass("rule")
+    since = grid.start_pass("rule")
+
+    grid.rollback(mark)
+
+    assert grid.cell_changed_since(grid[Point(4, 4)], since)
+    assert not grid.cell_changed_since(grid[Point(0, 0)], since)
+
+
+def test_rollback_rejects_mark_beyond_trail():
+    grid = Grid.from_line_notation("." * 81)
+
+    with pytest.raises(ValueError, match="Mark is not in the trail."):
+        grid.rollback(1)
+
+
+def test_changes_since_returns_current_state_of_changed_cells():
+    grid = Grid.from_line_notation("." * 81)
+    mark = grid.mark()
+
+    grid[Point(0, 0)].mask = 0b11
+    grid[Point(0, 0)].value = 2
+    grid[Point(8, 8)].mask = 0b1
+
+    assert grid.changes_since(mark) == {0: (2, 0), 80: (None, 0b1)}
+
+
+def test_unit_iter_since_only_returns_changed_units():
+    grid = Grid([[None] * 9] * 9)
+    grid.start_pass("rule")
+    since = grid.start_pass("rule")
+
+    assert list(grid.unit_iter()) == list(range(27))
+    assert list(grid.unit_iter(since)) == []
+
+    grid[Point(4, 4)].candidates -= {3}
+
+    # The row, column and block of the centre cell.
+    assert list(grid.unit_iter(since)) == [
+        unit for unit, cells in enumerate(UNITS) if 40 in cells
+    ]
+
+
+def test_contradicted_is_false_for_consistent_grid():
+    grid = Grid([[None] * 9] * 9)
+    grid[Point(0, 0)].value = 1
+
+    assert not grid.contradicted
+
+
+def test_contradicted_when_cell_has_no_candidates():
+    grid = Grid([[None] * 9] * 9)
+    mark = grid.mark()
+
+    grid[Point(4, 4)].mask = 0
+
+    assert grid.contradicted
+
+    grid.rollback(mark)
+
+    assert not grid.contradicted
+
+
+def test_contradicted_when_candidate_has_no_positions_in_unit():
+    grid = Grid([[None] * 9] * 9)
+    for x in range(9):
+        grid[Point(x, 0)].candidates -= {5}
+
+    assert grid.contradicted
+
+
+def test_positions_follow_candidate_changes():
+    grid = Grid([[None] * 9] * 9)
+    row = next(unit for unit, cells in enumerate(UNITS) if cells == tuple(range(9)))
+    mark = grid.mark()
+
+    grid[Point(2, 0)].candidates -= {5}
+    grid[Point(7, 0)].value = 5
+
+    assert grid.positions[row * 9 + 4] == 0b101111011
+    assert grid.positions[row * 9 + 0] == 0b101111111
+
+    grid.rollback(mark)
+
+    assert grid.positions == [0b111111111] * 243
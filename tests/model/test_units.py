@@ -0,0 +1,80 @@
+from model.units import (
+    BLOCKS,
+    CELL_UNITS,
+    COLUMN_SEGMENTS,
+    COLUMNS,
+    INTERSECTIONS,
+    PEERS,
+    ROW_SEGMENTS,
+    ROWS,
+    UNITS,
+)
+
+
+def test_rows_columns_and_blocks_cover_the_grid():
+    for units in (ROWS, COLUMNS, BLOCKS):
+        assert len(units) == 9
+        assert sorted(i for unit in units for i in unit) == list(range(81))
+
+
+def test_blocks_are_indexed_by_block_row_then_block_column():
+    assert BLOCKS[0] == (0, 1, 2, 9, 10, 11, 18, 19, 20)
+    assert BLOCKS[5] == (33, 34, 35, 42, 43, 44, 51, 52, 53)
+
+
+def test_units_alternate_rows_and_columns_then_blocks():
+    assert len(UNITS) == 27
+    assert UNITS[0] == ROWS[0]
+    assert UNITS[1] == COLUMNS[0]
+    assert UNITS[16] == ROWS[8]
+    assert UNITS[17] == COLUMNS[8]
+    assert UNITS[18] == BLOCKS[0]
+    assert UNITS[19] == BLOCKS[3]  # Block at Point(0, 1)
+
+
+def test_cell_units_contain_the_cell():
+    for index in range(81):
+        assert len(CELL_UNITS[index]) == 3
+        for unit in CELL_UNITS[index]:
+            assert index in UNITS[unit]
+
+
+def test_each_cell_has_twenty_peers():
+    for index in range(81):
+        assert len(PEERS[index]) == 20
+        assert index not in PEERS[index]
+
+    assert set(PEERS[0]) == {
+        1,
+        2,
+        3,
+        4,
+        5,
+        6,
+        7,
+        8,
+        9,
+        18,
+        27,
+        36,
+        45,
+        54,
+        63,
+        72,
+    }.union({10, 11, 19, 20})
+
+
+def test_segments_split_lines_into_thirds():
+    assert ROW_SEGMENTS[1][2] == (15, 16, 17)
+    assert COLUMN_SEGMENTS[4][1] == (31, 40, 49)
+
+
+def test_intersections_partition_block_and_line():
+    assert len(INTERSECTIONS) == 54
+
+    for segment, block, line in INTERSECTIONS:
+        assert len(segment) == 3
+        assert len(block) == 6
+        assert len(line) == 6
+        assert tuple(sorted(segment + block)) in BLOCKS
+        assert tuple(sorted(segment + line)) in ROWS + COLUMNS
@@ -0,0 +1,29 @@
+from model import Grid
+from rules.backtracking_rule import apply_backtracking_rule
+
+
+def test_apply_backtracking_rule_solves_all_cells():
+    grid = Grid.from_line_notation(
+        "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4.."
+    )
+
+    assert apply_backtracking_rule(grid) is True
+
+    assert grid.to_line_notation() == (
+        "812753649943682175675491283154237896369845721287169534521974368438526917796318452"
+    )
+    assert all(cell.candidates == set() for cell in grid)
+
+
+def test_apply_backtracking_rule_returns_false_when_unsolvable():
+    grid = Grid.from_line_notation("11" + "." * 79)
+
+    assert apply_backtracking_rule(grid) is False
+
+
+def test_apply_backtracking_rule_returns_false_when_grid_is_complete():
+    grid = Grid.from_line_notation(
+        "812753649943682175675491283154237896369845721287169534521974368438526917796318452"
+    )
+
+    assert apply_backtracking_rule(grid) is False
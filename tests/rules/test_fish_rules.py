@@ -1,5 +1,5 @@
 from model import Grid, Point
-from rules.fish_rules import apply_fish_rule
+from rules.fish_rules import apply_finned_fish_rule, apply_fish_rule
 
 # Note that in these tests the candidates are forced on the cells
 # to ensure that the rules can be applied. In a real Sudoku puzzle,
@@ -121,6 +121,23 @@ class TestSwordfishRules:
 
         assert apply_fish_rule(grid, size=3) is True
 
+    def test_fish_with_rows_missing_some_cover_columns_removes_col_candidates(self):
+        grid = Grid.from_rows_notation(["." * 9] * 9)
+
+        # Set candidates for a swordfish where each row only covers two of the columns.
+        for y, columns in [(1, [0, 4]), (4, [4, 6]), (6, [0, 6])]:
+            for x in range(9):
+                if x not in columns:
+                    grid[Point(x, y)].candidates -= {5}
+
+        apply_fish_rule(grid, size=3)
+
+        # Candidate 5 should no longer be in other rows of columns 0, 4 and 6.
+        for x in [0, 4, 6]:
+            for y in range(9):
+                if y not in [1, 4, 6]:
+                    assert 5 not in grid[Point(x, y)].candidates
+
     def test_returns_false_when_unable_to_update_candidates(self):
         grid = Grid.from_rows_notation(["." * 9] * 9)
 
@@ -211,3 +228,99 @@ class TestJellyfishRules:
         )
 
         assert apply_fish_rule(grid, size=4) is False
+
+
+class TestFinnedFishRules:
+    def test_finned_x_wing_removes_candidates_seen_by_fin(self):
+        grid = Grid.from_rows_notation(["." * 9] * 9)
+
+        # Set candidates for an X-Wing on rows 1 and 4 in columns 2 and 6,
+        # with a fin at column 7 of row 4 in the same block as column 6.
+        for y, columns in [(1, [2, 6]), (4, [2, 6, 7])]:
+            for x in range(9):
+                if x not in columns:
+                    grid[Point(x, y)].candidates -= {3}
+
+        assert apply_finned_fish_rule(grid, size=2) is True
+
+        # Candidate 3 should only be removed from column 6 within the block of the fin.
+        for y in range(9):
+            if y in [3, 5]:
+                assert 3 not in grid[Point(6, y)].candidates
+            else:
+                assert 3 in grid[Point(6, y)].candidates
+            if y not in [1, 4]:
+                assert 3 in grid[Point(2, y)].candidates
+
+    def test_sashimi_x_wing_removes_candidates_seen_by_fin(self):
+        grid = Grid.from_rows_notation(["." * 9] * 9)
+
+        # Set candidates for a sashimi X-Wing on columns 0 and 5 in rows 1 and 4,
+        # where column 5 has no candidate in row 4, only fins in rows 3 and 5.
+        for x, rows in [(0, [1, 4]), (5, [1, 3, 5])]:
+            for y in range(9):
+                if y not in rows:
+                    grid[Point(x, y)].candidates -= {7}
+
+        assert apply_finned_fish_rule(grid, size=2) is True
+
+        # Candidate 7 should only be removed from row 4 within the block of the fins.
+        for x in range(1, 9):
+            if x != 5:
+                assert (7 in grid[Point(x, 4)].candidates) == (x not in [3, 4])
+
+    def test_fins_in_different_blocks_do_not_remove_candidates(self):
+        grid = Grid.from_rows_notation(["." * 9] * 9)
+
+        # Set candidates for an X-Wing on rows 1 and 4 in columns 2 and 6,
+        # with fins at column 0 of row 1 and column 7 of row 4.
+        for y, columns in [(1, [0, 2, 6]), (4, [2, 6, 7])]:
+            for x in range(9):
+                if x not in columns:
+                    grid[Point(x, y)].candidates -= {3}
+
+        assert apply_finned_fish_rule(grid, size=2) is False
+
+    def test_finned_swordfish_removes_candidates_seen_by_fin(self):
+        grid = Grid.from_rows_notation(["." * 9] * 9)
+
+        # Set candidates for a swordfish on rows 0, 3 and 7 in columns 1, 4 and 8,
+        # with a fin at column 5 of row 3.
+        for y, columns in [(0, [1, 4]), (3, [4, 5, 8]), (7, [1, 8])]:
+            for x in range(9):
+                if x not in columns:
+                    grid[Point(x, y)].candidates -= {9}
+
+        assert apply_finned_fish_rule(grid, size=3) is True
+
+        # Candidate 9 should only be removed from column 4 within the block of the fin.
+        for y in range(9):
+            if y not in [0, 3, 7]:
+                assert (9 in grid[Point(4, y)].candidates) == (y not in [4, 5])
+
+    def test_returns_false_for_basic_fish(self):
+        grid = Grid.from_rows_notation(["." * 9] * 9)
+
+        for y in [3, 5]:
+            for x in range(9):
+                if x not in [2, 7]:
+                    grid[Point(x, y)].candidates -= {8}
+
+        assert apply_finned_fish_rule(grid, size=2) is False
+
+    def test_returns_false_when_grid_is_complete(self):
+        grid = Grid.from_rows_notation(
+            [
+                "123456789",
+                "456789123",
+                "789123456",
+                "234567891",
+                "567891234",
+                "891234567",
+                "345678912",
+                "678912345",
+                "912345678",
+            ]
+        )
+
+        assert apply_finned_fish_rule(grid, size=2) is False
@@ -2,6 +2,7 @@ from model import Grid, Point
 from rules.hidden_set_rules import (
     apply_hidden_single_rule,
     apply_hidden_pairs_rule,
+    apply_hidden_quads_rule,
     apply_hidden_triples_rule,
 )
 
@@ -413,3 +414,35 @@ def test_apply_hidden_triples_rule_returns_false_when_grid_is_complete():
     )
 
     assert apply_hidden_triples_rule(grid) is False
+
+
+def test_apply_hidden_quads_rule_reduces_candidates_in_row():
+    grid = Grid.from_rows_notation(["." * 9] * 9)
+    # Candidates 1 to 4 can only go in the first four cells of the top row.
+    for x in range(4, 9):
+        grid[Point(x, 0)].candidates = {5, 6, 7, 8, 9}
+
+    assert apply_hidden_quads_rule(grid) is True
+
+    for x in range(4):
+        assert grid[Point(x, 0)].candidates == {1, 2, 3, 4}
+    assert grid[Point(0, 1)].candidates == set(range(1, 10))
+
+
+def test_apply_hidden_quads_rule_returns_false_when_unable_to_update_candidates():
+    grid = Grid.from_rows_notation(["." * 9] * 9)
+
+    assert apply_hidden_quads_rule(grid) is False
+
+
+def test_apply_hidden_single_rule_finds_singles_created_after_previous_pass():
+    grid = Grid.from_rows_notation(["." * 9] * 9)
+
+    assert apply_hidden_single_rule(grid) is False
+
+    for x in range(1, 9):
+        grid[Point(x, 4)].candidates -= {6}
+
+    assert apply_hidden_single_rule(grid) is True
+    assert grid[Point(0, 4)].candidates == {6}
+    assert apply_hidden_single_rule(grid) is False
@@ -1,5 +1,10 @@
-from model import Grid, Point
-from rules.naked_set_rules import apply_naked_pairs_rule, apply_naked_triples_rule
+from model import ALL_CANDIDATES_MASK, Grid, Point, mask_from_candidates
+from rules.naked_set_rules import (
+    _naked_set_iter,
+    apply_naked_pairs_rule,
+    apply_naked_quads_rule,
+    apply_naked_triples_rule,
+)
 
 
 def test_apply_naked_pairs_rule_reduces_candidates_in_block():
@@ -362,3 +367,51 @@ def test_apply_naked_triples_rule_returns_false_when_grid_is_complete():
     )
 
     assert apply_naked_triples_rule(grid) is False
+
+
+def test_apply_naked_pairs_rule_finds_pairs_created_after_previous_pass():
+    grid = Grid.from_rows_notation(["." * 9] * 9)
+
+    assert apply_naked_pairs_rule(grid) is False
+
+    grid[Point(0, 0)].candidates = {3, 7}
+    grid[Point(0, 5)].candidates = {3, 7}
+
+    assert apply_naked_pairs_rule(grid) is True
+    assert 3 not in grid[Point(0, 8)].candidates
+    assert 7 not in grid[Point(0, 2)].candidates
+    assert apply_naked_pairs_rule(grid) is False
+
+
+def test_apply_naked_quads_rule_reduces_candidates_in_row():
+    grid = Grid([[None] * 9] * 9)
+    for x, candidates in enumerate([{1, 2}, {2, 3}, {3, 4}, {1, 4}]):
+        grid[Point(x, 0)].candidates = candidates
+
+    assert apply_naked_quads_rule(grid)
+
+    for x in range(4, 9):
+        assert grid[Point(x, 0)].candidates == {5, 6, 7, 8, 9}
+    assert grid[Point(0, 1)].candidates == set(range(1, 10))
+
+
+def test_apply_naked_quads_rule_returns_false_when_unable_to_update_candidates():
+    grid = Grid([[None] * 9] * 9)
+
+    assert not apply_naked_quads_rule(grid)
+
+
+def test_naked_set_iter_finds_digits_of_each_set():
+    masks = [
+        mask_from_candidates(candidates)
+        for candidates in [{1, 5}, {5, 9}, {1, 9}, {2, 3}, {2, 3}]
+    ] + [ALL_CANDIDATES_MASK] * 4
+
+    assert list(_naked_set_iter(masks, 2)) == [mask_from_candidates({2, 3})]
+    assert list(_naked_set_iter(masks, 3)) == [mask_from_candidates({1, 5, 9})]
+
+
+def test_naked_set_iter_ignores_more_cells_than_digits():
+    masks = [mask_from_candidates({4, 6})] * 3 + [ALL_CANDIDATES_MASK] * 6
+
+    assert list(_naked_set_iter(masks, 2)) == []
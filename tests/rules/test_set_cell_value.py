@@ -1,4 +1,5 @@
-from model import Grid, Point
+import pytest
+from model import ALL_CANDIDATES_MASK, Grid, Point
 from rules.set_cell_value import set_cell_value
 
 
@@ -58,3 +59,59 @@ def test_set_cell_updates_neighbours_candidates():
 
     # Unrelated cell should still have 5 as a candidate.
     assert 5 in unrelated_cell.candidates
+
+
+def test_rollback_undoes_value_and_neighbour_eliminations():
+    grid = Grid([[None] * 9] * 9)
+    mark = grid.mark()
+    cell = grid[Point(4, 4)]
+
+    set_cell_value(grid, cell, 5)
+    assert len(grid.changes_since(mark)) == 21
+
+    grid.rollback(mark)
+
+    assert cell.value is None
+    assert all(mask == ALL_CANDIDATES_MASK for mask in grid.masks)
+
+
+def test_set_cell_value_places_naked_singles_it_creates():
+    grid = Grid.from_line_notation("1234567.." + "." * 72)
+
+    assert set_cell_value(grid, grid[Point(7, 0)], 8) is True
+
+    assert grid[Point(8, 0)].value == 9
+    assert 9 not in grid[Point(8, 1)].candidates
+
+
+def test_set_cell_value_places_hidden_singles_it_creates():
+    grid = Grid([[None] * 9] * 9)
+    for x in range(1, 8):
+        grid[Point(x, 4)].candidates -= {6}
+
+    assert set_cell_value(grid, grid[Point(8, 0)], 6) is True
+
+    # 6 could only go in the first or last cell of row 4, and the last is now ruled out.
+    assert grid[Point(0, 4)].value == 6
+
+
+def test_set_cell_value_returns_false_when_a_cell_has_no_candidates():
+    grid = Grid.from_line_notation("1234567.." + "." * 72)
+    grid[Point(8, 0)].candidates = {9}
+
+    assert set_cell_value(grid, grid[Point(7, 0)], 9) is False
+
+
+def test_set_cell_value_returns_false_when_a_value_has_nowhere_to_go():
+    grid = Grid([[None] * 9] * 9)
+    for x in range(1, 9):
+        grid[Point(x, 4)].candidates -= {6}
+
+    assert set_cell_value(grid, grid[Point(0, 0)], 6) is False
+
+
+def test_set_cell_value_rejects_cell_with_a_value():
+    grid = Grid.from_line_notation("1" + "." * 80)
+
+    with pytest.raises(ValueError, match="Cannot set value"):
+        set_cell_value(grid, grid[Point(0, 0)], 2)
@@ -0,0 +1,118 @@
+from model import Grid, Point
+import pytest
+from search import count_solutions, find_solution
+
+HARD_LINE = (
+    "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4.."
+)
+HARD_SOLUTION = (
+    "812753649943682175675491283154237896369845721287169534521974368438526917796318452"
+)
+
+
+def test_find_solution_solves_hard_puzzle():
+    grid = Grid.from_line_notation(HARD_LINE)
+
+    solution = find_solution(grid)
+
+    assert "".join(map(str, solution)) == HARD_SOLUTION
+
+
+def test_find_solution_does_not_modify_grid():
+    grid = Grid.from_line_notation(HARD_LINE)
+
+    find_solution(grid)
+
+    assert grid.to_line_notation() == HARD_LINE
+
+
+def test_find_solution_solves_empty_grid():
+    grid = Grid([[None] * 9] * 9)
+
+    solution = find_solution(grid)
+
+    assert solution is not None
+    for index in range(81):
+        for other in range(81):
+            same_row = index // 9 == other // 9
+            same_column = index % 9 == other % 9
+            same_block = (index // 27, index % 9 // 3) == (other // 27, other % 9 // 3)
+            if index != other and (same_row or same_column or same_block):
+                assert solution[index] != solution[other]
+
+
+def test_find_solution_uses_reduced_candidates():
+    grid = Grid.from_line_notation(HARD_LINE)
+
+    # Remove the correct digit for the first cell from its candidates.
+    grid[Point(1, 0)].candidates -= {1}
+
+    assert find_solution(grid) is None
+
+
+def test_find_solution_gives_up_once_deadline_has_passed():
+    grid = Grid.from_line_notation(HARD_LINE)
+
+    assert find_solution(grid, deadline=0) is None
+    assert find_solution(grid, deadline=None) is not None
+
+
+def test_find_solution_returns_none_for_conflicting_values():
+    grid = Grid.from_line_notation("11" + "." * 79)
+
+    assert find_solution(grid) is None
+
+
+def test_find_solution_returns_none_when_a_digit_has_no_place():
+    grid = Grid([[None] * 9] * 9)
+
+    # 9 cannot go anywhere in the first row.
+    for x in range(9):
+        grid[Point(x, 0)].candidates -= {9}
+
+    assert find_solution(grid) is None
+
+
+def test_count_solutions_returns_one_for_unique_puzzle():
+    grid = Grid.from_line_notation(HARD_LINE)
+
+    assert count_solutions(grid) == 1
+
+
+def test_count_solutions_stops_at_limit():
+    grid = Grid([[None] * 9] * 9)
+
+    assert count_solutions(grid) == 2
+    assert count_solutions(grid, limit=5) == 5
+
+
+def test_count_solutions_returns_zero_for_conflicting_values():
+    grid = Grid.from_line_notation("11" + "." * 79)
+
+    assert count_solutions(grid) == 0
+
+
+def test_count_solutions_returns_zero_for_unsolvable_puzzle():
+    # The first cell can only be 9, but 9 is already in its column.
+    grid = Grid.from_line_notation(".12345678" + "9........" + "." * 63)
+
+    assert count_solutions(grid) == 0
+
+
+def test_count_solutions_counts_two_solutions_of_deadly_pattern():
+    # Cells (2, 0), (5, 0), (2, 1) and (5, 1) hold 2 and 3 in a rectangle,
+    # so emptying them leaves two solutions with the digits swapped.
+    line = list(HARD_SOLUTION)
+    for x, y in [(2, 0), (5, 0), (2, 1), (5, 1)]:
+        line[y * 9 + x] = "."
+    grid = Grid.from_line_notation("".join(line))
+
+    assert count_solutions(grid, limit=10) == 2
+
+
+def test_count_solutions_rejects_invalid_limit():
+    grid = Grid([[None] * 9] * 9)
+
+    with pytest.raises(ValueError) as err:
+        count_solutions(grid, limit=0)
+    assert str(err.value) == "Limit must be at least 1."
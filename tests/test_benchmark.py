@@ -0,0 +1,99 @@
+import pytest
+from benchmark import (
+    PuzzleBenchmark,
+    benchmark_directory,
+    benchmark_puzzle,
+    find_regressions,
+    format_results,
+    load_baseline,
+    save_baseline,
+)
+
+SOLVABLE_ROWS = [
+    ".7.2.8.31",
+    "48.3.7...",
+    "9.3..4758",
+    ".4687...3",
+    "89..3.56.",
+    "..792.81.",
+    "754.12...",
+    "...7.3145",
+    "3.8.4.2.6",
+]
+
+
+def _result(name: str, median_seconds: float) -> PuzzleBenchmark:
+    return PuzzleBenchmark(
+        name=name,
+        solved=True,
+        median_seconds=median_seconds,
+        p95_seconds=median_seconds,
+        peak_memory_bytes=1024,
+        rule_applications={"single_candidate": 3},
+    )
+
+
+def test_benchmark_puzzle_reports_solved_puzzle():
+    result = benchmark_puzzle("easy", SOLVABLE_ROWS, repeat=3)
+
+    assert result.name == "easy"
+    assert result.solved
+
+
+def test_benchmark_puzzle_reports_ordered_timings():
+    result = benchmark_puzzle("easy", SOLVABLE_ROWS, repeat=3)
+
+    assert 0 < result.median_seconds <= result.p95_seconds
+
+
+def test_benchmark_puzzle_reports_memory_and_rule_applications():
+    result = benchmark_puzzle("easy", SOLVABLE_ROWS, repeat=1)
+
+    assert result.peak_memory_bytes > 0
+    assert result.rule_applications["single_candidate"] > 0
+
+
+def test_benchmark_puzzle_with_no_repeats_raises_value_error():
+    with pytest.raises(ValueError, match="Repeat must be at least 1."):
+        benchmark_puzzle("easy", SOLVABLE_ROWS, repeat=0)
+
+
+def test_benchmark_directory_benchmarks_puzzles_in_name_order(tmp_path):
+    for name in ("b", "a"):
+        (tmp_path / f"{name}.txt").write_text("\n".join(SOLVABLE_ROWS))
+    (tmp_path / "notes.md").write_text("Not a puzzle.")
+
+    results = benchmark_directory(tmp_path, repeat=1)
+
+    assert [result.name for result in results] == ["a", "b"]
+
+
+def test_save_baseline_round_trips_through_load_baseline(tmp_path):
+    results = [_result("a", 0.01), _result("b", 0.02)]
+    path = tmp_path / "baseline.json"
+
+    save_baseline(results, path)
+
+    assert load_baseline(path) == results
+
+
+def test_find_regressions_reports_puzzles_slower_than_threshold():
+    baseline = [_result("a", 0.010), _result("b", 0.010)]
+    results = [_result("a", 0.0105), _result("b", 0.015)]
+
+    regressions = find_regressions(results, baseline, threshold=0.1)
+
+    assert [regression.name for regression in regressions] == ["b"]
+    assert regressions[0].slowdown == pytest.approx(0.5)
+
+
+def test_find_regressions_ignores_puzzles_missing_from_baseline():
+    regressions = find_regressions([_result("new", 1.0)], [_result("a", 0.01)])
+
+    assert regressions == []
+
+
+def test_format_results_totals_rule_applications():
+    table = format_results([_result("a", 0.01), _result("b", 0.02)])
+
+    assert "Rule applications: single_candidate=6" in table
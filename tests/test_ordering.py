@@ -0,0 +1,35 @@
+import pytest
+from ordering import AdaptiveOrdering
+
+
+def test_order_keeps_given_order_before_any_attempts():
+    ordering = AdaptiveOrdering()
+
+    assert ordering.order(["b", "a", "c"]) == ["b", "a", "c"]
+
+
+def test_order_promotes_rules_eliminating_most_candidates_per_second():
+    ordering = AdaptiveOrdering()
+    ordering.rule_attempted("slow", True, 0.5, 2)
+    ordering.rule_attempted("fast", True, 0.01, 20)
+    ordering.rule_attempted("idle", False, 0.2, 0)
+
+    assert ordering.order(["idle", "slow", "fast"]) == ["fast", "slow", "idle"]
+
+
+@pytest.mark.parametrize("decay, expected", [(1.0, ["a", "b"]), (0.1, ["b", "a"])])
+def test_order_follows_recent_attempts_when_decaying(decay, expected):
+    ordering = AdaptiveOrdering(decay=decay)
+    ordering.rule_attempted("a", True, 0.01, 100)
+    ordering.rule_attempted("b", True, 0.1, 1)
+
+    ordering.order(["a", "b"])
+    ordering.rule_attempted("a", False, 0.1, 0)
+    ordering.rule_attempted("b", True, 0.01, 10)
+
+    assert ordering.order(["a", "b"]) == expected
+
+
+def test_init_rejects_decay_out_of_range():
+    with pytest.raises(ValueError, match="Decay"):
+        AdaptiveOrdering(decay=0)
@@ -0,0 +1,145 @@
+import io
+from itertools import count, islice
+
+import pytest
+from model import Grid
+from pipeline import (
+    EXHAUSTED,
+    INVALID,
+    SOLVED,
+    UNSOLVED,
+    PuzzleRecord,
+    default_stages,
+    emit,
+    final_status,
+    parse,
+    run_pipeline,
+    skip_blank_and_comments,
+    solve,
+    validate,
+)
+from profiling import RuleProfiler
+from runner import apply_batch_solver
+from solver import Budget, Solver
+
+SOLVABLE_LINE = (
+    ".7.2.8.3148.3.7...9.3..4758.4687...389..3.56...792.81.754.12......7.31453.8.4.2.6"
+)
+SOLVABLE_ROWS = "\n".join(SOLVABLE_LINE[i : i + 9] for i in range(0, 81, 9))
+CONFLICTING_LINE = "11" + "." * 79
+
+
+def test_run_pipeline_reports_status_of_each_puzzle_in_order():
+    records = run_pipeline([SOLVABLE_LINE, "." * 81, CONFLICTING_LINE, "123"])
+
+    assert [record.status for record in records] == [
+        SOLVED,
+        UNSOLVED,
+        INVALID,
+        INVALID,
+    ]
+
+
+def test_run_pipeline_skips_blank_and_comment_lines_like_batch_runner():
+    puzzles = ["# Puzzles\n", f"{SOLVABLE_LINE}\n", "\n", "123\n"]
+    output = io.StringIO()
+    batch_output = io.StringIO()
+
+    records = list(run_pipeline(puzzles, [*default_stages(), emit(output)]))
+    apply_batch_solver(puzzles, batch_output)
+
+    assert [record.index for record in records] == [1, 3]
+    assert output.getvalue() == batch_output.getvalue()
+
+
+def test_skip_blank_and_comments_passes_on_records_with_a_status():
+    record = PuzzleRecord(index=0, puzzle="", status=SOLVED)
+
+    assert list(skip_blank_and_comments(iter([record]))) == [record]
+
+
+def test_run_pipeline_accepts_rows_notation():
+    (record,) = run_pipeline([SOLVABLE_ROWS])
+
+    assert record.status == SOLVED
+    assert record.grid is not None
+    assert record.grid.to_line_notation() == (
+        "675298431481357692923164758146875923892431567537926814754612389269783145318549276"
+    )
+
+
+def test_run_pipeline_is_lazy():
+    puzzles = (SOLVABLE_LINE for _ in count())
+
+    records = list(islice(run_pipeline(puzzles), 3))
+
+    assert [record.index for record in records] == [0, 1, 2]
+
+
+def test_emit_writes_result_line_for_each_record():
+    output = io.StringIO()
+
+    list(run_pipeline([CONFLICTING_LINE, "123"], [parse, validate, emit(output)]))
+
+    assert output.getvalue() == f"{CONFLICTING_LINE} {INVALID}\n123 {INVALID}\n"
+
+
+def test_stages_pass_on_records_finished_by_earlier_stage():
+    def cache(records):
+        for record in records:
+            if record.puzzle == SOLVABLE_LINE:
+                record.status = SOLVED
+            yield record
+
+    (record,) = run_pipeline([SOLVABLE_LINE], [cache, *default_stages()])
+
+    assert record.status == SOLVED
+    assert record.grid is None
+
+
+def test_solve_stage_reports_rules_to_observer():
+    profiler = RuleProfiler()
+
+    list(run_pipeline([SOLVABLE_LINE], [parse, validate, solve(observer=profiler)]))
+
+    assert profiler.rules["single_candidate"].hits > 0
+
+
+def test_solve_stage_marks_records_exhausted_by_budget():
+    stage = solve(budget=Budget(applications=0))
+
+    (record,) = run_pipeline([SOLVABLE_LINE], [parse, validate, stage])
+
+    assert record.status == EXHAUSTED
+    assert record.to_line() == f"{SOLVABLE_LINE} {EXHAUSTED}"
+
+
+def test_solve_stage_only_tries_selected_rules():
+    profiler = RuleProfiler()
+    stage = solve(observer=profiler, rules="singles-only", enabled={"x_wing": True})
+
+    list(run_pipeline(["." * 81], [parse, validate, stage]))
+
+    assert set(profiler.rules) == {"single_candidate", "hidden_single", "x_wing"}
+
+
+@pytest.mark.parametrize(
+    "line, budget, status",
+    [
+        (SOLVABLE_LINE, None, SOLVED),
+        ("12345678." + "........9" + "." * 63, None, INVALID),
+        (SOLVABLE_LINE, Budget(applications=0), EXHAUSTED),
+        ("." * 81, None, UNSOLVED),
+    ],
+)
+def test_final_status_describes_grid_after_solving(line, budget, status):
+    solver = Solver(Grid.from_line_notation(line), budget=budget)
+    solver.solve()
+
+    assert final_status(solver) == status
+
+
+def test_to_line_uses_puzzle_when_grid_is_missing():
+    record = PuzzleRecord(index=0, puzzle="123\n", status=INVALID)
+
+    assert record.to_line() == f"123 {INVALID}"
@@ -0,0 +1,46 @@
+import io
+import json
+
+from profiling import RuleProfiler, RuleStats
+
+
+def test_rule_attempted_totals_attempts_by_rule():
+    profiler = RuleProfiler()
+
+    profiler.rule_attempted("naked_pairs", False, 0.25, 0)
+    profiler.rule_attempted("naked_pairs", True, 0.5, 3)
+    profiler.rule_attempted("x_wing", True, 1.0, 2)
+
+    assert profiler.rules == {
+        "naked_pairs": RuleStats(calls=2, hits=1, seconds=0.75, eliminated=3),
+        "x_wing": RuleStats(calls=1, hits=1, seconds=1.0, eliminated=2),
+    }
+
+
+def test_merge_adds_totals_of_other_profiler():
+    profiler = RuleProfiler()
+    profiler.rule_attempted("naked_pairs", True, 0.5, 3)
+    other = RuleProfiler()
+    other.rule_attempted("naked_pairs", False, 0.25, 0)
+    other.rule_attempted("x_wing", True, 1.0, 2)
+
+    profiler.merge(other)
+
+    assert profiler.rules == {
+        "naked_pairs": RuleStats(calls=2, hits=1, seconds=0.75, eliminated=3),
+        "x_wing": RuleStats(calls=1, hits=1, seconds=1.0, eliminated=2),
+    }
+
+
+def test_write_json_reports_totals_by_rule():
+    profiler = RuleProfiler()
+    profiler.rule_attempted("naked_pairs", True, 0.5, 3)
+    output = io.StringIO()
+
+    profiler.write_json(output)
+
+    assert json.loads(output.getvalue()) == {
+        "rules": {
+            "naked_pairs": {"calls": 1, "hits": 1, "seconds": 0.5, "eliminated": 3}
+        }
+    }
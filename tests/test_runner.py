@@ -1,5 +1,20 @@
+import io
+from unittest.mock import patch
+
+import pytest
+from caching import ResultStore
 from model import Grid
-from runner import apply_solver
+from profiling import RuleProfiler
+from runner import apply_batch_solver, apply_solver, run, run_batch, solve_line
+from solver import Budget, Solver
+from utils import MASKS, write_grids, write_lines
+
+SOLVABLE_LINE = (
+    ".7.2.8.3148.3.7...9.3..4758.4687...389..3.56...792.81.754.12......7.31453.8.4.2.6"
+)
+HARD_LINE = (
+    "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4.."
+)
 
 
 def test_apply_solver_with_solvable_puzzle_solves_grid():
@@ -59,7 +74,61 @@ def test_apply_solver_with_invalid_grid_returns_illegal_message():
 
     result = apply_solver(grid)
 
-    assert result == "The input grid contains illegal starting values."
+    assert result == (
+        "The puzzle is invalid. Either the input grid contains illegal starting "
+        "values or they leave the puzzle with no solution."
+    )
+
+
+def test_apply_solver_with_contradictory_grid_returns_invalid_message():
+    # The last cell of the first row has no candidates, though no values conflict.
+    grid = Grid.from_line_notation("12345678." + "........9" + "." * 63)
+
+    result = apply_solver(grid)
+
+    assert result.startswith("The puzzle is invalid.")
+
+
+def test_apply_solver_with_fallback_returns_invalid_message_when_search_finds_no_solution():
+    # HARD_LINE with a wrong digit the rules stall on without reaching a contradiction.
+    grid = Grid.from_line_notation("82" + HARD_LINE[2:])
+
+    assert apply_solver(Grid.from_line_notation("82" + HARD_LINE[2:])).startswith(
+        "The puzzle could not be solved."
+    )
+    assert apply_solver(grid, fallback=True).startswith("The puzzle is invalid.")
+
+
+def test_solve_line_returns_partial_grid_when_budget_is_exhausted(tmp_path):
+    with ResultStore(str(tmp_path / "results.db")) as store:
+        result = solve_line(SOLVABLE_LINE, store=store, budget=Budget(applications=0))
+
+        assert result == f"{SOLVABLE_LINE} exhausted"
+        assert store.get(SOLVABLE_LINE) is None
+
+
+def test_apply_solver_reports_exhausted_budget():
+    grid = Grid.from_line_notation(SOLVABLE_LINE)
+
+    result = apply_solver(grid, budget=Budget(seconds=0))
+
+    assert result.startswith("The solver ran out of time")
+
+
+def test_solve_line_returns_invalid_status_for_contradictory_puzzle():
+    line = "12345678." + "........9" + "." * 63
+
+    assert solve_line(line) == f"{line} invalid"
+
+
+def test_solve_line_reports_grid_without_conflicts_for_contradictory_puzzle():
+    # intermediate_02 given one wrong digit, which the single candidate rule runs into.
+    line = ".34.2..98...987......3............7....8.9..4.4....653....4.7..36.7.5..2.....2..6"
+
+    grid, status = solve_line(line).split()
+
+    assert status == "invalid"
+    assert Solver(Grid.from_line_notation(grid)).is_valid()
 
 
 def test_apply_solver_with_unsolvable_puzzle_returns_unsolved_message():
@@ -83,3 +152,193 @@ def test_apply_solver_with_unsolvable_puzzle_returns_unsolved_message():
         "The puzzle could not be solved. Either it's unsolvable or it requires "
         "more advanced techniques than are implemented in this solver."
     )
+
+
+def test_solve_line_returns_solution_and_solved_status():
+    result = solve_line(SOLVABLE_LINE + "\n")
+
+    solution, status = result.split(" ")
+    assert status == "solved"
+    assert len(solution) == 81
+    assert "." not in solution
+    assert all(a == b for a, b in zip(SOLVABLE_LINE, solution) if a != ".")
+
+
+def test_solve_line_returns_unsolved_status_for_empty_grid():
+    assert solve_line("." * 81) == "." * 81 + " unsolved"
+
+
+def test_solve_line_returns_invalid_status_for_conflicting_values():
+    line = "11" + "." * 79
+
+    assert solve_line(line) == line + " invalid"
+
+
+def test_solve_line_returns_invalid_status_for_wrong_length():
+    assert solve_line("123") == "123 invalid"
+
+
+def test_apply_batch_solver_writes_result_per_puzzle():
+    lines = ["# A comment\n", SOLVABLE_LINE + "\n", "\n", "." * 81 + "\n"]
+    output = io.StringIO()
+
+    summary = apply_batch_solver(lines, output)
+
+    results = output.getvalue().splitlines()
+    assert len(results) == 2
+    assert results[0].endswith(" solved")
+    assert results[1].endswith(" unsolved")
+    assert summary.total == 2
+    assert summary.solved == 1
+    assert summary.seconds > 0
+    assert summary.puzzles_per_second == 2 / summary.seconds
+
+
+def test_apply_batch_solver_with_workers_matches_serial_results_in_order():
+    lines = [SOLVABLE_LINE, "." * 81, "11" + "." * 79] * 5
+    serial_output = io.StringIO()
+    parallel_output = io.StringIO()
+
+    serial_summary = apply_batch_solver(lines, serial_output)
+    parallel_summary = apply_batch_solver(
+        lines, parallel_output, workers=2, chunk_size=2
+    )
+
+    assert parallel_output.getvalue() == serial_output.getvalue()
+    assert parallel_summary.total == serial_summary.total == 15
+    assert parallel_summary.solved == serial_summary.solved == 5
+
+
+def test_apply_batch_solver_with_workers_merges_profiles_of_every_chunk():
+    lines = [SOLVABLE_LINE] * 4
+    serial_profiler = RuleProfiler()
+    parallel_profiler = RuleProfiler()
+
+    apply_batch_solver(lines, io.StringIO(), profiler=serial_profiler)
+    apply_batch_solver(
+        lines, io.StringIO(), workers=2, chunk_size=1, profiler=parallel_profiler
+    )
+
+    for name, stats in serial_profiler.rules.items():
+        assert parallel_profiler.rules[name].calls == stats.calls
+        assert parallel_profiler.rules[name].hits == stats.hits
+        assert parallel_profiler.rules[name].eliminated == stats.eliminated
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_apply_batch_solver_vectorized_matches_serial_results_in_order(workers):
+    pytest.importorskip("numpy")
+    lines = [SOLVABLE_LINE, "." * 81, "11" + "." * 79, "123"] * 3
+    serial_output = io.StringIO()
+    vectorized_output = io.StringIO()
+
+    apply_batch_solver(lines, serial_output)
+    summary = apply_batch_solver(
+        lines, vectorized_output, workers=workers, chunk_size=5, vectorized=True
+    )
+
+    assert vectorized_output.getvalue() == serial_output.getvalue()
+    assert summary.solved == 3
+
+
+def test_apply_batch_solver_vectorized_accepts_non_ascii_empty_cells():
+    pytest.importorskip("numpy")
+    lines = [SOLVABLE_LINE.replace(".", "\u00b7"), SOLVABLE_LINE]
+    serial_output = io.StringIO()
+    vectorized_output = io.StringIO()
+
+    apply_batch_solver(lines, serial_output)
+    summary = apply_batch_solver(lines, vectorized_output, vectorized=True)
+
+    assert vectorized_output.getvalue() == serial_output.getvalue()
+    assert summary.solved == 2
+
+
+def test_run_batch_reads_binary_grid_file(tmp_path):
+    lines = [SOLVABLE_LINE, "." * 81]
+    text_path = tmp_path / "puzzles.txt"
+    text_path.write_text("\n".join(lines) + "\n")
+    binary_path = tmp_path / "puzzles.sdkg"
+    write_lines(str(binary_path), lines)
+
+    run_batch(str(text_path), str(tmp_path / "text.out"))
+    run_batch(str(binary_path), str(tmp_path / "binary.out"))
+
+    assert (tmp_path / "binary.out").read_text() == (tmp_path / "text.out").read_text()
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_run_batch_keeps_candidates_of_masks_file(tmp_path, vectorized):
+    if vectorized:
+        pytest.importorskip("numpy")
+    solution = solve_line(HARD_LINE, fallback=True).split()[0]
+    grid = Grid.from_line_notation(HARD_LINE)
+    for cell, digit in zip(grid, solution):
+        if cell.value is None:
+            cell.mask = 1 << (int(digit) - 1)
+    path = tmp_path / "grids.sdkg"
+    write_grids(str(path), [grid], kind=MASKS)
+
+    run_batch(str(path), str(tmp_path / "grids.out"), vectorized=vectorized)
+
+    assert solve_line(HARD_LINE) == f"{HARD_LINE} unsolved"
+    assert (tmp_path / "grids.out").read_text() == f"{solution} solved\n"
+
+
+def test_convert_rejects_malformed_line_without_writing_a_file(tmp_path, capsys):
+    text_path = tmp_path / "mix.txt"
+    text_path.write_text(f"# Puzzles\n{SOLVABLE_LINE}\n\n123\n{HARD_LINE}\n")
+    binary_path = tmp_path / "mix.sdkg"
+    argv = ["sudoku-solver", "--batch", str(text_path), "--convert", str(binary_path)]
+
+    with patch("sys.argv", argv), pytest.raises(SystemExit):
+        run()
+
+    assert "Line 4 is not a puzzle of 81 characters." in capsys.readouterr().err
+    assert sorted(child.name for child in tmp_path.iterdir()) == ["mix.txt"]
+
+
+def test_apply_solver_stores_result_and_restores_it_without_solving(tmp_path):
+    with ResultStore(str(tmp_path / "results.db")) as store:
+        apply_solver(Grid.from_line_notation(SOLVABLE_LINE), store=store)
+        stored = store.get(SOLVABLE_LINE)
+        assert stored is not None
+        assert stored.status == "solved"
+        assert stored.rule_applications
+
+        grid = Grid.from_line_notation(SOLVABLE_LINE)
+        with patch("runner.Solver") as solver:
+            result = apply_solver(grid, store=store)
+
+        solver.assert_not_called()
+        assert result == "The puzzle was solved!"
+        assert grid.to_line_notation() == stored.grid
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_apply_batch_solver_reuses_stored_results(tmp_path, workers):
+    lines = [SOLVABLE_LINE, "." * 81, "11" + "." * 79, "123"]
+    expected = io.StringIO()
+    apply_batch_solver(lines, expected)
+
+    store = ResultStore(str(tmp_path / "results.db"))
+    apply_batch_solver(lines, io.StringIO(), workers=workers, store=store)
+    with patch("runner.Solver") as solver:
+        output = io.StringIO()
+        apply_batch_solver(lines, output, store=store)
+    store.close()
+
+    solver.assert_not_called()
+    assert output.getvalue() == expected.getvalue()
+
+
+def test_apply_batch_solver_rejects_invalid_worker_count():
+    with pytest.raises(ValueError) as err:
+        apply_batch_solver([], io.StringIO(), workers=0)
+    assert str(err.value) == "Workers must be at least 1."
+
+
+def test_apply_batch_solver_rejects_invalid_chunk_size():
+    with pytest.raises(ValueError) as err:
+        apply_batch_solver([], io.StringIO(), chunk_size=0)
+    assert str(err.value) == "Chunk size must be at least 1."
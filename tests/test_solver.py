@@ -2,8 +2,11 @@ from itertools import chain, repeat
 from unittest.mock import call, patch, DEFAULT
 
 import pytest
-from model import Grid
-from solver import Solver
+from model import Grid, Point
+from profiling import RuleProfiler
+from ordering import AdaptiveOrdering
+from pipeline import EXHAUSTED, final_status
+from solver import PRESETS, RULE_NAMES, Budget, Solver
 
 
 @pytest.fixture
@@ -13,13 +16,17 @@ def all_mocks():
         apply_single_candidate_rule=DEFAULT,
         apply_naked_pairs_rule=DEFAULT,
         apply_naked_triples_rule=DEFAULT,
+        apply_naked_quads_rule=DEFAULT,
         apply_hidden_single_rule=DEFAULT,
         apply_hidden_pairs_rule=DEFAULT,
         apply_hidden_triples_rule=DEFAULT,
+        apply_hidden_quads_rule=DEFAULT,
         apply_locked_candidates_rule=DEFAULT,
         apply_fish_rule=DEFAULT,
+        apply_finned_fish_rule=DEFAULT,
         apply_xy_wing_rule=DEFAULT,
         apply_xyz_wing_rule=DEFAULT,
+        apply_backtracking_rule=DEFAULT,
     ) as mocks:
         yield mocks
 
@@ -50,9 +57,11 @@ def test_init_stores_grid():
         "apply_single_candidate_rule",
         "apply_naked_pairs_rule",
         "apply_naked_triples_rule",
+        "apply_naked_quads_rule",
         "apply_hidden_single_rule",
         "apply_hidden_pairs_rule",
         "apply_hidden_triples_rule",
+        "apply_hidden_quads_rule",
         "apply_locked_candidates_rule",
         "apply_xy_wing_rule",
         "apply_xyz_wing_rule",
@@ -103,6 +112,32 @@ def test_fish_rule_call_patterns(all_mocks):
     assert fish.call_count == 5
 
 
+def test_finned_fish_rule_call_patterns(all_mocks):
+    for name, mock in all_mocks.items():
+        if name != "apply_finned_fish_rule":
+            mock.return_value = False
+
+    finned_fish = all_mocks["apply_finned_fish_rule"]
+    finned_fish.side_effect = [False, True, False, False, False]
+
+    grid = Grid.from_rows_notation(BASE_GRID)
+    Solver(grid).solve()
+
+    finned_fish.assert_has_calls(
+        [
+            call(grid, size=2),
+            call(grid, size=3),
+            call(grid, size=2),
+            call(grid, size=3),
+            call(grid, size=4),
+        ]
+    )
+    assert finned_fish.call_count == 5
+    all_mocks["apply_fish_rule"].assert_has_calls(
+        [call(grid, size=2), call(grid, size=3), call(grid, size=4)] * 2
+    )
+
+
 def test_only_applies_latter_rules_when_earlier_rules_fail(all_mocks):
     for mock in all_mocks.values():
         mock.side_effect = chain([True], repeat(False))
@@ -112,15 +147,18 @@ def test_only_applies_latter_rules_when_earlier_rules_fail(all_mocks):
 
     solver.solve()
 
-    assert all_mocks["apply_single_candidate_rule"].call_count == 11
-    assert all_mocks["apply_naked_pairs_rule"].call_count == 10
-    assert all_mocks["apply_naked_triples_rule"].call_count == 9
-    assert all_mocks["apply_hidden_single_rule"].call_count == 8
-    assert all_mocks["apply_hidden_pairs_rule"].call_count == 7
-    assert all_mocks["apply_hidden_triples_rule"].call_count == 6
-    assert all_mocks["apply_locked_candidates_rule"].call_count == 5
-    # apply_fish_rule is called 4 + 3n where n is number of rules below it.
-    assert all_mocks["apply_fish_rule"].call_count == 10
+    assert all_mocks["apply_single_candidate_rule"].call_count == 14
+    assert all_mocks["apply_naked_pairs_rule"].call_count == 13
+    assert all_mocks["apply_naked_triples_rule"].call_count == 12
+    assert all_mocks["apply_naked_quads_rule"].call_count == 11
+    assert all_mocks["apply_hidden_single_rule"].call_count == 10
+    assert all_mocks["apply_hidden_pairs_rule"].call_count == 9
+    assert all_mocks["apply_hidden_triples_rule"].call_count == 8
+    assert all_mocks["apply_hidden_quads_rule"].call_count == 7
+    assert all_mocks["apply_locked_candidates_rule"].call_count == 6
+    # Each fish rule is called 1 + 3n where n is number of rules below it.
+    assert all_mocks["apply_fish_rule"].call_count == 13
+    assert all_mocks["apply_finned_fish_rule"].call_count == 10
     assert all_mocks["apply_xy_wing_rule"].call_count == 3
     assert all_mocks["apply_xyz_wing_rule"].call_count == 2
 
@@ -256,3 +294,307 @@ def test_is_valid_returns_false_when_value_is_repeated_in_block():
     solver = Solver(grid)
 
     assert solver.is_valid() is False
+
+
+def test_backtracking_fallback_is_not_used_by_default(all_mocks):
+    for mock in all_mocks.values():
+        mock.return_value = False
+
+    grid = Grid.from_rows_notation(BASE_GRID)
+    Solver(grid).solve()
+
+    all_mocks["apply_backtracking_rule"].assert_not_called()
+
+
+def test_backtracking_fallback_is_used_when_rules_stall(all_mocks):
+    for mock in all_mocks.values():
+        mock.return_value = False
+
+    grid = Grid.from_rows_notation(BASE_GRID)
+    Solver(grid, fallback=True).solve()
+
+    all_mocks["apply_backtracking_rule"].assert_called_once_with(grid, None)
+
+
+def test_solve_stops_as_soon_as_grid_is_contradicted(all_mocks):
+    for mock in all_mocks.values():
+        mock.return_value = False
+
+    grid = Grid.from_rows_notation(BASE_GRID)
+
+    def empty_cell(grid):
+        grid[Point(0, 0)].mask = 0
+        return True
+
+    all_mocks["apply_single_candidate_rule"].side_effect = empty_cell
+    solver = Solver(grid, fallback=True)
+    solver.solve()
+
+    assert solver.is_contradicted()
+    all_mocks["apply_single_candidate_rule"].assert_called_once_with(grid)
+    all_mocks["apply_naked_pairs_rule"].assert_not_called()
+    all_mocks["apply_backtracking_rule"].assert_not_called()
+
+
+def test_solve_applies_no_rules_to_contradicted_grid(all_mocks):
+    grid = Grid.from_line_notation("12345678." + "........9" + "." * 63)
+    solver = Solver(grid)
+    solver.solve()
+
+    assert solver.is_contradicted()
+    all_mocks["apply_single_candidate_rule"].assert_not_called()
+
+
+def test_backtracking_fallback_solves_puzzle_rules_cannot():
+    rows = [
+        "8........",
+        "..36.....",
+        ".7..9.2..",
+        ".5...7...",
+        "....457..",
+        "...1...3.",
+        "..1....68",
+        "..85...1.",
+        ".9....4..",
+    ]
+    rules_only = Solver(Grid.from_rows_notation(rows), rules="full")
+    rules_only.solve()
+
+    assert not rules_only.is_solved()
+    assert not rules_only.is_contradicted()
+
+    solver = Solver(Grid.from_rows_notation(rows), fallback=True, rules="full")
+    solver.solve()
+
+    assert solver.is_solved()
+    assert solver.is_valid()
+
+
+def test_has_unique_solution_returns_true_for_unique_puzzle():
+    grid = Grid.from_rows_notation(BASE_GRID)
+
+    assert Solver(grid).has_unique_solution() is True
+
+
+def test_has_unique_solution_returns_false_for_empty_grid():
+    grid = Grid([[None] * 9] * 9)
+
+    assert Solver(grid).has_unique_solution() is False
+
+
+def test_solve_reports_every_rule_attempt_to_observer(all_mocks):
+    for mock in all_mocks.values():
+        mock.return_value = False
+    all_mocks["apply_hidden_single_rule"].side_effect = chain([True], repeat(False))
+    profiler = RuleProfiler()
+
+    Solver(Grid.from_rows_notation(BASE_GRID), observer=profiler).solve()
+
+    assert profiler.rules["single_candidate"].calls == 2
+    assert profiler.rules["hidden_single"].calls == 2
+    assert profiler.rules["hidden_single"].hits == 1
+    assert profiler.rules["xyz_wing"].calls == 1
+    assert "backtracking" not in profiler.rules
+
+
+def test_solve_reports_candidates_eliminated_to_observer():
+    grid = Grid.from_rows_notation(BASE_GRID)
+    candidates = sum(map(int.bit_count, grid.masks))
+    profiler = RuleProfiler()
+
+    Solver(grid, observer=profiler).solve()
+
+    assert sum(stats.eliminated for stats in profiler.rules.values()) == candidates
+    assert profiler.rules["single_candidate"].hits > 0
+    assert all(stats.seconds >= 0 for stats in profiler.rules.values())
+
+
+def test_solve_counts_rule_applications_by_name(all_mocks):
+    for mock in all_mocks.values():
+        mock.return_value = False
+    all_mocks["apply_locked_candidates_rule"].side_effect = chain(
+        [True, True], repeat(False)
+    )
+    solver = Solver(Grid.from_rows_notation(BASE_GRID))
+
+    solver.solve()
+
+    assert solver.rule_applications == {"locked_candidates": 2}
+
+
+def test_singles_only_preset_skips_other_rules(all_mocks):
+    for mock in all_mocks.values():
+        mock.return_value = False
+
+    Solver(Grid.from_rows_notation(BASE_GRID), rules="singles-only").solve()
+
+    all_mocks["apply_single_candidate_rule"].assert_called_once()
+    all_mocks["apply_hidden_single_rule"].assert_called_once()
+    all_mocks["apply_fish_rule"].assert_not_called()
+    all_mocks["apply_xy_wing_rule"].assert_not_called()
+
+
+def test_standard_preset_ends_with_locked_candidates():
+    assert PRESETS["standard"][-1] == "locked_candidates"
+    assert "x_wing" not in PRESETS["standard"]
+    assert PRESETS["full"] == RULE_NAMES
+
+
+def test_rules_are_tried_in_the_order_given(all_mocks):
+    for mock in all_mocks.values():
+        mock.return_value = False
+    all_mocks["apply_hidden_single_rule"].side_effect = chain([True], repeat(False))
+
+    solver = Solver(
+        Grid.from_rows_notation(BASE_GRID), rules=["hidden_single", "xy_wing"]
+    )
+    solver.solve()
+
+    assert solver.rule_applications == {"hidden_single": 1}
+    assert all_mocks["apply_xy_wing_rule"].call_count == 1
+    all_mocks["apply_single_candidate_rule"].assert_not_called()
+
+
+def test_enabled_flags_remove_and_add_rules():
+    solver = Solver(
+        Grid.from_rows_notation(BASE_GRID),
+        rules="singles-only",
+        enabled={"hidden_single": False, "xyz_wing": True, "x_wing": True},
+    )
+
+    assert solver.rule_names == ["single_candidate", "x_wing", "xyz_wing"]
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"rules": "everything"}, {"rules": ["x_wings"]}, {"enabled": {"x_wings": False}}],
+)
+def test_init_rejects_unknown_rules(kwargs):
+    with pytest.raises(ValueError, match="Unknown"):
+        Solver(Grid.from_rows_notation(BASE_GRID), **kwargs)
+
+
+def test_solve_tries_rules_in_adaptive_order(all_mocks):
+    for mock in all_mocks.values():
+        mock.return_value = False
+    ordering = AdaptiveOrdering()
+    ordering.rule_attempted("xy_wing", True, 0.0, 50)
+    all_mocks["apply_xy_wing_rule"].side_effect = chain([True], repeat(False))
+
+    solver = Solver(Grid.from_rows_notation(BASE_GRID), ordering=ordering)
+    solver.solve()
+
+    # The xy-wing was tried first each cycle, so every other rule was only tried once.
+    assert all_mocks["apply_xy_wing_rule"].call_count == 2
+    all_mocks["apply_single_candidate_rule"].assert_called_once()
+    assert ordering.cost("single_candidate") > 0
+
+
+def test_solve_stops_once_grid_is_solved(all_mocks):
+    grid = Grid.from_rows_notation(BASE_GRID)
+
+    def fill(grid):
+        for cell in grid:
+            if cell.value is None:
+                cell.value = 1
+        return True
+
+    all_mocks["apply_single_candidate_rule"].side_effect = fill
+    Solver(grid).solve()
+
+    all_mocks["apply_single_candidate_rule"].assert_called_once_with(grid)
+    all_mocks["apply_naked_pairs_rule"].assert_not_called()
+
+
+def test_solve_stops_after_maximum_rule_applications(all_mocks):
+    for mock in all_mocks.values():
+        mock.return_value = False
+    all_mocks["apply_single_candidate_rule"].return_value = True
+
+    solver = Solver(
+        Grid.from_rows_notation(BASE_GRID),
+        fallback=True,
+        budget=Budget(applications=3),
+    )
+    solver.solve()
+
+    assert solver.budget_exhausted
+    assert solver.rule_applications == {"single_candidate": 3}
+    all_mocks["apply_backtracking_rule"].assert_not_called()
+
+
+def test_solve_stops_at_deadline_leaving_grid_partly_solved():
+    grid = Grid.from_rows_notation(BASE_GRID)
+    puzzle = grid.to_line_notation()
+
+    solver = Solver(grid, budget=Budget(seconds=0))
+    solver.solve()
+
+    assert solver.budget_exhausted
+    assert not solver.is_solved()
+    assert grid.to_line_notation() == puzzle
+
+
+def test_backtracking_fallback_stops_at_time_limit():
+    # The rules make no progress, so the time is spent on the search.
+    with patch.multiple(
+        "solver",
+        apply_single_candidate_rule=DEFAULT,
+        apply_hidden_single_rule=DEFAULT,
+    ) as mocks:
+        for mock in mocks.values():
+            mock.return_value = False
+        solver = Solver(
+            Grid.from_line_notation(
+                "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4.."
+            ),
+            fallback=True,
+            rules="singles-only",
+            budget=Budget(seconds=0.001),
+        )
+        solver.solve()
+
+    assert final_status(solver) == EXHAUSTED
+    assert not solver.no_solution
+    assert not solver.is_solved()
+
+
+def test_rule_past_its_time_limit_is_no_longer_attempted(all_mocks):
+    for mock in all_mocks.values():
+        mock.return_value = False
+
+    solver = Solver(
+        Grid.from_rows_notation(BASE_GRID), budget=Budget(rule_seconds={"x_wing": 0})
+    )
+    solver.solve()
+
+    assert solver.budget_exhausted
+    assert all_mocks["apply_fish_rule"].call_args_list == [
+        call(solver.grid, size=3),
+        call(solver.grid, size=4),
+    ]
+
+
+def test_solve_within_budget_is_not_exhausted():
+    solver = Solver(
+        Grid.from_rows_notation(BASE_GRID),
+        budget=Budget(seconds=60, applications=1000, rule_seconds={"jellyfish": 60}),
+    )
+    solver.solve()
+
+    assert solver.is_solved()
+    assert not solver.budget_exhausted
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"seconds": -1},
+        {"applications": -1},
+        {"rule_seconds": {"jellyfish": -1}},
+        {"rule_seconds": {"jellyfishes": 1}},
+    ],
+)
+def test_budget_rejects_invalid_limits(kwargs):
+    with pytest.raises(ValueError):
+        Budget(**kwargs)
@@ -0,0 +1,134 @@
+import pytest
+from model import Grid, Point
+from utils import GIVENS, MASKS, GridFile, is_grid_file, write_grids, write_lines
+
+SOLVABLE_LINE = (
+    ".7.2.8.3148.3.7...9.3..4758.4687...389..3.56...792.81.754.12......7.31453.8.4.2.6"
+)
+HARD_LINE = (
+    "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4.."
+)
+
+
+def test_write_lines_writes_81_bytes_per_puzzle(tmp_path):
+    path = tmp_path / "puzzles.sdkg"
+
+    count = write_lines(str(path), [SOLVABLE_LINE, HARD_LINE + "\n"])
+
+    assert count == 2
+    assert path.stat().st_size == 8 + 2 * 81
+
+
+def test_write_lines_rejects_wrong_length(tmp_path):
+    with pytest.raises(ValueError, match="Grid must be 9x9."):
+        write_lines(str(tmp_path / "puzzles.sdkg"), ["." * 80])
+
+
+def test_write_lines_leaves_file_unchanged_when_a_line_is_rejected(tmp_path):
+    path = tmp_path / "puzzles.sdkg"
+    write_lines(str(path), [SOLVABLE_LINE])
+    original = path.read_bytes()
+
+    with pytest.raises(ValueError, match="Grid must be 9x9."):
+        write_lines(str(path), [HARD_LINE] * 300 + ["123"])
+
+    assert path.read_bytes() == original
+    assert [child.name for child in tmp_path.iterdir()] == ["puzzles.sdkg"]
+
+
+def test_grid_file_reads_lines_in_order(tmp_path):
+    path = tmp_path / "puzzles.sdkg"
+    write_lines(str(path), [SOLVABLE_LINE, HARD_LINE])
+
+    with GridFile(str(path)) as grids:
+        assert len(grids) == 2
+        assert grids.kind == GIVENS
+        assert list(grids.lines()) == [SOLVABLE_LINE, HARD_LINE]
+
+
+def test_grid_file_reads_grids_by_index(tmp_path):
+    path = tmp_path / "puzzles.sdkg"
+    write_lines(str(path), [SOLVABLE_LINE, HARD_LINE, SOLVABLE_LINE])
+
+    with GridFile(str(path)) as grids:
+        assert grids[1].to_line_notation() == HARD_LINE
+        assert grids[-1].to_line_notation() == SOLVABLE_LINE
+        assert [grid.to_line_notation() for grid in grids] == [
+            SOLVABLE_LINE,
+            HARD_LINE,
+            SOLVABLE_LINE,
+        ]
+
+
+def test_grid_file_rejects_index_out_of_range(tmp_path):
+    path = tmp_path / "puzzles.sdkg"
+    write_lines(str(path), [SOLVABLE_LINE])
+
+    with GridFile(str(path)) as grids:
+        with pytest.raises(IndexError, match="Grid index out of range."):
+            grids[1]
+
+
+def test_masks_records_keep_candidates_of_empty_cells(tmp_path):
+    path = tmp_path / "grids.sdkg"
+    grid = Grid.from_line_notation(HARD_LINE)
+    grid[Point(1, 0)].mask &= 0b000000110
+    grid[Point(2, 0)].value = 4
+
+    write_grids(str(path), [grid], kind=MASKS)
+
+    with GridFile(str(path)) as grids:
+        restored = grids[0]
+        assert grids.kind == MASKS
+        assert path.stat().st_size == 8 + 162
+        assert restored.values == grid.values
+        assert restored.masks == grid.masks
+        assert grids.line(0) == grid.to_line_notation()
+
+
+def test_masks_record_snapshots_keep_candidates_of_empty_cells(tmp_path):
+    path = tmp_path / "grids.sdkg"
+    grid = Grid.from_line_notation(HARD_LINE)
+    grid[Point(1, 0)].mask &= 0b000000110
+
+    write_grids(str(path), [grid, Grid.from_line_notation(SOLVABLE_LINE)], kind=MASKS)
+
+    with GridFile(str(path)) as grids:
+        snapshots = list(grids.snapshots())
+        assert snapshots[0] == grid.snapshot()
+        assert grids.snapshot(1) == Grid.from_line_notation(SOLVABLE_LINE).snapshot()
+
+
+def test_givens_records_keep_only_values(tmp_path):
+    path = tmp_path / "grids.sdkg"
+    grid = Grid.from_line_notation(HARD_LINE)
+    grid[Point(1, 0)].mask &= 0b000000110
+
+    write_grids(str(path), [grid])
+
+    with GridFile(str(path)) as grids:
+        assert grids[0].masks == Grid.from_line_notation(HARD_LINE).masks
+
+
+def test_write_grids_rejects_unknown_kind(tmp_path):
+    with pytest.raises(ValueError, match="Kind must be GIVENS or MASKS."):
+        write_grids(str(tmp_path / "grids.sdkg"), [], kind=2)
+
+
+def test_grid_file_rejects_text_file(tmp_path):
+    path = tmp_path / "puzzles.txt"
+    path.write_text(SOLVABLE_LINE + "\n")
+
+    assert is_grid_file(str(path)) is False
+    with pytest.raises(ValueError, match="Not a binary grid file."):
+        GridFile(str(path))
+
+
+def test_grid_file_rejects_truncated_file(tmp_path):
+    path = tmp_path / "puzzles.sdkg"
+    write_lines(str(path), [SOLVABLE_LINE])
+    path.write_bytes(path.read_bytes()[:-1])
+
+    assert is_grid_file(str(path)) is True
+    with pytest.raises(ValueError, match="Binary grid file is truncated."):
+        GridFile(str(path))
@@ -0,0 +1,104 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from model import Point  # noqa: E402
+from vectorized import (  # noqa: E402
+    contradictions,
+    masks_from_lines,
+    propagate,
+    solved,
+    to_grid,
+    to_line_notation,
+)
+
+SOLVABLE_LINE = (
+    ".7.2.8.3148.3.7...9.3..4758.4687...389..3.56...792.81.754.12......7.31453.8.4.2.6"
+)
+SOLVABLE_SOLUTION = (
+    "675298431481357692923164758146875923892431567537926814754612389269783145318549276"
+)
+HARD_LINE = (
+    "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4.."
+)
+HARD_SOLUTION = (
+    "812753649943682175675491283154237896369845721287169534521974368438526917796318452"
+)
+
+
+def test_masks_from_lines_stores_givens_as_single_candidates():
+    masks = masks_from_lines(["1" + "." * 79 + "9"])
+
+    assert masks.shape == (1, 81)
+    assert masks.dtype == np.uint16
+    assert masks[0, 0] == 0b000000001
+    assert masks[0, 1] == 0b111111111
+    assert masks[0, 80] == 0b100000000
+
+
+def test_masks_from_lines_treats_zero_as_empty():
+    masks = masks_from_lines(["0" * 81])
+
+    assert np.all(masks == 0b111111111)
+
+
+def test_masks_from_lines_treats_non_ascii_characters_as_empty():
+    masks = masks_from_lines(["\u00b7" * 80 + "9", "." * 81])
+
+    assert masks.shape == (2, 81)
+    assert np.all(masks[:, :80] == 0b111111111)
+    assert masks[0, 80] == 0b100000000
+
+
+def test_masks_from_lines_rejects_wrong_length():
+    with pytest.raises(ValueError, match="Grid must be 9x9."):
+        masks_from_lines(["." * 80])
+
+
+def test_propagate_solves_simple_puzzles_in_lockstep():
+    masks = masks_from_lines([SOLVABLE_LINE, HARD_LINE, SOLVABLE_LINE])
+
+    propagate(masks)
+
+    assert solved(masks).tolist() == [True, False, True]
+    assert to_line_notation(masks[0]) == SOLVABLE_SOLUTION
+    assert to_line_notation(masks[2]) == SOLVABLE_SOLUTION
+
+
+def test_propagate_keeps_candidates_of_solution_in_stalled_puzzle():
+    masks = masks_from_lines([HARD_LINE])
+
+    propagate(masks)
+
+    for index, value in enumerate(HARD_SOLUTION):
+        assert masks[0, index] & (1 << (int(value) - 1))
+
+
+def test_contradictions_finds_conflicting_givens():
+    masks = masks_from_lines(["11" + "." * 79, SOLVABLE_LINE])
+
+    propagate(masks)
+
+    assert contradictions(masks).tolist() == [True, False]
+
+
+def test_contradictions_finds_unit_without_place_for_value():
+    masks = masks_from_lines(["." * 81])
+    masks[0, :9] &= ~np.uint16(0b000010000)
+
+    assert contradictions(masks).tolist() == [True]
+
+
+def test_to_grid_keeps_values_and_reduced_candidates():
+    masks = masks_from_lines([HARD_LINE])
+    propagate(masks)
+
+    grid = to_grid(masks[0])
+
+    for index in range(81):
+        cell = grid[Point(index % 9, index // 9)]
+        if int(masks[0, index]).bit_count() == 1:
+            assert cell.value == int(masks[0, index]).bit_length()
+        else:
+            assert cell.value is None
+            assert cell.mask == masks[0, index]